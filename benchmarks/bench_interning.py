@@ -0,0 +1,84 @@
+"""
+Memory of many per-tenant configurations, with and without interning.
+
+    python benchmarks/bench_interning.py [tenants]
+
+Each tenant's configuration is a shared base (40 sections) plus a small
+overlay of its own. Each mode runs in a fresh process and reports how much
+its peak RSS grew while building the configurations.
+
+"""
+import multiprocessing
+import resource
+import sys
+import time
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.interning import Interner
+
+
+def base():
+    return dict(
+        ('section_%d' % i, {
+            'host': 'host-%d.example.com' % i,
+            'port': 8000 + i,
+            'enabled': True,
+            'timeouts': {'connect': 1.5, 'read': 10.0},
+            'tags': ['alpha', 'beta', 'gamma'],
+            'description': 'the configuration of backend number %d' % i,
+        })
+        for i in range(40)
+    )
+
+
+def overlay(tenant):
+    return {
+        'tenant': 'tenant-%d' % tenant,
+        'section_%d' % (tenant % 40): {'port': 9000 + tenant % 100},
+    }
+
+
+def build_plain(tenants, cfg):
+    configs = []
+    for tenant in range(tenants):
+        config = ConfigDict.from_dict(cfg)
+        config.merge_dict(overlay(tenant))
+        configs.append(config)
+    return configs
+
+
+def build_interned(tenants, cfg):
+    interner = Interner()
+    configs = []
+    for tenant in range(tenants):
+        config = interner.configify(cfg)
+        config.merge_dict(overlay(tenant))
+        configs.append(config)
+    return configs
+
+
+def measure(build, tenants, results):
+    cfg = base()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.time()
+    configs = build(tenants, cfg)
+    elapsed = time.time() - started
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((after - before, elapsed, len(configs)))
+
+
+def main(tenants=10000):
+    for name, build in (('plain', build_plain),
+                        ('interned', build_interned)):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=measure, args=(build, tenants, results))
+        process.start()
+        grown, elapsed, count = results.get()
+        process.join()
+        print "%-10s %6d tenants %10d KB %8.2f s" % (
+            name, count, grown, elapsed)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""
+Merging an overlay that changes one entry of a long upstream list: the
+whole list repeated (lists are replaced) against just the entry, merged by
+key.
+
+    python benchmarks/bench_merging.py [entries] [rounds]
+
+"""
+import copy
+import json
+import sys
+import timeit
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.merging import MergeByKey
+
+
+def upstream(entries):
+    return {'servers': [
+        {'name': 'web-%d' % i, 'host': '10.0.%d.%d' % (i // 256, i % 256),
+         'weight': 1, 'tags': ['a', 'b']}
+        for i in range(entries)
+    ]}
+
+
+def main(entries=5000, rounds=20):
+    base = upstream(entries)
+
+    full = copy.deepcopy(base)
+    full['servers'][entries // 2]['weight'] = 0
+    keyed = {'servers': [{'name': 'web-%d' % (entries // 2), 'weight': 0}]}
+    strategies = {'servers': MergeByKey('name')}
+
+    configs = [ConfigDict.from_dict(base) for _ in range(2 * rounds)]
+
+    for name, overlay, kwargs in (('replace', full, {}),
+                                  ('by key', keyed,
+                                   {'list_strategies': strategies})):
+        merged = [configs.pop() for _ in range(rounds)]
+        elapsed = timeit.timeit(
+            lambda: merged.pop().merge_dict(overlay, **kwargs), number=rounds)
+        print "%-8s %6d entries %8d overlay bytes %8.2f ms/merge" % (
+            name, entries, len(json.dumps(overlay)), elapsed / rounds * 1e3)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
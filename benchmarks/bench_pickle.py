@@ -0,0 +1,72 @@
+"""
+Pickle size and speed of ConfigDict.
+
+    python benchmarks/bench_pickle.py [sections]
+
+Compares pickling a configuration the way ConfigDict used to be pickled (an
+OrderedDict subclass with its instance dict, node by node) against the
+compiled payload and against a `share`d reference.
+
+"""
+from collections import OrderedDict
+import cPickle as pickle
+import sys
+import timeit
+
+from dripconfig.configdict import ConfigDict
+
+
+class _NodeByNode(OrderedDict):
+    """
+    Pickles like ConfigDict did: items plus instance dict, per node.
+
+    """
+    def __init__(self, *args, **kwargs):
+        OrderedDict.__init__(self, *args, **kwargs)
+        self._triggers = []
+
+
+def _node_by_node(ob):
+    if isinstance(ob, dict):
+        return _NodeByNode((k, _node_by_node(v)) for k, v in ob.iteritems())
+    elif isinstance(ob, list):
+        return [_node_by_node(x) for x in ob]
+    return ob
+
+
+def build(sections):
+    return ConfigDict.from_dict(dict(
+        ('section_%d' % i, {
+            'host': 'host-%d.example.com' % i,
+            'port': 8000 + i,
+            'enabled': bool(i % 2),
+            'ratio': i / 10.0,
+            'tags': ['a', 'b', 'c'],
+            'nested': {'key_%d' % j: 'value %d' % j for j in range(10)},
+        })
+        for i in range(sections)
+    ))
+
+
+def bench(name, ob, number=20):
+    data = pickle.dumps(ob, 2)
+    dumps = min(timeit.repeat(
+        lambda: pickle.dumps(ob, 2), number=number, repeat=3)) / number
+    loads = min(timeit.repeat(
+        lambda: pickle.loads(data), number=number, repeat=3)) / number
+    print "%-14s %10d bytes %9.2f ms dumps %9.2f ms loads" % (
+        name, len(data), dumps * 1000, loads * 1000)
+
+
+def main(sections=500):
+    config = build(sections)
+
+    bench('node by node', _node_by_node(config))
+    bench('compiled', config)
+    config.share()
+    bench('shared', config)
+    config.unshare()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
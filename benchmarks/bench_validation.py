@@ -0,0 +1,43 @@
+"""
+Cleaning with the builtin triggers' schemas, voluptuous against compiled.
+
+    python benchmarks/bench_validation.py [rounds]
+
+"""
+import sys
+import timeit
+
+from dripconfig.builtins import LoggingConfig, SentryConfig, StatsdConfig
+from dripconfig.configdict import ConfigDict
+from dripconfig.validation import compile_schema
+
+
+CONFIG = {
+    'logging': {'version': 1, 'root': {'level': 'INFO'}},
+    'sentry': {'dsn': 'https://key@sentry.example.com/1'},
+    'statsd': {'host': 'stats.local', 'port': '8125', 'sample_rate': '0.5',
+               'disabled': 'no'},
+    'app': dict(('key_%d' % i, i) for i in range(20)),
+}
+
+
+def main(rounds=20000):
+    config = ConfigDict.from_dict(CONFIG)
+    schemas = []
+    for trigger in (LoggingConfig, SentryConfig, StatsdConfig):
+        schema = trigger.partial_schema
+        schema.extra = True
+        schemas.append(schema)
+
+    for name, validators in (
+            ('voluptuous', schemas),
+            ('compiled', [compile_schema(schema) for schema in schemas])):
+        elapsed = timeit.timeit(
+            lambda: [validate(config) for validate in validators],
+            number=rounds)
+        print "%-10s %6d rounds %8.2f s %8.1f us/clean" % (
+            name, rounds, elapsed, elapsed / rounds / len(validators) * 1e6)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
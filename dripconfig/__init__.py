@@ -5,22 +5,31 @@ the default 'global' configuration if desired.
 from .configdict import ConfigDict
 from .sources import (
     Argv,
+    Directory,
     EnvVar,
     Filename,
+    LocalDaemon,
+    URL,
 )
 from .helpers import SysLogHandler, StatsdHandler, StatsdErrorFilter
-from .interfaces import ConfigurationTrigger, ToBeInjected
+from .interfaces import ConfigurationTrigger, LazyInjected, ToBeInjected
+from .snapshot import AtomicConfig
 
 __all__ = [
     'Argv',
+    'AtomicConfig',
     'ConfigDict',
     'ConfigurationTrigger',
+    'Directory',
     'EnvVar',
     'Filename',
+    'LazyInjected',
+    'LocalDaemon',
     'SysLogHandler',
     'StatsdHandler',
     'StatsdErrorFilter',
     'ToBeInjected',
+    'URL',
     'config'
 ]
 
@@ -0,0 +1,6 @@
+import sys
+
+from dripconfig.cli import main
+
+
+sys.exit(main())
@@ -6,6 +6,7 @@ from logging.config import dictConfig
 
 from voluptuous import Schema, Coerce, Required, Optional, Boolean, All, Range
 
+from dripconfig.configdict import ConfigDict
 from dripconfig.interfaces import SchemaBasedTrigger
 
 
@@ -27,13 +28,15 @@ class LoggingConfig(SchemaBasedTrigger):
     }
 
     """
+    compile_schema = True
+
     partial_schema = Schema({
         'logging': dict,
     })
 
     def configure(self, configuration):
         if 'logging' in configuration:
-            dictConfig(configuration.logging)
+            dictConfig(_read_all(configuration.logging))
 
 
 class SentryConfig(SchemaBasedTrigger):
@@ -47,6 +50,8 @@ class SentryConfig(SchemaBasedTrigger):
     }
 
     """
+    compile_schema = True
+
     partial_schema = Schema({
         'sentry': {
             Required('dsn'): basestring,
@@ -79,6 +84,9 @@ class StatsdConfig(SchemaBasedTrigger):
     }
 
     """
+    fork_sensitive = True
+    compile_schema = True
+
     partial_schema = Schema({
         'statsd': {
             Required('host', default='localhost'): basestring,
@@ -99,6 +107,19 @@ class StatsdConfig(SchemaBasedTrigger):
         )
 
 
+def _read_all(value):
+    """
+    A plain copy of `value`, read key by key rather than copied by dict
+    internals, so access tracking and overrides see every value used.
+
+    """
+    if isinstance(value, ConfigDict):
+        return dict((key, _read_all(value[key])) for key in value)
+    elif isinstance(value, list):
+        return [_read_all(item) for item in value]
+    return value
+
+
 def register_all(config):
     for Trigger in [LoggingConfig, StatsdConfig]:
         config.register_trigger(Trigger())
@@ -0,0 +1,44 @@
+"""
+The `dripconfig` command.
+
+    dripconfig compile -o app.dripc base.json overrides.ini local.yaml
+
+merges the given configuration files in order and writes the result in the
+compiled binary format (see `dripconfig.compiled`), which `ConfigDict.merge`
+picks up by its `.dripc` extension.
+
+"""
+import argparse
+import sys
+
+from dripconfig.configdict import ConfigDict
+
+
+def compile_command(args):
+    config = ConfigDict()
+    for filename in args.sources:
+        config.merge(filename)
+    config.dump_compiled(args.output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='dripconfig')
+    subparsers = parser.add_subparsers()
+
+    compile_parser = subparsers.add_parser(
+        'compile', help="merge configuration files into a compiled file")
+    compile_parser.add_argument(
+        '-o', '--output', required=True,
+        help="the compiled file to write, e.g. app.dripc")
+    compile_parser.add_argument(
+        'sources', nargs='+', metavar='SOURCE',
+        help="configuration files, merged in the order given")
+    compile_parser.set_defaults(func=compile_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+A precompiled binary format for merged configuration.
+
+Compiled files are meant to be built at deploy time (see `dripconfig
+compile`) so that processes can start with a single read rather than
+parsing JSON/INI/YAML and running everything through `configify`.
+
+Layout:
+
+    MAGIC | format version (1 byte) | marshal version (1 byte) | body
+
+The body is a `marshal` dump of the tree where every ConfigDict is stored
+as ('d', keys, values) and every tuple as ('t', items). Lists and scalars
+(str, unicode, int, long, float, bool, None) are stored as themselves. Key
+order and types survive the round trip.
+
+"""
+import marshal
+import struct
+
+from dripconfig.configdict import ConfigDict
+
+
+__all__ = (
+    'EXTENSION',
+    'dump',
+    'dumps',
+    'load',
+    'loads',
+)
+
+
+EXTENSION = '.dripc'
+MAGIC = 'DRIPC'
+FORMAT_VERSION = 1
+MARSHAL_VERSION = 2
+
+_HEADER = struct.Struct('>5sBB')
+
+_SCALAR_TYPES = (str, unicode, int, long, float, bool, type(None))
+
+
+def encode(ob):
+    """
+    Turn a configuration tree into the plain structure that is marshalled.
+
+    """
+    if isinstance(ob, _SCALAR_TYPES):
+        return ob
+    elif isinstance(ob, dict):
+        return (
+            'd', tuple(ob.iterkeys()), [encode(v) for v in ob.itervalues()])
+    elif isinstance(ob, list):
+        return [encode(x) for x in ob]
+    elif isinstance(ob, tuple):
+        return ('t', [encode(x) for x in ob])
+
+    raise TypeError(
+        "Can't compile %r of type %s; only plain data is supported"
+        % (ob, type(ob)))
+
+
+def decode(ob):
+    """
+    Rebuild ConfigDicts from the structure produced by `encode`.
+
+    """
+    if type(ob) is tuple:
+        if ob[0] == 'd':
+            return ConfigDict(zip(ob[1], [decode(v) for v in ob[2]]))
+        return tuple([decode(x) for x in ob[1]])
+    elif type(ob) is list:
+        return [decode(x) for x in ob]
+    return ob
+
+
+def dumps(config):
+    """
+    Returns:
+        str. the compiled form of `config`.
+
+    """
+    return (
+        _HEADER.pack(MAGIC, FORMAT_VERSION, MARSHAL_VERSION) +
+        marshal.dumps(encode(config), MARSHAL_VERSION))
+
+
+def loads(data):
+    """
+    Returns:
+        ConfigDict. the configuration compiled into `data`.
+
+    """
+    if not is_compiled(data) or len(data) < _HEADER.size:
+        raise ValueError("Not a compiled dripconfig file")
+
+    _, format_version, marshal_version = _HEADER.unpack_from(data)
+    if format_version != FORMAT_VERSION or marshal_version > marshal.version:
+        raise ValueError(
+            "Unsupported compiled config version %s/%s"
+            % (format_version, marshal_version))
+
+    try:
+        body = marshal.loads(data[_HEADER.size:])
+    except EOFError:
+        raise ValueError("Truncated compiled dripconfig file")
+    return decode(body)
+
+
+def dump(config, filename):
+    with open(filename, 'wb') as f:
+        f.write(dumps(config))
+
+
+def load(filename):
+    with open(filename, 'rb') as f:
+        return loads(f.read())
+
+
+def is_compiled(data):
+    """
+    Returns:
+        bool. True if `data` starts like a compiled file.
+
+    """
+    return data.startswith(MAGIC)
@@ -2,16 +2,23 @@
 """
 import copy
 from collections import OrderedDict
+import hashlib
 import json
+import multiprocessing.util
+import os
+import threading
 from types import (
     BooleanType, DictType, FloatType, IntType,
     ListType, LongType, StringType, TupleType, UnicodeType)
 from UserDict import UserDict, DictMixin
 from UserList import UserList
+import weakref
 
 import configparser
 from jsmin import jsmin
 
+from dripconfig import formats
+
 
 class ConfigDict(OrderedDict):
     """
@@ -22,7 +29,8 @@ class ConfigDict(OrderedDict):
 
     * allows 'merging' additional configuration overlays
       via nested partial updates. (ie the union of keys in
-      will result.  does not merge to lists) example:
+      will result.  lists are replaced unless there is a strategy for
+      merging them, see `dripconfig.merging`) example:
 
       {'foo': 12, 'bar': {'quux': 3, 'baz': 4}}
 
@@ -49,9 +57,25 @@ class ConfigDict(OrderedDict):
 
         * being a dict, presumably full of plain data, you are within
           rights to serialize this as json, yaml or whatever you feel like.
+
+        * every ConfigDict keeps weak links to the ConfigDicts it is
+          stored in, so that changes can be propagated up the tree (see
+          `fingerprint` and `interpolate`); a section stored in several
+          places tells all of them. Changes made inside lists are not
+          noticed.
     """
 
+    # ((weakref to parent ConfigDict, path segments from parent to self),
+    #  ...), one per place this ConfigDict is stored in.
+    _links = ()
+    _fingerprint = None
+    # shared between trees by `interning.Interner`; may not change.
+    _frozen = False
+
     def __init__(self, *args, **kwargs):
+        if args and isinstance(args[0], ConfigDict):
+            # copy without the reads going through read hooks.
+            args = (args[0].items(),) + args[1:]
         super(ConfigDict, self).__init__(*args, **kwargs)
         self._triggers = []
 
@@ -62,6 +86,31 @@ class ConfigDict(OrderedDict):
         """
         return configify(cfg)
 
+    @classmethod
+    def load_compiled(cls, filename):
+        """
+        Load a ConfigDict from a file written by `dump_compiled`.
+
+        Args:
+            filename (str): path to the compiled file.
+
+        """
+        from dripconfig import compiled
+        return compiled.load(filename)
+
+    def dump_compiled(self, filename):
+        """
+        Write this configuration in the compiled binary format, which loads
+        without any parsing. Only plain data can be compiled.
+
+        Args:
+            filename (str): where to write, conventionally ending in
+                `.dripc`.
+
+        """
+        from dripconfig import compiled
+        compiled.dump(self, filename)
+
     def merge_from(self, *sources):
         """
         Merges configuration from the first source that actually contains
@@ -92,7 +141,7 @@ class ConfigDict(OrderedDict):
                 break
 
         if source_to_use:
-            self.merge(source_to_use.filename)
+            source_to_use.merge_into(self)
         else:
             raise RuntimeError("No valid configuration sources found")
 
@@ -100,6 +149,12 @@ class ConfigDict(OrderedDict):
         """
         Merge configuration based on dynamic detection.
 
+        Strings are taken to be filenames if they have no newlines and
+        end in an extension registered with `dripconfig.formats`;
+        otherwise they are configuration themselves, and the format is
+        sniffed from their first few characters. Single lines that are
+        neither are refused rather than parsed as the default format.
+
         Args:
             thing (object): the thing to be merged.
 
@@ -109,34 +164,32 @@ class ConfigDict(OrderedDict):
         elif isinstance(thing, configparser.ConfigParser):
             return self.merge_configparser(thing)
         elif isinstance(thing, basestring):
-            if thing.endswith('ini'):
-                return self.merge_ini_file(thing)
-            elif thing.endswith('json'):
-                return self.merge_json_file(thing)
-
-            try:
-                return self.merge_json(thing)
-            except:
-                pass
+            if '\n' not in thing:
+                fmt = formats.for_filename(thing)
+                if fmt is not None and fmt.merge_file is not None:
+                    return fmt.merge_file(self, thing)
 
-            try:
-                return self.merge_yaml(thing)
-            except:
-                pass
+            fmt = formats.sniff(thing, default='\n' in thing)
+            if fmt is not None:
+                return fmt.merge_string(self, thing)
 
         raise ValueError(
             "Couldn't merge %s of type %s" % (thing, type(thing))
         )
 
-    def merge_dict(self, cfg):
+    def merge_dict(self, cfg, list_strategies=None):
         """
         Update configuration by setting values from the configuration
         dictionary given.  Nested dictionaries are *updated* not replaced.
 
         Args:
             cfg (dict): dictionary of configuration information to merge
+            list_strategies (dict): {dotted path: merging.ListStrategy} for
+                lists to merge rather than replace in this merge, on top of
+                those registered; see `dripconfig.merging`.
         """
-        self._merge_dict(cfg)
+        self._merge_dict(
+            cfg, lists=self._list_strategies(list_strategies))
 
     def merge_configparser(self, cfg):
         """
@@ -199,16 +252,55 @@ class ConfigDict(OrderedDict):
         with open(json_filename, 'r') as f:
             return self.merge_json(f.read())
 
-    def merge_yaml(self, yaml):
+    def merge_yaml(self, yaml_string):
         """
-        merge configuration from a yaml stream
+        merge configuration from a yaml stream. Only safe YAML is loaded,
+        and documents that are too large or expand to too many values are
+        refused; see `dripconfig.yamlload`.
 
         Args:
-            yaml (str|stream): yaml string
+            yaml_string (str|stream): yaml string
+
+        Raises:
+            ValueError: if the document isn't a mapping (or empty).
+        """
+        from dripconfig import yamlload
+        cfg = yamlload.load(yaml_string)
+        if cfg is None:
+            return
+        if not isinstance(cfg, ConfigDict):
+            raise ValueError(
+                "Couldn't merge a YAML %s; expected a mapping" %
+                type(cfg).__name__)
+        # already ConfigDicts and copied aliases; no need to configify.
+        self._merge_dict(cfg, copy=False)
+
+    def merge_yaml_file(self, yaml_filename):
         """
-        cfg = yaml.load(yaml)
+        Merge yaml configuration from a filename.
+
+        """
+        with open(yaml_filename, 'r') as f:
+            # so that only as much as the size limit allows is read.
+            return self.merge_yaml(f)
+
+    def merge_toml(self, toml_string):
+        """
+        merge configuration from a toml string. Requires the `toml`
+        package (the 'toml' extra).
+        """
+        import toml
+        cfg = toml.loads(toml_string, _dict=OrderedDict)
         self.merge_dict(cfg)
 
+    def merge_toml_file(self, toml_filename):
+        """
+        Merge toml configuration from a filename.
+
+        """
+        with open(toml_filename, 'r') as f:
+            return self.merge_toml(f.read())
+
     def merge_ini_file(self, ini_filename):
         """
         merge configuration stored in a .ini file.
@@ -221,16 +313,121 @@ class ConfigDict(OrderedDict):
         cfg.read(ini_filename)
         self.merge_configparser(cfg)
 
+    def merge_typed_ini(self, ini_string):
+        """
+        merge configuration from an ini string with the single pass loader
+        in `dripconfig.ini`: `[a.b]` sections nest, and values are
+        converted while parsing by the Coerce/Boolean validators of the
+        schemas of registered triggers.
+
+        Args:
+            ini_string (str): ini text
+        """
+        from dripconfig import ini
+        parsed = ini.parse(
+            ini_string.splitlines(), self._schema_converters())
+        self._merge_dict(parsed, copy=False)
+
+    def merge_typed_ini_file(self, ini_filename):
+        """
+        merge configuration stored in a .ini file with the single pass
+        loader; see merge_typed_ini.
+
+        Args:
+            ini_filename (str): path to ini file to load
+        """
+        from dripconfig import ini
+        with open(ini_filename, 'r') as f:
+            parsed = ini.parse(f, self._schema_converters(), ini_filename)
+        self._merge_dict(parsed, copy=False)
+
+    def _schema_converters(self):
+        from dripconfig import ini
+        schemas = [
+            getattr(trigger, 'partial_schema', None) or
+            getattr(trigger, 'schema', None)
+            for trigger in self._triggers
+        ]
+        return ini.schema_converters(*[s for s in schemas if s is not None])
+
+    def merge_compiled(self, data):
+        """
+        merge configuration from the contents of a compiled file.
+
+        Args:
+            data (str): as produced by `compiled.dumps`.
+        """
+        from dripconfig import compiled
+        self._merge_dict(compiled.loads(data), copy=False)
+
+    def merge_compiled_file(self, compiled_filename):
+        """
+        merge configuration from a file written by `dump_compiled`.
+
+        Args:
+            compiled_filename (str): path to the compiled file.
+        """
+        self._merge_dict(
+            self.load_compiled(compiled_filename), copy=False)
+
     # ... etc
 
-    def _merge_dict(self, cfg):
+    def _merge_dict(self, cfg, copy=True, lists=None, path=()):
+        """
+        Args:
+            cfg (dict): configuration to merge.
+            copy (bool): if False, values of `cfg` are taken over as they
+                are rather than copied with `configify`. Only pass False for
+                freshly built ConfigDicts nobody else holds on to.
+            lists (merging._Strategies): how lists are merged; defaults to
+                the strategies registered here. () replaces all lists.
+            path (tuple): of this ConfigDict, where `lists` are concerned.
+        """
+        if lists is None:
+            lists = self._list_strategies()
+
         for k, v in cfg.items():
             # do partial updates where needed
-            existing = self.get(k)
+            existing = dict.get(self, k)
             if _is_dicty(v) and isinstance(existing, ConfigDict):
-                existing._merge_dict(v)
-            else:
-                self[k] = configify(v)
+                if existing._frozen:
+                    # shared with other trees; change a copy of our own.
+                    existing = self[k] = ConfigDict(existing)
+                existing._merge_dict(v, copy, lists, path + (k,))
+                continue
+
+            if copy:
+                v = configify(v)
+            if lists and _is_listy(v) and _is_listy(existing):
+                strategy = lists.get(path + (k,))
+                if strategy is not None:
+                    v = strategy.merge(
+                        existing, v, _item_merger(lists, path + (k,)))
+            self[k] = v
+
+    def register_list_strategy(self, path, strategy):
+        """
+        Merge lists at `path` into this configuration with `strategy`
+        rather than replacing them; see `dripconfig.merging`.
+
+        Args:
+            path (str): dotted path, wildcards allowed: 'servers',
+                'clusters.*.nodes'.
+            strategy (merging.ListStrategy): e.g. `MergeByKey('name')`.
+        """
+        self.__dict__.setdefault('_list_strategy_paths', {})[path] = strategy
+
+    def _list_strategies(self, extra=None):
+        paths = {}
+        for trigger in self.__dict__.get('_triggers', ()):
+            paths.update(getattr(trigger, 'list_strategies', None) or {})
+        paths.update(self.__dict__.get('_list_strategy_paths', {}))
+        paths.update(extra or {})
+        if not paths:
+            return ()
+
+        from dripconfig import merging
+        return merging.strategies(paths)
 
     def register_trigger(self, trigger):
         """
@@ -239,6 +436,8 @@ class ConfigDict(OrderedDict):
                 configures something!
         """
         self._triggers.append(trigger)
+        if getattr(trigger, 'fork_sensitive', False):
+            _watch_forks(self)
 
     def configure(self, clean=True):
         """
@@ -250,8 +449,353 @@ class ConfigDict(OrderedDict):
         """
         for ext in self._triggers:
             cleaned = ext.clean(self)
-            self._merge_dict(cleaned)
+            self._merge_dict(cleaned, lists=())
             ext.configure(self)
+        self._configured = True
+
+    def configure_concurrently(self, timeout=None):
+        """
+        Like `configure`, but once every trigger has cleaned (in order, as
+        cleaning may depend on earlier cleans), run their `configure`s in
+        parallel threads. A trigger waits for the triggers of the classes
+        in its `depends_on`, and may take its `timeout` seconds at most.
+
+        timeout (float): for triggers that don't set their own `timeout`.
+            defaults to waiting forever.
+
+        Raises:
+            parallel.TriggerTimeout: if a trigger took too long.
+            the exception of the first trigger that failed, if any. Triggers
+            depending on a failed one aren't configured.
+        """
+        from dripconfig import parallel
+
+        triggers = list(self._triggers)
+        parallel.dependencies(triggers)
+
+        for ext in triggers:
+            self._merge_dict(ext.clean(self), lists=())
+
+        parallel.configure(self, triggers, timeout)
+        self._configured = True
+
+    def after_fork(self):
+        """
+        Re-run `configure` (only) of the fork sensitive triggers, so a
+        forked child gets its own sockets, connections etc. rather than
+        sharing its parent's. Does nothing until `configure` has run.
+
+        This is hooked up automatically for children forked by
+        `multiprocessing`, or for all forks where the platform supports
+        `os.register_at_fork`. Otherwise call it yourself after forking,
+        e.g. from gunicorn's `post_fork` hook.
+        """
+        if not self.__dict__.get('_configured'):
+            return
+
+        for ext in self._triggers:
+            if getattr(ext, 'fork_sensitive', False):
+                ext.configure(self)
+
+    def memory_report(self):
+        """
+        Measure the memory this configuration takes, per top-level section
+        and per type of object, and find equal strings stored separately
+        that could be interned.
+
+        Returns:
+            memory.MemoryReport. print it for a summary.
+        """
+        from dripconfig.memory import memory_report
+        return memory_report(self)
+
+    def track_access(self, sample_rate=1.0):
+        """
+        Start counting reads of this configuration's keys, e.g. to find hot
+        keys worth caching in locals and keys nobody reads at all.
+
+        Args:
+            sample_rate (float): fraction of reads to record. Lower rates
+                keep the overhead down on read-heavy processes.
+
+        Returns:
+            profiling.AccessTracker. call `stop()` on it (or use it as a
+            context manager) and then ask it for `counts()`, `unread()` or
+            a `report()`.
+
+        """
+        from dripconfig.profiling import AccessTracker
+        return AccessTracker(self, sample_rate).start()
+
+    def iter_dump(self, format='json', redact=(), indent=None):
+        """
+        Serialize this configuration in chunks, as the tree is walked, e.g.
+        to stream it to a socket or file without building it in memory.
+
+        Args:
+            format (str): 'json' or 'yaml'.
+            redact ([str, ...]): dotted patterns, with shell style
+                wildcards, of paths whose values are written as
+                '<redacted>', e.g. ['*.password', 'sentry.dsn'].
+            indent (int): pretty print JSON with this indent.
+
+        Returns:
+            iterator. str chunks; see `dripconfig.dump`.
+        """
+        from dripconfig.dump import iter_dump
+        return iter_dump(self, format, redact, indent)
+
+    def override(self, cfg):
+        """
+        Override values for the current thread only, without copying or
+        changing the configuration:
+
+            >>> with config.override({'billing': {'timeout': 1}}):
+                    handle(request)
+
+        Other threads keep seeing the configuration as it is. See
+        `dripconfig.overrides` for what does and doesn't see overrides.
+
+        Args:
+            cfg (dict): nested values to override, as for `merge_dict`.
+
+        Returns:
+            a context manager; the override is in place inside its block.
+        """
+        from dripconfig.overrides import override
+        return override(self, cfg)
+
+    def fingerprint(self):
+        """
+        A content hash of this configuration, e.g. for comparing configs
+        across hosts or as a cache key for work derived from them. Key
+        order doesn't matter; str and unicode with the same text hash
+        alike.
+
+        Fingerprints are cached per ConfigDict and only recomputed along
+        paths that changed since they were last asked for.
+
+        Returns:
+            str. hex sha1 digest.
+        """
+        fp = self._fingerprint
+        if fp is None:
+            h = hashlib.sha1('d')
+            for key in sorted(self):
+                h.update(_fingerprint_scalar(key))
+                h.update(_fingerprint_value(dict.__getitem__(self, key)))
+            fp = self._fingerprint = h.hexdigest()
+        return fp
+
+    def fingerprints(self):
+        """
+        Returns:
+            OrderedDict. the fingerprint of each top-level value by key.
+        """
+        return OrderedDict(
+            (key, _fingerprint_hex(value)) for key, value in self.iteritems())
+
+    def interpolate(self):
+        """
+        Resolve `${section.key}` references in values (see
+        `dripconfig.interpolation`), relative to this ConfigDict. Call it
+        after merging; later calls only re-resolve the references affected
+        by what changed under this ConfigDict since.
+
+        Raises:
+            interpolation.InterpolationError: for references to missing
+                paths and reference cycles.
+        """
+        interpolator = self.__dict__.get('_interpolator')
+        if interpolator is None:
+            from dripconfig.interpolation import Interpolator
+            interpolator = self._interpolator = Interpolator(self)
+        return interpolator.resolve()
+
+    def find(self, pattern):
+        """
+        Find values by a dotted glob pattern, e.g. 'features.*.enabled'.
+        Queries go through an index of the tree's paths, built on first use
+        and kept up to date with changes (see `dripconfig.pathindex`).
+
+        Returns:
+            OrderedDict. {path tuple: value} for the matching paths below
+            this ConfigDict, in sorted order.
+        """
+        index, under = self._index_and_path()
+        return index.find(pattern, under)
+
+    def iter_paths(self, prefix=()):
+        """
+        Args:
+            prefix (tuple|str): a path, as a tuple of keys or dotted.
+
+        Returns:
+            iterator. the paths of all keys under `prefix`, at any depth
+            (but not inside lists), in sorted order.
+        """
+        index, under = self._index_and_path()
+        return index.iter_paths(prefix, under)
+
+    def _index_and_path(self):
+        """
+        Returns:
+            (pathindex.PathIndex, tuple). the index of the tree this
+            ConfigDict is in and the path to it, or a one off index of this
+            ConfigDict if it can't be reached through ConfigDicts from the
+            root.
+        """
+        from dripconfig.pathindex import PathIndex
+
+        node, path = _root_and_path(self)
+        reached = node
+        for key in path:
+            if not isinstance(reached, ConfigDict):
+                break
+            reached = dict.get(reached, key)
+        if reached is not self:
+            return PathIndex(self, observe=False), ()
+
+        index = node.__dict__.get('_path_index')
+        if index is None:
+            index = node._path_index = PathIndex(node)
+        return index, path
+
+    ## pickling ##
+
+    def __reduce__(self):
+        """
+        Pickle the data only, as a single compact string in the compiled
+        format, or as a reference if the configuration is `share`d.
+        Triggers don't come along.
+
+        Trees holding objects the compiled format can't store fall back to
+        pickling node by node.
+        """
+        if _shared:
+            fingerprint = self.fingerprint()
+            if _shared.get(fingerprint) is self:
+                return (_unpickle_shared, (fingerprint,))
+
+        from dripconfig import compiled
+        try:
+            return (_unpickle_compiled, (compiled.dumps(self),))
+        except (TypeError, ValueError):
+            return (self.__class__, ([[k, v] for k, v in self.items()],))
+
+    def __copy__(self):
+        copied = self.__class__(self)
+        copied._triggers = self._triggers
+        return copied
+
+    def __deepcopy__(self, memo):
+        copied = self.__class__()
+        memo[id(self)] = copied
+        for key, value in self.iteritems():
+            copied[key] = copy.deepcopy(value, memo)
+        copied._triggers = copy.deepcopy(self._triggers, memo)
+        return copied
+
+    def share(self):
+        """
+        Have pickles of this configuration refer to it by fingerprint
+        rather than hold its data, e.g. before creating a
+        `multiprocessing.Pool` that it will be sent to many times.
+
+        Only processes that already hold it can unpickle such references,
+        i.e. children forked after `share` was called. Unpickling gives
+        back this very object, so don't change it while shared.
+
+        Returns:
+            str. the fingerprint it is shared under.
+        """
+        fingerprint = self.fingerprint()
+        _shared[fingerprint] = self
+        return fingerprint
+
+    def unshare(self):
+        """
+        Undo `share`.
+        """
+        for fingerprint, config in _shared.items():
+            if config is self:
+                del _shared[fingerprint]
+
+    ## iteration ##
+
+    # python 2's OrderedDict reads values for these through self[key]. Read
+    # them directly instead, so that walks over the tree (dumping, pickling,
+    # json.dumps, copies) aren't taken for reads by read hooks.
+
+    def iteritems(self):
+        for key in self:
+            yield key, dict.__getitem__(self, key)
+
+    def itervalues(self):
+        for key in self:
+            yield dict.__getitem__(self, key)
+
+    def items(self):
+        return [(key, dict.__getitem__(self, key)) for key in self]
+
+    def values(self):
+        return [dict.__getitem__(self, key) for key in self]
+
+    ## change propagation ##
+
+    def __setitem__(self, key, value, *args, **kwargs):
+        if self._frozen:
+            _refuse_change(self)
+        OrderedDict.__setitem__(self, key, value, *args, **kwargs)
+        _link_children(self, (key,), value)
+        self._changed((key,))
+
+    def __delitem__(self, key, *args, **kwargs):
+        if self._frozen:
+            _refuse_change(self)
+        OrderedDict.__delitem__(self, key, *args, **kwargs)
+        self._changed((key,))
+
+    def clear(self):
+        if self._frozen:
+            _refuse_change(self)
+        OrderedDict.clear(self)
+        self._changed()
+
+    def _changed(self, segments=()):
+        """
+        Note that the value at `segments` below this ConfigDict changed:
+        drop cached fingerprints up to the roots of every tree it is in and
+        tell the observers on the way which path changed.
+        """
+        if self._fingerprint is None and not _observed:
+            # nothing above is cached either (fingerprinting a ConfigDict
+            # caches its sections' fingerprints), and no one is listening.
+            return
+
+        pending = [(self, segments)]
+        while pending:
+            node, path = pending.pop()
+            if node._fingerprint is None and not _observed:
+                continue
+            node._fingerprint = None
+
+            observers = node.__dict__.get('_observers')
+            if observers:
+                for observer in observers:
+                    observer(path)
+
+            for parent, parent_segments in _live_links(node):
+                pending.append((parent, parent_segments + path))
+
+    def _add_observer(self, observer):
+        """
+        Have `observer(path)` called with the path (a tuple of keys and
+        list indexes, from this ConfigDict) of everything that changes
+        under this ConfigDict from now on, wherever it is stored.
+        """
+        self.__dict__.setdefault('_observers', []).append(observer)
+        _observed[id(self)] = self
 
     ## attribute access ##
 
@@ -302,6 +846,245 @@ def configify(ob):
 
 # bool true, false, yes, no, on, off, 1, 0
 
+
+#
+# fork handling
+#
+
+# ConfigDicts that have observers, by id; until there are any, changes only
+# go up the tree as far as fingerprints are cached.
+_observed = weakref.WeakValueDictionary()
+
+# how many links a ConfigDict collects before the stale ones are dropped.
+_PRUNE_LINKS = 8
+
+# ConfigDicts with fork sensitive triggers, by id.
+_fork_watched = weakref.WeakValueDictionary()
+# whether _after_fork_in_child is registered with os.register_at_fork, which
+# can't be undone.
+_fork_hook_registered = False
+
+
+def _watch_forks(config):
+    global _fork_hook_registered
+    if id(config) in _fork_watched:
+        return
+
+    if hasattr(os, 'register_at_fork'):
+        if not _fork_hook_registered:
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+            _fork_hook_registered = True
+    else:
+        multiprocessing.util.register_after_fork(config, ConfigDict.after_fork)
+
+    _fork_watched[id(config)] = config
+
+
+def _after_fork_in_child():
+    for config in _fork_watched.values():
+        config.after_fork()
+
+
+#
+# pickling
+#
+
+# shared ConfigDicts by fingerprint; see ConfigDict.share.
+_shared = {}
+
+
+def _unpickle_compiled(data):
+    from dripconfig import compiled
+    return compiled.loads(data)
+
+
+def _unpickle_shared(fingerprint):
+    try:
+        return _shared[fingerprint]
+    except KeyError:
+        raise ValueError(
+            "Shared config %s isn't known to this process; share() it "
+            "before forking" % fingerprint)
+
+
+def _refuse_change(node):
+    raise TypeError(
+        "This ConfigDict is shared between interned configurations and "
+        "can't be changed; merge into the configuration holding it instead")
+
+
+def _item_merger(lists, path):
+    """
+    Returns:
+        callable. the `merge_item` of list strategies merging into the list
+        at `path`.
+    """
+    def merge_item(index, old, new):
+        if not isinstance(old, ConfigDict):
+            old = configify(old)
+        elif old._frozen:
+            old = ConfigDict(old)
+        old._merge_dict(new, False, lists, path + (index,))
+        return old
+    return merge_item
+
+
+def _link_children(parent, segments, value):
+    if isinstance(value, ConfigDict):
+        if not value._frozen:
+            # frozen ConfigDicts have many parents, and never change.
+            links = value._links
+            for ref, linked in links:
+                if linked == segments and ref() is parent:
+                    return
+            if len(links) >= _PRUNE_LINKS:
+                # links are otherwise only pruned when changes propagate.
+                links = tuple(
+                    (weakref.ref(p), s) for p, s in _live_links(value))
+            value._links = links + ((weakref.ref(parent), segments),)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _link_children(parent, segments + (index,), item)
+
+
+def _live_links(node):
+    """
+    Returns:
+        [(ConfigDict, segments), ...]. the parents still holding `node`,
+        and where. Links to parents that are gone or hold something else
+        there now are dropped.
+    """
+    links = node._links
+    if not links:
+        return []
+
+    live = []
+    for ref, segments in links:
+        parent = ref()
+        if parent is not None and _holds(parent, segments, node):
+            live.append((parent, segments))
+    if len(live) != len(links):
+        node._links = tuple((weakref.ref(p), s) for p, s in live)
+    return live
+
+
+def _holds(parent, segments, node):
+    value = dict.get(parent, segments[0])
+    for index in segments[1:]:
+        if not isinstance(value, list) or index >= len(value):
+            return False
+        value = value[index]
+    return value is node
+
+
+def _root_and_path(node):
+    """
+    Returns:
+        (ConfigDict, tuple). the root of the (first) tree `node` is in, and
+        the path to `node` from it.
+    """
+    links = []
+    while True:
+        parents = _live_links(node)
+        if not parents:
+            break
+        node, segments = parents[0]
+        links.append(segments)
+    return node, sum(reversed(links), ())
+
+#
+# read hooks
+#
+
+# hooks on ConfigDict reads (access tracking, scoped overrides), outermost
+# first. `hook(node, key, read)` returns the value, calling `read(node, key)`
+# for the value underneath. While there are none, ConfigDict.__getitem__ is
+# OrderedDict's and reads cost nothing extra.
+_read_hooks = []
+_read_hooks_lock = threading.Lock()
+
+
+def _install_read_hook(hook):
+    with _read_hooks_lock:
+        _read_hooks.append(hook)
+        _compose_read_hooks()
+
+
+def _uninstall_read_hook(hook):
+    with _read_hooks_lock:
+        if hook in _read_hooks:
+            _read_hooks.remove(hook)
+            _compose_read_hooks()
+
+
+def _compose_read_hooks():
+    if not _read_hooks:
+        if '__getitem__' in ConfigDict.__dict__:
+            del ConfigDict.__getitem__
+            del ConfigDict.get
+        return
+
+    read = OrderedDict.__getitem__
+    for hook in reversed(_read_hooks):
+        read = _hooked_read(hook, read)
+    ConfigDict.__getitem__ = read
+    # dict.get doesn't go through __getitem__.
+    ConfigDict.get = _hooked_get
+
+
+def _hooked_read(hook, read):
+    def __getitem__(self, key):
+        return hook(self, key, read)
+    return __getitem__
+
+
+def _hooked_get(self, key, default=None):
+    try:
+        return self[key]
+    except KeyError:
+        return default
+
+#
+# content hashing
+#
+
+
+def _fingerprint_scalar(ob):
+    if isinstance(ob, unicode):
+        tag, data = 's', ob.encode('utf-8')
+    elif isinstance(ob, str):
+        tag, data = 's', ob
+    elif isinstance(ob, bool):
+        tag, data = 'b', str(int(ob))
+    elif isinstance(ob, (int, long)):
+        tag, data = 'i', str(ob)
+    elif isinstance(ob, float):
+        tag, data = 'f', repr(ob)
+    elif ob is None:
+        tag, data = 'n', ''
+    else:
+        tag, data = 'o', '%s:%r' % (type(ob).__name__, ob)
+    return '%s%d:%s' % (tag, len(data), data)
+
+
+def _fingerprint_value(ob):
+    if isinstance(ob, ConfigDict):
+        return 'h' + ob.fingerprint()
+    elif isinstance(ob, (list, tuple)):
+        h = hashlib.sha1('l' if isinstance(ob, list) else 't')
+        for item in ob:
+            h.update(_fingerprint_value(item))
+        return 'h' + h.hexdigest()
+    elif _is_dicty(ob):
+        return 'h' + configify(ob).fingerprint()
+    return _fingerprint_scalar(ob)
+
+
+def _fingerprint_hex(ob):
+    if isinstance(ob, ConfigDict):
+        return ob.fingerprint()
+    return hashlib.sha1(_fingerprint_value(ob)).hexdigest()
+
 #
 # quack-tests for data types
 #
@@ -0,0 +1,330 @@
+"""
+A small local daemon that loads configuration once and hands it out over a
+unix socket.
+
+The daemon merges (and cleans) its configuration a single time and sends
+the result to every process that subscribes. When the daemon is reloaded
+only the paths that changed are pushed, so subscribers don't re-parse
+anything.
+
+Run it with:
+
+    python -m dripconfig.daemon /run/dripconfig.sock base.json overrides.ini
+
+and send it SIGHUP to reload. Processes pick it up with
+`sources.LocalDaemon('/run/dripconfig.sock')`.
+
+Wire protocol: every message is a 4 byte big-endian length followed by
+that many bytes of JSON, either
+
+    {"type": "snapshot", "version": 1, "data": {...}}
+
+sent once on connect, or
+
+    {"type": "delta", "version": 2, "ops": [["set", [path...], value],
+                                            ["del", [path...]]]}
+
+sent on every reload that changed something.
+
+"""
+from collections import OrderedDict
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+
+from dripconfig.configdict import ConfigDict, configify
+
+
+log = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+
+def send_message(sock, message):
+    """
+    Send one length-prefixed JSON message.
+
+    """
+    payload = json.dumps(message, separators=(',', ':'))
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock):
+    """
+    Receive one length-prefixed JSON message.
+
+    Returns:
+        OrderedDict. the message, or None if the peer hung up.
+
+    """
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+
+    payload = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+
+    return json.loads(payload, object_hook=OrderedDict)
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return ''.join(chunks)
+
+
+def diff(old, new, path=()):
+    """
+    Compute the operations that turn the plain data `old` into `new`.
+
+    Returns:
+        list. of ["set", path, value] and ["del", path] operations, where
+        path is a list of keys.
+
+    """
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        if old == new and type(old) is type(new):
+            return []
+        return [['set', list(path), new]]
+
+    ops = []
+    for key, value in new.iteritems():
+        if key in old:
+            ops.extend(diff(old[key], value, path + (key,)))
+        else:
+            ops.append(['set', list(path + (key,)), value])
+
+    for key in old:
+        if key not in new:
+            ops.append(['del', list(path + (key,))])
+
+    return ops
+
+
+def apply_delta(config, ops):
+    """
+    Apply operations produced by `diff` to a ConfigDict in place.
+
+    """
+    for op in ops:
+        action, path = op[0], op[1]
+        if not path:
+            # the whole tree was replaced.
+            config.clear()
+            config.merge_dict(op[2])
+            continue
+
+        node = config
+        for key in path[:-1]:
+            child = dict.get(node, key)
+            if not isinstance(child, ConfigDict):
+                if action == 'del':
+                    node = None
+                    break
+                child = node[key] = ConfigDict()
+            node = child
+
+        if action == 'set':
+            node[path[-1]] = configify(op[2])
+        elif node is not None:
+            node.pop(path[-1], None)
+
+
+def _plain(ob):
+    """
+    Turn a ConfigDict tree into plain json-able data.
+
+    """
+    if isinstance(ob, dict):
+        return OrderedDict((k, _plain(v)) for k, v in ob.iteritems())
+    elif isinstance(ob, (list, tuple)):
+        return [_plain(x) for x in ob]
+    return ob
+
+
+class ConfigDaemon(object):
+    """
+    Loads configuration once and serves it to subscribers on a unix socket.
+
+    """
+    def __init__(self, socket_path, *things):
+        """
+        Args:
+            socket_path (str): where to listen.
+            things: anything `ConfigDict.merge` accepts, merged in order on
+                every (re)load.
+
+        """
+        self.socket_path = socket_path
+        self.things = things
+        self.version = 0
+        self._triggers = []
+        self._data = OrderedDict()
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._server = None
+
+    def register_trigger(self, trigger):
+        """
+        Register a trigger whose `clean` runs on every load. `configure` is
+        left to the subscribing processes.
+
+        """
+        self._triggers.append(trigger)
+
+    def load(self):
+        """
+        Merge and clean the configuration.
+
+        Returns:
+            OrderedDict. the plain data that would be served.
+
+        Raises:
+            ValueError: if the configuration holds values JSON can't
+                represent, e.g. dates loaded from YAML.
+
+        """
+        config = ConfigDict()
+        for thing in self.things:
+            config.merge(thing)
+
+        for trigger in self._triggers:
+            config._merge_dict(trigger.clean(config), lists=())
+
+        data = _plain(config)
+        try:
+            json.dumps(data, separators=(',', ':'))
+        except TypeError as e:
+            raise ValueError("Can't serve configuration: %s" % e)
+        return data
+
+    def reload(self):
+        """
+        Reload the configuration and push what changed to subscribers.
+        If it can't be loaded, the current version keeps being served.
+
+        Returns:
+            list. the delta operations that were sent.
+
+        """
+        data = self.load()
+
+        with self._lock:
+            ops = diff(self._data, data)
+            self._data = data
+            if not ops:
+                return ops
+            self.version += 1
+            self._broadcast(
+                {'type': 'delta', 'version': self.version, 'ops': ops})
+
+        log.info("config version %s pushed to %s subscribers",
+                 self.version, len(self._subscribers))
+        return ops
+
+    def start(self):
+        """
+        Load the configuration and start serving on a background thread.
+
+        """
+        self._data = self.load()
+        self.version = 1
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        self._server.listen(128)
+
+        thread = threading.Thread(target=self._accept_loop)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def close(self):
+        with self._lock:
+            if self._server is not None:
+                self._server.close()
+                self._server = None
+            for sock in self._subscribers:
+                sock.close()
+            self._subscribers = []
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _accept_loop(self):
+        while True:
+            server = self._server
+            if server is None:
+                return
+            try:
+                sock, _ = server.accept()
+            except socket.error:
+                return
+
+            with self._lock:
+                try:
+                    send_message(sock, {
+                        'type': 'snapshot',
+                        'version': self.version,
+                        'data': self._data,
+                    })
+                except Exception:
+                    # keep serving everyone else.
+                    log.exception("couldn't send snapshot to subscriber")
+                    sock.close()
+                    continue
+                self._subscribers.append(sock)
+
+    def _broadcast(self, message):
+        for sock in list(self._subscribers):
+            try:
+                send_message(sock, message)
+            except socket.error:
+                sock.close()
+                self._subscribers.remove(sock)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        sys.stderr.write(
+            "usage: python -m dripconfig.daemon SOCKET CONFIG [CONFIG ...]\n")
+        return 2
+
+    logging.basicConfig(level=logging.INFO)
+    daemon = ConfigDaemon(argv[0], *argv[1:]).start()
+    signal.signal(signal.SIGHUP, lambda *_: _reload(daemon))
+
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+
+def _reload(daemon):
+    try:
+        daemon.reload()
+    except Exception:
+        log.exception("couldn't reload, still serving version %s",
+                      daemon.version)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Streaming serialization of a configuration tree.
+
+    >>> with open('config.json', 'w') as f:
+            for chunk in config.iter_dump('json', redact=['*.password']):
+                f.write(chunk)
+
+The tree is written out as it is walked, in chunks of about `CHUNK_SIZE`
+bytes, so memory use doesn't grow with the size of the configuration.
+
+JSON output is what `json.dumps` gives (ASCII); with `indent` it is
+pretty printed without the trailing spaces python 2's `json` leaves.
+YAML output is block style; strings are double quoted with JSON escapes
+unless they are plain words that can't be mistaken for anything else.
+
+Values whose dotted paths match a `redact` pattern are written as
+`REDACTED` instead, sections included. Patterns are matched segment by
+segment with shell style wildcards, list indexes being segments too:
+'servers.*.password', '*.secret_key'.
+
+"""
+import datetime
+import fnmatch
+from json.encoder import encode_basestring_ascii
+import re
+
+
+__all__ = (
+    'REDACTED',
+    'iter_dump',
+)
+
+
+CHUNK_SIZE = 64 * 1024
+
+REDACTED = '<redacted>'
+
+# strings YAML can take unquoted.
+_YAML_PLAIN = re.compile(r'^[A-Za-z_][A-Za-z0-9_./-]*$')
+_YAML_RESERVED = frozenset([
+    'y', 'n', 'yes', 'no', 'true', 'false', 'on', 'off', 'null', '~'])
+
+
+def iter_dump(config, format='json', redact=(), indent=None):
+    """
+    Serialize a configuration piece by piece.
+
+    Args:
+        config (ConfigDict): what to serialize.
+        format (str): 'json' or 'yaml'.
+        redact ([str, ...]): dotted patterns of paths to redact.
+        indent (int): for JSON, indent nested values by this many spaces
+            (as `json.dumps` does). YAML is always indented by 2.
+
+    Returns:
+        iterator. str chunks that join up to the serialized configuration.
+
+    Raises:
+        TypeError: for values that can't be serialized in `format`. Chunks
+            before the bad value have already been produced by then.
+
+    """
+    redactor = _Redactor(redact)
+    if format == 'json':
+        pieces = _json(config, (), redactor, indent, 0)
+    elif format == 'yaml':
+        pieces = _yaml_root(config, redactor)
+    else:
+        raise ValueError("Unknown dump format %r" % format)
+
+    return _chunks(pieces)
+
+
+def _chunks(pieces):
+    buf = []
+    size = 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield ''.join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield ''.join(buf)
+
+
+class _Redactor(object):
+
+    def __init__(self, patterns):
+        self.by_length = {}
+        for pattern in patterns:
+            segments = pattern.split('.')
+            self.by_length.setdefault(len(segments), []).append(
+                [re.compile(fnmatch.translate(s)).match for s in segments])
+
+    def __call__(self, path):
+        for matchers in self.by_length.get(len(path), ()):
+            if all(match(str(key)) for match, key in zip(matchers, path)):
+                return True
+        return False
+
+
+#
+# json
+#
+
+def _json(value, path, redact, indent, level):
+    if path and redact(path):
+        yield encode_basestring_ascii(REDACTED)
+    elif isinstance(value, dict):
+        if not value:
+            yield '{}'
+            return
+        start, separator, end = _json_layout(indent, level, '{', '}')
+        yield start
+        first = True
+        for key, item in value.iteritems():
+            if not first:
+                yield separator
+            first = False
+            yield _json_key(key)
+            yield ': '
+            for piece in _json(item, path + (key,), redact, indent, level + 1):
+                yield piece
+        yield end
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            yield '[]'
+            return
+        start, separator, end = _json_layout(indent, level, '[', ']')
+        yield start
+        for index, item in enumerate(value):
+            if index:
+                yield separator
+            for piece in _json(item, path + (index,), redact, indent,
+                               level + 1):
+                yield piece
+        yield end
+    else:
+        yield _json_scalar(value)
+
+
+def _json_layout(indent, level, open, close):
+    if indent is None:
+        return open, ', ', close
+    inner = '\n' + ' ' * (indent * (level + 1))
+    return open + inner, ',' + inner, '\n' + ' ' * (indent * level) + close
+
+
+def _json_scalar(value):
+    if isinstance(value, basestring):
+        return encode_basestring_ascii(value)
+    elif value is None:
+        return 'null'
+    elif value is True:
+        return 'true'
+    elif value is False:
+        return 'false'
+    elif isinstance(value, (int, long)):
+        return str(value)
+    elif isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        elif value in (float('inf'), float('-inf')):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return repr(value)
+    raise TypeError("%r is not JSON serializable" % (value,))
+
+
+def _json_key(key):
+    if isinstance(key, basestring):
+        return encode_basestring_ascii(key)
+    elif key is None or isinstance(key, (bool, int, long, float)):
+        return '"%s"' % _json_scalar(key)
+    raise TypeError("key %r is not a string" % (key,))
+
+
+#
+# yaml
+#
+
+def _yaml_root(config, redact):
+    if _yaml_is_inline(config):
+        yield _yaml_scalar(config)
+        yield '\n'
+        return
+    for piece in _yaml_block(config, (), redact, 0, ''):
+        yield piece
+
+
+def _yaml_is_inline(value):
+    return not isinstance(value, (dict, list, tuple)) or not value
+
+
+def _yaml_block(value, path, redact, indent, first):
+    """
+    A non empty mapping or sequence, one entry per line at `indent`
+    spaces, the first line starting with `first` instead.
+
+    """
+    prefix = first
+    if isinstance(value, dict):
+        for key, item in value.iteritems():
+            item_path = path + (key,)
+            if redact(item_path):
+                item = REDACTED
+            yield prefix
+            yield _yaml_scalar(key)
+            if _yaml_is_inline(item):
+                yield ': '
+                yield _yaml_scalar(item)
+                yield '\n'
+            elif isinstance(item, dict):
+                yield ':\n'
+                for piece in _yaml_block(item, item_path, redact, indent + 2,
+                                         ' ' * (indent + 2)):
+                    yield piece
+            else:
+                yield ':\n'
+                for piece in _yaml_block(item, item_path, redact, indent,
+                                         ' ' * indent):
+                    yield piece
+            prefix = ' ' * indent
+    else:
+        for index, item in enumerate(value):
+            item_path = path + (index,)
+            if redact(item_path):
+                item = REDACTED
+            if _yaml_is_inline(item):
+                yield prefix
+                yield '- '
+                yield _yaml_scalar(item)
+                yield '\n'
+            else:
+                for piece in _yaml_block(item, item_path, redact, indent + 2,
+                                         prefix + '- '):
+                    yield piece
+            prefix = ' ' * indent
+
+
+def _yaml_scalar(value):
+    if isinstance(value, basestring):
+        if _YAML_PLAIN.match(value) and value.lower() not in _YAML_RESERVED:
+            return str(value)
+        return encode_basestring_ascii(value)
+    elif isinstance(value, dict):
+        return '{}'
+    elif isinstance(value, (list, tuple)):
+        return '[]'
+    elif value is None:
+        return 'null'
+    elif isinstance(value, float):
+        if value != value:
+            return '.nan'
+        elif value in (float('inf'), float('-inf')):
+            return '.inf' if value > 0 else '-.inf'
+        text = repr(value)
+        if '.' not in text and 'e' in text:
+            # YAML floats need the dot.
+            text = text.replace('e', '.0e', 1)
+        return text
+    elif isinstance(value, (bool, int, long)):
+        return _json_scalar(value)
+    elif isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError("%r is not YAML serializable" % (value,))
@@ -0,0 +1,231 @@
+"""
+Registry of the configuration formats `ConfigDict.merge` knows about.
+
+Files are matched by extension. Strings of configuration are matched by
+a cheap look at their first characters, so each input is handed to exactly
+one parser:
+
+    >>> register_format(
+            'hocon', extensions=['.conf'],
+            merge_file=lambda config, filename: ...,
+            merge_string=lambda config, text: ...,
+            sniff=lambda head: head.startswith('include '),
+        )
+
+"""
+from collections import OrderedDict
+import os
+import re
+
+
+__all__ = (
+    'Format',
+    'for_filename',
+    'register_format',
+    'sniff',
+)
+
+
+# how much of a string sniffers get to look at.
+SNIFF_SIZE = 512
+
+
+class Format(object):
+    """
+    A configuration format.
+
+    """
+    def __init__(self, name, extensions=(), merge_file=None,
+                 merge_string=None, sniff=None):
+        """
+        Args:
+            name (str): name of the format, e.g. 'json'.
+            extensions ([str, ...]): filename extensions including the dot.
+            merge_file (callable): `merge_file(config, filename)` merges a
+                file of this format into `config`.
+            merge_string (callable): `merge_string(config, text)` merges a
+                string of this format into `config`.
+            sniff (callable): `sniff(head)` returns True if a string
+                starting with `head` (leading whitespace stripped) is in
+                this format. Formats without one are never guessed.
+
+        """
+        self.name = name
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.merge_file = merge_file
+        self.merge_string = merge_string
+        self.sniff = sniff
+
+    def __repr__(self):
+        return "Format(%r)" % self.name
+
+
+_formats = OrderedDict()
+_by_extension = {}
+# used for strings no sniffer claims.
+_default_format = None
+
+
+def register_format(name, extensions=(), merge_file=None, merge_string=None,
+                    sniff=None, default=False):
+    """
+    Register (or replace) a format. Sniffers are tried most recently
+    registered first, so formats registered by applications take
+    precedence over the built in ones.
+
+    Args:
+        default (bool): use this format for strings no sniffer claims.
+
+    See `Format` for the other arguments.
+
+    Returns:
+        Format. the registered format.
+
+    """
+    global _default_format
+
+    fmt = Format(name, extensions, merge_file, merge_string, sniff)
+
+    old = _formats.pop(name, None)
+    if old is not None:
+        for ext in old.extensions:
+            _by_extension.pop(ext, None)
+
+    _formats[name] = fmt
+    for ext in fmt.extensions:
+        _by_extension[ext] = fmt
+
+    if default or (_default_format is not None and
+                   _default_format.name == name):
+        _default_format = fmt
+
+    return fmt
+
+
+def get_format(name):
+    return _formats[name]
+
+
+def for_filename(filename):
+    """
+    Returns:
+        Format. the format registered for the extension of `filename`, or
+        None.
+
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return _by_extension.get(ext) if ext else None
+
+
+def sniff(text, default=True):
+    """
+    Args:
+        default (bool): fall back to the default format for strings that no
+            sniffer claims.
+
+    Returns:
+        Format. the format a configuration string appears to be in, or
+        None if nothing claims it (and there is no default).
+
+    """
+    head = text[:SNIFF_SIZE].lstrip()
+
+    for fmt in reversed(_formats.values()):
+        if fmt.sniff is not None and fmt.merge_string is not None:
+            if fmt.sniff(head):
+                return fmt
+
+    return _default_format if default else None
+
+
+#
+# built in formats
+#
+
+# a TOML table header, `[name]` or `[[name]]`, with bare (dotted) names.
+_TOML_TABLE = re.compile(
+    r'\[\[?\s*([A-Za-z_][A-Za-z0-9_-]*)(\s*\.\s*[A-Za-z0-9_-]+)*\s*\]\]?'
+    r'\s*(#.*)?$')
+# a TOML `key = value` line.
+_TOML_KEY = re.compile(
+    r'([A-Za-z0-9_-]+|"[^"\n]*")(\s*\.\s*([A-Za-z0-9_-]+|"[^"\n]*"))*\s*=')
+# JSON values that look like table names in brackets.
+_JSON_WORDS = frozenset(['true', 'false', 'null', 'NaN', 'Infinity'])
+# the start of a YAML document, sequence or mapping.
+_YAML_START = re.compile(
+    r'(---|%YAML|-(\s|$)|("[^"\n]*"|\'[^\'\n]*\'|[^\s#:{}\[\],&*!|>%@`\'"]'
+    r'[^:\n]*):(\s|$))')
+
+
+def _first_line(head):
+    """
+    The first line of `head` that isn't blank or a comment.
+
+    """
+    for line in head.splitlines():
+        line = line.strip()
+        if line and not line.startswith('#'):
+            return line
+    return ''
+
+
+def _is_toml_table(line):
+    match = _TOML_TABLE.match(line)
+    return match is not None and match.group(1) not in _JSON_WORDS
+
+
+def _sniff_compiled(head):
+    from dripconfig.compiled import is_compiled
+    return is_compiled(head)
+
+
+def _sniff_json(head):
+    if head[:1] == '[':
+        return not _is_toml_table(head.split('\n', 1)[0].strip())
+    return head[:1] == '{' or head[:2] in ('//', '/*')
+
+
+def _sniff_toml(head):
+    line = _first_line(head)
+    return _is_toml_table(line) or _TOML_KEY.match(line) is not None
+
+
+def _sniff_yaml(head):
+    return _YAML_START.match(_first_line(head)) is not None
+
+
+# sniffers are tried last registered first.
+register_format(
+    'yaml',
+    extensions=['.yaml', '.yml'],
+    merge_file=lambda config, f: config.merge_yaml_file(f),
+    merge_string=lambda config, text: config.merge_yaml(text),
+    sniff=_sniff_yaml,
+    default=True,
+)
+register_format(
+    'ini',
+    extensions=['.ini'],
+    merge_file=lambda config, f: config.merge_ini_file(f),
+)
+register_format(
+    'json',
+    extensions=['.json'],
+    merge_file=lambda config, f: config.merge_json_file(f),
+    merge_string=lambda config, text: config.merge_json(text),
+    sniff=_sniff_json,
+)
+register_format(
+    'toml',
+    extensions=['.toml'],
+    merge_file=lambda config, f: config.merge_toml_file(f),
+    merge_string=lambda config, text: config.merge_toml(text),
+    sniff=_sniff_toml,
+)
+register_format(
+    'compiled',
+    extensions=['.dripc'],
+    merge_file=lambda config, f: config.merge_compiled_file(f),
+    merge_string=lambda config, data: config.merge_compiled(data),
+    sniff=_sniff_compiled,
+)
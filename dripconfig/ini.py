@@ -0,0 +1,195 @@
+"""
+A single pass INI loader that builds ConfigDicts directly.
+
+Compared to going through `configparser`:
+
+* `[a.b.c]` sections nest: their options end up in config['a']['b']['c'].
+  `[main]` is still the top level.
+
+* values are converted while parsing, using the `Coerce`/`Boolean`
+  validators of the voluptuous schemas registered with the configuration
+  (see `schema_converters`), so the tree doesn't hold strings until a
+  trigger's clean rewrites it. Values that don't convert are left as
+  strings for the schema to complain about.
+
+* there is no `%(name)s` interpolation; see `ConfigDict.interpolate` for
+  references between values.
+
+Otherwise the syntax is configparser's: `key = value` or `key: value`,
+keys are lowercased, indented lines continue the previous value, lines
+starting with `#` or `;` are comments and [DEFAULT] options apply to every
+section that doesn't set them.
+
+"""
+from voluptuous import All, Coerce, Marker, Schema
+
+from dripconfig.configdict import ConfigDict
+
+
+__all__ = (
+    'parse',
+    'schema_converters',
+)
+
+
+class ParsingError(ValueError):
+    """
+    The INI text couldn't be parsed.
+
+    """
+
+
+def parse(lines, converters=None, filename='<string>'):
+    """
+    Parse INI text.
+
+    Args:
+        lines (iterable): lines of text, e.g. an open file.
+        converters (dict): {path tuple: callable} converting the string
+            value at that path.
+        filename (str): used in error messages.
+
+    Returns:
+        ConfigDict. the parsed configuration.
+
+    """
+    converters = converters or {}
+    root = ConfigDict()
+    defaults = []
+    sections = []
+
+    path = None
+    node = None
+    option = None
+    value_lines = None
+
+    def finish():
+        if option is not None:
+            _store(node, path, option, '\n'.join(value_lines), converters)
+
+    for lineno, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        stripped = line.strip()
+
+        if not stripped or stripped[0] in '#;':
+            if not stripped:
+                finish()
+                option = None
+            continue
+
+        if line[0].isspace() and option is not None:
+            value_lines.append(stripped)
+            continue
+
+        finish()
+        option = None
+
+        if stripped.startswith('[') and stripped.endswith(']'):
+            name = stripped[1:-1].strip()
+            if name == 'DEFAULT':
+                path, node = None, defaults
+            else:
+                path = () if name == 'main' else tuple(name.split('.'))
+                node = _section(root, path)
+                sections.append((path, node))
+            continue
+
+        if node is None:
+            raise ParsingError(
+                "%s:%d: option outside of a section" % (filename, lineno))
+
+        delimiters = [i for i in (line.find('='), line.find(':')) if i > 0]
+        if not delimiters:
+            raise ParsingError(
+                "%s:%d: expected 'key = value'" % (filename, lineno))
+
+        at = min(delimiters)
+        option = line[:at].strip().lower()
+        value_lines = [line[at + 1:].strip()]
+
+    finish()
+
+    for key, value in defaults:
+        for path, node in sections:
+            if key not in node:
+                _store(node, path, key, value, converters)
+
+    return root
+
+
+def _section(root, path):
+    node = root
+    for key in path:
+        child = node.get(key)
+        if not isinstance(child, ConfigDict):
+            child = node[key] = ConfigDict()
+        node = child
+    return node
+
+
+def _store(node, path, key, value, converters):
+    if isinstance(node, list):
+        # [DEFAULT] options are applied to sections at the end.
+        node.append((key, value))
+        return
+
+    convert = converters.get(path + (key,))
+    if convert is not None:
+        try:
+            value = convert(value)
+        except Exception:
+            pass
+    node[key] = value
+
+
+def schema_converters(*schemas):
+    """
+    Find the conversions voluptuous schemas would apply to string values.
+
+    Args:
+        schemas: voluptuous Schemas or the dicts they are made of.
+
+    Returns:
+        dict. {path tuple: callable} for every key whose validator is a
+        `Coerce`, a `Boolean` or an `All` starting with one of those.
+
+    """
+    converters = {}
+    for schema in schemas:
+        _collect(schema, (), converters)
+    return converters
+
+
+def _collect(schema, prefix, converters):
+    if isinstance(schema, Schema):
+        schema = schema.schema
+    if not isinstance(schema, dict):
+        return
+
+    for key, validator in schema.iteritems():
+        if isinstance(key, Marker):
+            key = key.schema
+        if not isinstance(key, basestring):
+            continue
+
+        inner = validator.schema if isinstance(validator, Schema) \
+            else validator
+        if isinstance(inner, dict):
+            _collect(inner, prefix + (key,), converters)
+            continue
+
+        convert = _converter(validator)
+        if convert is not None:
+            converters[prefix + (key,)] = convert
+
+
+def _converter(validator):
+    if isinstance(validator, All):
+        validators = validator.validators
+        return _converter(validators[0]) if validators else None
+    if isinstance(validator, Coerce):
+        return validator
+    if getattr(validator, '__name__', None) in ('Boolean', 'Coerce'):
+        # older voluptuous builds these as plain functions.
+        return validator
+    return None
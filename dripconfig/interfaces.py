@@ -1,4 +1,6 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
+import sys
+import threading
 
 
 class ConfigurationTrigger(object):
@@ -10,10 +12,32 @@ class ConfigurationTrigger(object):
 
     This may represent some normalization of values, or
     some global setup that needs to happen.
+
+    Triggers whose `configure` builds things that must not be shared with
+    forked children (sockets, connection pools) should set
+    `fork_sensitive`; see `ConfigDict.after_fork`.
+
+    `depends_on` and `timeout` are only used by
+    `ConfigDict.configure_concurrently`.
+
+    Triggers can have lists their section holds merged rather than
+    replaced by giving `list_strategies`; see `dripconfig.merging`.
     """
 
     __metaclass__ = ABCMeta
 
+    # re-run configure in forked children.
+    fork_sensitive = False
+
+    # trigger classes whose configure must finish before this one's starts.
+    depends_on = ()
+
+    # seconds configure may take; None for the configure_concurrently default.
+    timeout = None
+
+    # {dotted path: merging.ListStrategy} used by merges into the config.
+    list_strategies = {}
+
     @abstractmethod
     def configure(self, configuation):
         """
@@ -35,10 +59,16 @@ class SchemaBasedTrigger(ConfigurationTrigger):
     clean to validate against the given schema. Assumes the schema given is
     partial; i.e. sets `extra = True`.
 
+    Set `compile_schema` to validate with a compiled version of the schema
+    (see `dripconfig.validation`), which gives the same results and errors
+    faster.
+
     """
 
     __metaclass__ = ABCMeta
 
+    compile_schema = False
+
     @abstractproperty
     def partial_schema(self):
         """
@@ -47,8 +77,16 @@ class SchemaBasedTrigger(ConfigurationTrigger):
         """
 
     def clean(self, configuration):
-        self.partial_schema.extra = True
-        return self.partial_schema(configuration)
+        schema = self.partial_schema
+        schema.extra = True
+        if not self.compile_schema:
+            return schema(configuration)
+
+        compiled = self.__dict__.get('_compiled_schema')
+        if compiled is None or compiled[0] is not schema:
+            from dripconfig.validation import compile_schema
+            compiled = self._compiled_schema = (schema, compile_schema(schema))
+        return compiled[1](configuration)
 
 
 class ToBeInjected(object):
@@ -92,3 +130,136 @@ class ToBeInjected(object):
 
     def __repr__(self):
         return "ToBeInjected(%s)" % self.expected_type
+
+
+_UNSET = object()
+
+
+class LazyInjected(object):
+    """
+    A stand-in for an injected object that is only built when it is first
+    used.
+
+    Install one from a `ConfigurationTrigger.configure` instead of building
+    an expensive client up front:
+
+        >>> def configure(self, configuration):
+                conf = configuration.redis
+                LazyInjected(lambda: redis.Redis(conf.hostname)).install(
+                    some_module, 'redis_client')
+
+    The first use of `some_module.redis_client` calls the factory (once, even
+    with several threads racing) and rebinds `some_module.redis_client` to
+    the real object, so later uses don't go through the proxy at all. Any
+    references taken before that keep working through the proxy.
+
+    """
+    __slots__ = ('__factory', '__module', '__name', '__lock', '__obj')
+
+    def __init__(self, factory):
+        """
+        Args:
+            factory (callable): builds the object, called without arguments.
+
+        """
+        object.__setattr__(self, '_LazyInjected__factory', factory)
+        object.__setattr__(self, '_LazyInjected__module', None)
+        object.__setattr__(self, '_LazyInjected__name', None)
+        object.__setattr__(self, '_LazyInjected__lock', threading.Lock())
+        object.__setattr__(self, '_LazyInjected__obj', _UNSET)
+
+    def install(self, module, name):
+        """
+        Put this proxy at `module.name`, which is where the real object goes
+        once built.
+
+        Args:
+            module (module|str): the module or its name.
+            name (str): the attribute to inject.
+
+        Returns:
+            LazyInjected. self.
+
+        """
+        if isinstance(module, basestring):
+            module = sys.modules[module]
+
+        object.__setattr__(self, '_LazyInjected__module', module)
+        object.__setattr__(self, '_LazyInjected__name', name)
+        setattr(module, name, self)
+        return self
+
+    def _resolve(self):
+        obj = self.__obj
+        if obj is not _UNSET:
+            return obj
+
+        with self.__lock:
+            obj = self.__obj
+            if obj is _UNSET:
+                obj = self.__factory()
+                object.__setattr__(self, '_LazyInjected__obj', obj)
+
+                module = self.__module
+                if module is not None and \
+                        getattr(module, self.__name, None) is self:
+                    setattr(module, self.__name, obj)
+
+        return obj
+
+    def __getattr__(self, key):
+        return getattr(self._resolve(), key)
+
+    def __setattr__(self, key, value):
+        setattr(self._resolve(), key, value)
+
+    def __delattr__(self, key):
+        delattr(self._resolve(), key)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __setitem__(self, key, value):
+        self._resolve()[key] = value
+
+    def __delitem__(self, key):
+        del self._resolve()[key]
+
+    def __contains__(self, item):
+        return item in self._resolve()
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __nonzero__(self):
+        return bool(self._resolve())
+
+    def __eq__(self, other):
+        return self._resolve() == other
+
+    def __ne__(self, other):
+        return self._resolve() != other
+
+    def __hash__(self):
+        return hash(self._resolve())
+
+    def __enter__(self):
+        return self._resolve().__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._resolve().__exit__(*exc_info)
+
+    def __str__(self):
+        return str(self._resolve())
+
+    def __repr__(self):
+        obj = self.__obj
+        if obj is _UNSET:
+            return "LazyInjected(%r)" % self.__factory
+        return repr(obj)
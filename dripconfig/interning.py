@@ -0,0 +1,172 @@
+"""
+Sharing identical sections and strings between many configurations.
+
+A service holding a configuration per tenant, each built from the same
+base plus a small overlay, keeps thousands of copies of the same sections.
+Build them through one `Interner` instead and identical subtrees are only
+kept once:
+
+    >>> interner = Interner()
+    >>> for tenant in tenants:
+            config = interner.configify(base)
+            config.merge_dict(overlays[tenant])
+
+The configuration returned is a ConfigDict of its own, but the sections in
+it are canonical instances shared with every other configuration that has
+the same section. Sections are looked up by their keys and values in
+order: scalars by type and value, and everything else, interned first, by
+identity. Strings are shared the same way.
+
+Shared sections are frozen: changing one directly raises TypeError, and
+so does changing a list in one (a `FrozenList`). They still compare and
+fingerprint like plain sections and lists. Merging into the configuration
+holding them works as usual; `merge_dict` replaces each section it changes
+with a copy of its own (that still shares its unchanged subsections)
+before changing it. `interpolate()` copies the sections it writes to the
+same way, but can't be called on a shared section itself.
+
+"""
+import copy
+import weakref
+
+from dripconfig.configdict import ConfigDict, _is_dicty, _is_listy, _is_scalar
+
+
+__all__ = (
+    'FrozenList',
+    'Interner',
+)
+
+
+def _refuse(self, *args, **kwargs):
+    raise TypeError(
+        "This list is shared between interned configurations and can't be "
+        "changed; replace it instead")
+
+
+class FrozenList(list):
+    """
+    A list that can't be changed, for the lists of shared sections. Unlike
+    a tuple it is equal to (and fingerprints like) the list it was made
+    from. Copies are plain lists.
+
+    """
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _refuse
+    __iadd__ = __imul__ = _refuse
+    append = extend = insert = pop = remove = reverse = sort = _refuse
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+class Interner(object):
+    """
+    Holds the canonical instances of the sections, lists and strings of
+    the configurations built through it. Sections are dropped once nothing
+    uses them; lists (and what is in them) and strings are kept until
+    `clear()`.
+
+    """
+    def __init__(self):
+        # Canonical sections and lists by the identities of their
+        # (canonical) contents; see `_identity`. Lists are keyed by kind
+        # (FrozenList or tuple) too.
+        self._canonical = weakref.WeakValueDictionary()
+        self._lists = {}
+        self._strings = {}
+
+    def configify(self, ob):
+        """
+        Like `configify`, but sharing sections and strings with the other
+        configurations built by this interner.
+
+        Args:
+            ob (dict): plain configuration data, or a ConfigDict.
+
+        Returns:
+            ConfigDict. a new configuration that can be merged into.
+
+        """
+        return ConfigDict(
+            (self.intern(key), self.intern(value))
+            for key, value in ob.items())
+
+    def intern(self, value):
+        """
+        Returns:
+            the canonical instance of `value`: a frozen ConfigDict for
+            dicts, a FrozenList for lists, an interned string for strings.
+
+        """
+        if isinstance(value, basestring):
+            return self._strings.setdefault((type(value), value), value)
+
+        elif _is_scalar(value) or value is None:
+            return value
+
+        elif isinstance(value, ConfigDict) and value._frozen:
+            return value
+
+        elif _is_dicty(value):
+            items = [(self.intern(key), self.intern(item))
+                     for key, item in value.items()]
+            key = tuple(
+                (_identity(k), _identity(v)) for k, v in items)
+            canonical = self._canonical.get(key)
+            if canonical is None:
+                canonical = ConfigDict(items)
+                canonical._frozen = True
+                self._canonical[key] = canonical
+            return canonical
+
+        elif isinstance(value, FrozenList):
+            return value
+
+        elif _is_listy(value):
+            items = [self.intern(item) for item in value]
+            kind = tuple if isinstance(value, tuple) else FrozenList
+            key = (kind, tuple(_identity(item) for item in items))
+            canonical = self._lists.get(key)
+            if canonical is None:
+                canonical = self._lists[key] = kind(items)
+            return canonical
+
+        return copy.deepcopy(value)
+
+    def clear(self):
+        """
+        Forget all canonical instances. Configurations built so far keep
+        sharing what they share, but new ones won't share with them.
+
+        """
+        self._canonical.clear()
+        self._lists.clear()
+        self._strings.clear()
+
+    def __len__(self):
+        """
+        The number of canonical sections, lists and strings held.
+
+        """
+        return len(self._canonical) + len(self._lists) + len(self._strings)
+
+
+def _identity(value):
+    """
+    What tells canonical values apart: interned sections, lists and other
+    objects are the same if they are the same object (they are kept alive
+    by the canonical instance holding them, so their ids aren't reused),
+    and scalars if they are equal and of the same type.
+
+    """
+    if _is_scalar(value) or value is None:
+        return type(value), value
+    return id(value)
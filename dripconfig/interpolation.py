@@ -0,0 +1,352 @@
+"""
+`${section.key}` references between configuration values.
+
+    {
+        "db": {"host": "db1.local", "port": 5432},
+        "reporting": {
+            "dsn": "postgres://${db.host}:${db.port}/reports",
+            "port": "${db.port}"
+        }
+    }
+
+A value that is a single reference takes on the referenced value as is
+(`reporting.port` above is the int 5432); references embedded in longer
+strings are formatted into them. `$${` is a literal `${`. Dotted segments
+that are digits index into lists.
+
+References are resolved by `ConfigDict.interpolate()`. The first call scans
+the whole tree and records which values reference which paths. Later calls
+only revisit what changed since: templates at changed paths are rescanned
+and templates that depend (directly or through other templates) on changed
+paths are resolved again. Everything else keeps its memoized value.
+
+"""
+import re
+
+from dripconfig.configdict import ConfigDict, configify
+from dripconfig.interning import FrozenList
+
+
+__all__ = (
+    'InterpolationError',
+    'Interpolator',
+)
+
+
+_REFERENCE = re.compile(r'\$(\$)?\{([^}]*)\}')
+
+_MISSING = object()
+
+
+class InterpolationError(ValueError):
+    """
+    A reference that can't be resolved: it points nowhere or is part of a
+    cycle.
+
+    """
+
+
+class Interpolator(object):
+    """
+    Resolves the references in one configuration tree, and remembers
+    enough to re-resolve only what a later change affects.
+
+    """
+    def __init__(self, config):
+        self.config = config
+        # path -> the raw template string found there.
+        self._templates = {}
+        # path -> the reference paths its template mentions.
+        self._references = {}
+        # path -> the value we last resolved its template to.
+        self._resolved = {}
+        # the dependency graph between templates, updated as templates
+        # come and go: path -> templates it depends on / that depend on it.
+        self._edges = {}
+        self._dependents = {}
+        # to find overlapping paths without comparing every pair: prefix ->
+        # templates at or under it / templates with references at or under
+        # it; reference -> templates referencing exactly it.
+        self._templates_under = {}
+        self._references_under = {}
+        self._references_at = {}
+        # paths changed since the last resolve; None means everything.
+        self._changes = None
+        self._writing = False
+        config._add_observer(self._changed)
+
+    def _changed(self, path):
+        if not self._writing and self._changes is not None:
+            self._changes.add(path)
+
+    def resolve(self):
+        """
+        Resolve every template affected by changes since the last call.
+
+        Returns:
+            set. paths of the values that were (re)resolved.
+
+        """
+        if self._changes is None:
+            changes = [()]
+        else:
+            changes = _outermost(self._changes)
+
+        full = self._changes is None
+        self._changes = set()
+
+        try:
+            affected = set()
+            for change in changes:
+                affected.update(self._rescan(change))
+
+            if not full:
+                for change in changes:
+                    affected.update(self._referring(change))
+
+            affected = self._with_dependents(affected)
+
+            done = set()
+            for path in sorted(affected):
+                self._resolve(path, affected, done, [])
+        except:
+            # try all of it again next time.
+            self._changes.update(changes)
+            raise
+
+        return done
+
+    def _rescan(self, prefix):
+        """
+        Update the templates at and under `prefix`.
+
+        Returns:
+            set. paths of templates that are new or changed.
+
+        """
+        kept = set()
+        for path in [p for p in self._templates if p[:len(prefix)] == prefix]:
+            value = _lookup(self.config, path)
+            resolved = self._resolved.get(path, _MISSING)
+            if (value is not _MISSING and
+                    type(value) is type(resolved) and value == resolved):
+                # still holds what we put there.
+                kept.add(path)
+            else:
+                self._forget(path)
+
+        found = set()
+        value = _lookup(self.config, prefix)
+        if value is _MISSING:
+            return found
+
+        for path, string in _iter_strings(value, prefix):
+            if '${' in string and path not in kept:
+                self._templates[path] = string
+                self._references[path] = [
+                    _parse_path(match.group(2))
+                    for match in _REFERENCE.finditer(string)
+                    if not match.group(1)
+                ]
+                self._resolved.pop(path, None)
+                self._add(path)
+                found.add(path)
+
+        return found
+
+    def _add(self, path):
+        """
+        Add the template at `path` to the dependency graph.
+
+        """
+        for prefix in _prefixes(path):
+            self._templates_under.setdefault(prefix, set()).add(path)
+        for ref in self._references[path]:
+            self._references_at.setdefault(ref, set()).add(path)
+            for prefix in _prefixes(ref):
+                self._references_under.setdefault(prefix, set()).add(path)
+
+        edges = self._edges[path] = set()
+        for ref in self._references[path]:
+            edges.update(self._templates_under.get(ref, ()))
+            edges.update(
+                ref[:n] for n in range(len(ref)) if ref[:n] in self._templates)
+        dependents = self._dependents[path] = self._referring(path)
+
+        for other in edges:
+            self._dependents[other].add(path)
+        for other in dependents:
+            self._edges[other].add(path)
+
+    def _forget(self, path):
+        for other in self._edges.pop(path):
+            if other != path:
+                self._dependents[other].discard(path)
+        for other in self._dependents.pop(path):
+            if other != path:
+                self._edges[other].discard(path)
+
+        for prefix in _prefixes(path):
+            _discard(self._templates_under, prefix, path)
+        for ref in self._references[path]:
+            _discard(self._references_at, ref, path)
+            for prefix in _prefixes(ref):
+                _discard(self._references_under, prefix, path)
+
+        del self._templates[path]
+        del self._references[path]
+        self._resolved.pop(path, None)
+
+    def _referring(self, path):
+        """
+        Returns:
+            set. the templates with references at, above or under `path`.
+
+        """
+        referring = set(self._references_under.get(path, ()))
+        for n in range(len(path)):
+            referring.update(self._references_at.get(path[:n], ()))
+        return referring
+
+    def _with_dependents(self, paths):
+        """
+        Add every template that transitively depends on `paths`.
+
+        """
+        dependents = self._dependents
+        affected = set(paths)
+        pending = list(paths)
+        while pending:
+            for path in dependents[pending.pop()]:
+                if path not in affected:
+                    affected.add(path)
+                    pending.append(path)
+        return affected
+
+    def _resolve(self, path, affected, done, stack):
+        """
+        Resolve the template at `path`, after the templates it depends on
+        that are `affected` too; the others still hold what they were
+        resolved to.
+
+        """
+        if path in done:
+            return
+        if path in stack:
+            cycle = stack[stack.index(path):] + [path]
+            raise InterpolationError(
+                "Reference cycle: %s" % " -> ".join(map(_format, cycle)))
+
+        stack.append(path)
+        for other in sorted(self._edges[path]):
+            if other in affected:
+                self._resolve(other, affected, done, stack)
+        stack.pop()
+
+        template = self._templates[path]
+        match = _REFERENCE.match(template)
+        if match and match.end() == len(template) and not match.group(1):
+            value = configify(self._lookup_reference(path, match.group(2)))
+        else:
+            value = _REFERENCE.sub(
+                lambda m: self._substitute(path, m), template)
+
+        self._write(path, value)
+        self._resolved[path] = value
+        done.add(path)
+
+    def _substitute(self, path, match):
+        if match.group(1):
+            return '${%s}' % match.group(2)
+        value = self._lookup_reference(path, match.group(2))
+        if isinstance(value, basestring):
+            return value
+        return unicode(value) if isinstance(match.string, unicode) \
+            else str(value)
+
+    def _lookup_reference(self, path, reference):
+        value = _lookup(self.config, _parse_path(reference))
+        if value is _MISSING:
+            raise InterpolationError(
+                "%s refers to missing %s" % (_format(path), reference))
+        return value
+
+    def _write(self, path, value):
+        self._writing = True
+        try:
+            container = self.config
+            for key in path[:-1]:
+                # sections and lists shared with other interned
+                # configurations are replaced by copies of our own.
+                child = _lookup(container, (key,))
+                if isinstance(child, FrozenList):
+                    child = container[key] = list(child)
+                elif isinstance(child, ConfigDict) and child._frozen:
+                    child = container[key] = ConfigDict(child)
+                container = child
+            container[path[-1]] = value
+        finally:
+            self._writing = False
+
+
+def _parse_path(reference):
+    return tuple(
+        int(part) if part.isdigit() else part
+        for part in reference.strip().split('.'))
+
+
+def _format(path):
+    return '.'.join(str(part) for part in path)
+
+
+def _prefixes(path):
+    """
+    `path` and the paths above it, () included.
+
+    """
+    return [path[:n] for n in range(len(path) + 1)]
+
+
+def _discard(index, key, path):
+    paths = index[key]
+    paths.discard(path)
+    if not paths:
+        del index[key]
+
+
+def _outermost(paths):
+    """
+    Drop paths that are under another of the paths.
+
+    """
+    result = []
+    for path in sorted(paths, key=len):
+        if not any(path[:len(other)] == other for other in result):
+            result.append(path)
+    return result
+
+
+def _lookup(config, path):
+    node = config
+    for part in path:
+        try:
+            if isinstance(node, ConfigDict):
+                node = dict.__getitem__(node, part)
+            else:
+                node = node[part]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return node
+
+
+def _iter_strings(value, prefix):
+    if isinstance(value, basestring):
+        yield prefix, value
+    elif isinstance(value, ConfigDict):
+        for key, item in value.iteritems():
+            for pair in _iter_strings(item, prefix + (key,)):
+                yield pair
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            for pair in _iter_strings(item, prefix + (index,)):
+                yield pair
@@ -0,0 +1,190 @@
+"""
+Where the memory of a configuration goes.
+
+    >>> report = config.memory_report()
+    >>> report.sections['logging']
+    18344
+    >>> print report
+
+Sizes are from `sys.getsizeof`, so they are what the objects themselves
+take and not allocator overhead. Objects reachable more than once (shared
+strings, shared subtrees) are only counted the first time they are seen.
+
+"""
+from collections import OrderedDict, defaultdict
+import gc
+import sys
+import types
+
+from dripconfig.configdict import ConfigDict
+
+
+__all__ = (
+    'MemoryReport',
+    'memory_report',
+)
+
+
+# ConfigDict attributes that don't belong to the configuration data.
+_NOT_DATA = frozenset([
+    '_triggers', '_observers', '_interpolator', '_path_index'])
+
+_SKIP_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.ClassType)
+
+
+class MemoryReport(object):
+    """
+    Attributes:
+        total (int): bytes used by the whole tree.
+        sections (OrderedDict): bytes used per top-level key.
+        types (OrderedDict): {'count': n, 'bytes': n} per kind of object:
+            'ConfigDict', 'list', 'tuple', 'string', 'scalar' and 'foreign'
+            (anything else, i.e. objects deep-copied by `configify`).
+        duplicate_strings (OrderedDict): for strings stored more than once
+            as separate objects, the number of redundant copies by value.
+        duplicate_bytes (int): bytes that interning those strings would
+            save.
+
+    """
+    def __init__(self):
+        self.total = 0
+        self.sections = OrderedDict()
+        self.types = OrderedDict(
+            (kind, {'count': 0, 'bytes': 0}) for kind in
+            ('ConfigDict', 'list', 'tuple', 'string', 'scalar', 'foreign'))
+        self.duplicate_strings = OrderedDict()
+        self.duplicate_bytes = 0
+
+    def __str__(self):
+        lines = ["total: %d bytes" % self.total, "by section:"]
+        for key, size in sorted(
+                self.sections.iteritems(), key=lambda item: -item[1]):
+            lines.append("  %10d  %s" % (size, key))
+
+        lines.append("by type:")
+        for kind, counts in self.types.iteritems():
+            lines.append("  %10d  %s (%d)" % (
+                counts['bytes'], kind, counts['count']))
+
+        lines.append("duplicate strings: %d copies, %d bytes" % (
+            sum(self.duplicate_strings.itervalues()), self.duplicate_bytes))
+        for value, copies in self.duplicate_strings.items()[:20]:
+            lines.append("  %10d  %r" % (copies, value))
+
+        return "\n".join(lines)
+
+
+def memory_report(config):
+    """
+    Returns:
+        MemoryReport. for the tree rooted at `config`.
+
+    """
+    walker = _Walker()
+    report = walker.report
+
+    report.total += walker.node_overhead(config)
+    for key, value in config.iteritems():
+        size = walker.size(key) + walker.size(value)
+        report.sections[key] = size
+        report.total += size
+
+    copies = [
+        (value, len(ids) - 1, sizes)
+        for value, (ids, sizes) in walker.strings.iteritems()
+        if len(ids) > 1
+    ]
+    copies.sort(key=lambda item: -item[1])
+    for value, extra, sizes in copies:
+        report.duplicate_strings[value] = extra
+        report.duplicate_bytes += sum(sizes) - max(sizes)
+
+    return report
+
+
+class _Walker(object):
+
+    def __init__(self):
+        self.report = MemoryReport()
+        self.seen = set()
+        # string value -> (ids seen, sizes)
+        self.strings = defaultdict(lambda: (set(), []))
+
+    def _count(self, kind, size):
+        counts = self.report.types[kind]
+        counts['count'] += 1
+        counts['bytes'] += size
+
+    def size(self, ob):
+        if id(ob) in self.seen:
+            return 0
+        self.seen.add(id(ob))
+
+        if isinstance(ob, basestring):
+            size = sys.getsizeof(ob)
+            ids, sizes = self.strings[ob]
+            ids.add(id(ob))
+            sizes.append(size)
+            self._count('string', size)
+            return size
+
+        if isinstance(ob, ConfigDict):
+            size = self.node_overhead(ob)
+            self._count('ConfigDict', size)
+            for key, value in ob.iteritems():
+                size += self.size(key) + self.size(value)
+            return size
+
+        if isinstance(ob, (list, tuple)):
+            size = sys.getsizeof(ob)
+            self._count(type(ob).__name__ if type(ob) in (list, tuple)
+                        else 'foreign', size)
+            for item in ob:
+                size += self.size(item)
+            return size
+
+        if isinstance(ob, (int, long, float, bool, type(None))):
+            size = sys.getsizeof(ob)
+            self._count('scalar', size)
+            return size
+
+        return self._foreign_size(ob)
+
+    def _foreign_size(self, ob):
+        size = 0
+        pending = [ob]
+        while pending:
+            ob = pending.pop()
+            size += sys.getsizeof(ob)
+            for referent in gc.get_referents(ob):
+                if id(referent) not in self.seen and \
+                        not isinstance(referent, _SKIP_TYPES):
+                    self.seen.add(id(referent))
+                    pending.append(referent)
+        self._count('foreign', size)
+        return size
+
+    def node_overhead(self, node):
+        """
+        The size of a ConfigDict itself, not counting its keys and values.
+
+        """
+        self.seen.add(id(node))
+        attributes = vars(node)
+        size = sys.getsizeof(node) + sys.getsizeof(attributes)
+
+        for name, value in attributes.iteritems():
+            if name in _NOT_DATA:
+                continue
+            size += sys.getsizeof(value)
+            if name == '_OrderedDict__map':
+                # the linked list behind the ordering: one list per key.
+                size += sum(sys.getsizeof(link) for link in value.itervalues())
+            elif name == '_links':
+                size += sum(
+                    sys.getsizeof(ref) + sys.getsizeof(segments)
+                    for ref, segments in value)
+
+        return size
@@ -0,0 +1,205 @@
+"""
+Strategies for merging lists.
+
+A list merged into a configuration replaces the list there, like any other
+value that isn't a section. A strategy for the list's path can do better:
+
+    >>> config.register_list_strategy('servers', MergeByKey('name'))
+    >>> config.merge_dict({'servers': [{'name': 'web-3', 'weight': 0}]})
+
+only changes the weight of the server named web-3 (its entry is merged
+like a section) and leaves the other servers alone; entries with names
+that aren't there yet are appended. Entries are matched through a dict of
+the existing ones by name, so merging is linear in the lengths of the
+lists.
+
+Paths are dotted and matched segment by segment with shell style
+wildcards, list indexes being segments too: 'clusters.*.nodes'. A path
+without wildcards takes precedence over patterns matching it.
+
+Strategies apply to every merge into a configuration they are registered
+on (with `register_list_strategy`, or in the `list_strategies` of one of
+its triggers), and to single `merge_dict(cfg, list_strategies={...})`
+calls. What triggers' `clean` return is still merged back as it is, lists
+replaced.
+
+"""
+from abc import ABCMeta, abstractmethod
+import fnmatch
+import re
+
+from dripconfig.configdict import _is_dicty
+
+
+__all__ = (
+    'Append',
+    'ListStrategy',
+    'MergeByKey',
+    'Replace',
+)
+
+
+_WILDCARDS = re.compile(r'[*?[]')
+
+_MISSING = object()
+
+
+class ListStrategy(object):
+    """
+    How merging one list into another goes.
+
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def merge(self, existing, new, merge_item):
+        """
+        Args:
+            existing (list): the list in the configuration. Must not be
+                changed.
+            new (list): the list merged in, its values ready to be stored.
+            merge_item (callable): `merge_item(index, old, new)` merges the
+                dict `new` into the dict `old` the way sections are merged,
+                `index` being where the result goes, and returns the result.
+
+        Returns:
+            list. the merged list.
+
+        """
+
+    def __repr__(self):
+        return '%s()' % type(self).__name__
+
+
+class Replace(ListStrategy):
+    """
+    The new list replaces the existing one; what happens without a
+    strategy. Use it to override a wildcard pattern for some paths.
+
+    """
+    def merge(self, existing, new, merge_item):
+        return new
+
+
+class Append(ListStrategy):
+    """
+    The new entries are added after the existing ones.
+
+    """
+    def merge(self, existing, new, merge_item):
+        return list(existing) + new
+
+
+class MergeByKey(ListStrategy):
+    """
+    Entries that are dicts are matched by their value for `key`: new
+    entries are merged into the existing entry they match, or appended if
+    there is none. Entries without the key, or whose value for it can't be
+    hashed (a list or dict), are appended.
+
+    """
+    def __init__(self, key):
+        """
+        Args:
+            key (str): the key identifying entries, e.g. 'name' or 'id'.
+
+        """
+        self.key = key
+
+    def merge(self, existing, new, merge_item):
+        key = self.key
+        merged = list(existing)
+
+        # identity -> index in merged
+        index = {}
+        for position, item in enumerate(merged):
+            identity = _identity(item, key)
+            if identity is not _MISSING:
+                index.setdefault(identity, position)
+
+        for item in new:
+            identity = _identity(item, key)
+            if identity is _MISSING:
+                merged.append(item)
+                continue
+
+            position = index.get(identity)
+            if position is None:
+                index[identity] = len(merged)
+                merged.append(item)
+            else:
+                merged[position] = merge_item(position, merged[position], item)
+
+        return merged
+
+    def __repr__(self):
+        return 'MergeByKey(%r)' % (self.key,)
+
+
+def _identity(item, key):
+    """
+    Returns:
+        `item`'s value for `key` if it can identify it, else _MISSING.
+
+    """
+    if not _is_dicty(item) or key not in item:
+        return _MISSING
+    identity = item[key]
+    try:
+        hash(identity)
+    except TypeError:
+        return _MISSING
+    return identity
+
+
+def strategies(paths):
+    """
+    Args:
+        paths (dict): {dotted path: ListStrategy}
+
+    Returns:
+        _Strategies. to look strategies up by path; () if there are none.
+
+    """
+    if not paths:
+        return ()
+    return _Strategies(paths)
+
+
+class _Strategies(object):
+
+    def __init__(self, paths):
+        self.exact = {}
+        self.patterns = []
+        for path, strategy in sorted(paths.items()):
+            if not isinstance(strategy, ListStrategy):
+                raise TypeError(
+                    "%r for %r isn't a ListStrategy" % (strategy, path))
+            segments = path.split('.')
+            if _WILDCARDS.search(path):
+                self.patterns.append((
+                    [re.compile(fnmatch.translate(s)).match for s in segments],
+                    strategy))
+            else:
+                self.exact[tuple(segments)] = strategy
+
+    def get(self, path):
+        """
+        Args:
+            path (tuple): of keys and list indexes from the root.
+
+        Returns:
+            ListStrategy. or None.
+
+        """
+        path = tuple(
+            key if isinstance(key, basestring) else str(key) for key in path)
+        strategy = self.exact.get(path)
+        if strategy is not None:
+            return strategy
+
+        for matchers, strategy in self.patterns:
+            if len(matchers) == len(path) and \
+                    all(match(key) for match, key in zip(matchers, path)):
+                return strategy
+        return None
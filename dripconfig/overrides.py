@@ -0,0 +1,141 @@
+"""
+Overrides of configuration values that only the current thread sees.
+
+    >>> with config.override({'billing': {'timeout': 1}}):
+            config.billing.timeout     # 1 in this thread only
+            config.billing.currency    # not overridden, read from config
+
+Nothing is copied: an override is a thin layer of {key: value} per
+overridden ConfigDict, kept in a thread local, so pushing and popping one
+costs about as much as the override is big. Reads of keys the layer
+doesn't have fall through to the tree.
+
+While any thread has an override in place, ConfigDict item and attribute
+reads (and `get`) check the current thread's layer first; other threads
+see the tree as it is. Iteration, `items()`, `values()`, `in`, `len` and
+writes always see the tree itself, and so does everything dripconfig
+does with the tree: merging, fingerprints, dumping, `find` and
+interpolation.
+
+Under gevent (with threading monkey patched) overrides are per greenlet.
+
+"""
+from contextlib import contextmanager
+import threading
+
+from dripconfig.configdict import (
+    ConfigDict, configify, _install_read_hook, _uninstall_read_hook,
+    _is_dicty)
+
+
+__all__ = (
+    'override',
+)
+
+
+_MISSING = object()
+
+_local = threading.local()
+
+# number of overrides in place in all threads.
+_active = 0
+_install_lock = threading.Lock()
+
+
+@contextmanager
+def override(config, cfg):
+    """
+    Layer `cfg` over `config` for the current thread until the block
+    exits. Overrides nest.
+
+    Args:
+        config (ConfigDict): the configuration to override.
+        cfg (dict): nested values to override, as for `merge_dict`.
+
+    """
+    layers = _layers()
+    undo = []
+    try:
+        _push(layers, config, cfg, undo)
+    except:
+        _pop(layers, undo)
+        raise
+
+    _installed(+1)
+    try:
+        yield config
+    finally:
+        _installed(-1)
+        _pop(layers, undo)
+
+
+def _layers():
+    """
+    Returns:
+        dict. the current thread's overrides: id(ConfigDict) ->
+        (ConfigDict, {key: value}). The ConfigDict is kept so that its id
+        can't be reused while the override is in place.
+
+    """
+    try:
+        return _local.layers
+    except AttributeError:
+        _local.layers = {}
+        return _local.layers
+
+
+def _push(layers, node, cfg, undo):
+    for key, value in cfg.items():
+        entry = layers.get(id(node))
+        layer = entry[1] if entry is not None else None
+
+        current = _MISSING
+        if layer is not None:
+            current = layer.get(key, _MISSING)
+        if current is _MISSING:
+            current = dict.get(node, key, _MISSING)
+
+        if _is_dicty(value) and isinstance(current, ConfigDict):
+            _push(layers, current, value, undo)
+            continue
+
+        value = configify(value)
+        if layer is None:
+            layer = {}
+            layers[id(node)] = (node, layer)
+        undo.append((id(node), key, layer.get(key, _MISSING)))
+        layer[key] = value
+
+
+def _pop(layers, undo):
+    for node_id, key, previous in reversed(undo):
+        layer = layers[node_id][1]
+        if previous is _MISSING:
+            del layer[key]
+            if not layer:
+                del layers[node_id]
+        else:
+            layer[key] = previous
+
+
+def _installed(change):
+    global _active
+
+    with _install_lock:
+        _active += change
+        if _active == 1 and change > 0:
+            _install_read_hook(_overridden_read)
+        elif _active == 0:
+            _uninstall_read_hook(_overridden_read)
+
+
+def _overridden_read(node, key, read):
+    layers = getattr(_local, 'layers', None)
+    if layers:
+        entry = layers.get(id(node))
+        if entry is not None:
+            value = entry[1].get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+    return read(node, key)
+
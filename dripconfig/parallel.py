@@ -0,0 +1,176 @@
+"""
+Run the `configure` of independent triggers at the same time.
+
+`ConfigDict.configure` sets triggers up one after another, so boot time is
+the sum of every backend handshake. `ConfigDict.configure_concurrently`
+hands each trigger's `configure` to its own thread instead, so boot time
+approaches that of the slowest trigger. Triggers declare what they need
+set up before them, and how long they may take:
+
+    >>> class CacheConfig(SchemaBasedTrigger):
+            depends_on = (RedisConfig,)
+            timeout = 5
+            ...
+
+"""
+import Queue
+import sys
+import threading
+import time
+
+
+__all__ = (
+    'TriggerTimeout',
+    'configure',
+)
+
+
+_SKIPPED = object()
+
+
+class TriggerTimeout(RuntimeError):
+    """
+    A trigger's `configure` didn't finish within its timeout.
+
+    """
+
+
+def dependencies(triggers):
+    """
+    Args:
+        triggers ([interfaces.ConfigurationTrigger, ...]): in registration
+            order.
+
+    Returns:
+        list. for each trigger, the indexes of the triggers it depends on:
+        those that are instances of a class in its `depends_on`.
+
+    Raises:
+        ValueError: if the dependencies are circular.
+
+    """
+    deps = []
+    for trigger in triggers:
+        classes = tuple(getattr(trigger, 'depends_on', ()))
+        deps.append([
+            i for i, other in enumerate(triggers)
+            if other is not trigger and classes and isinstance(other, classes)
+        ])
+
+    state = {}
+
+    def visit(i, stack):
+        if state.get(i) == 'done':
+            return
+        if state.get(i) == 'visiting':
+            cycle = stack[stack.index(i):] + [i]
+            raise ValueError("Circular trigger dependencies: %s" % " -> ".join(
+                type(triggers[j]).__name__ for j in cycle))
+        state[i] = 'visiting'
+        for j in deps[i]:
+            visit(j, stack + [i])
+        state[i] = 'done'
+
+    for i in range(len(triggers)):
+        visit(i, [])
+
+    return deps
+
+
+def configure(config, triggers, timeout=None):
+    """
+    Call `configure(config)` of every trigger, each in its own thread,
+    starting a trigger once the triggers it depends on have finished.
+
+    Every trigger that can run is waited for, even if another one failed.
+    Triggers that depend on one that failed or timed out are not run.
+
+    Args:
+        config (ConfigDict): passed to the triggers.
+        triggers ([interfaces.ConfigurationTrigger, ...]): in registration
+            order.
+        timeout (float): seconds a trigger's `configure` may take, for
+            triggers that don't set a `timeout` of their own. None waits
+            forever.
+
+    Raises:
+        TriggerTimeout: if a trigger took too long. Its thread is left to
+            finish (or not) in the background.
+        the exception raised by the first trigger (in registration order)
+        that failed.
+
+    """
+    deps = dependencies(triggers)
+    done = Queue.Queue()
+
+    pending = range(len(triggers))
+    # index -> deadline (or None)
+    running = {}
+    # index -> exc_info of the failure, None when it succeeded, _SKIPPED
+    # when it wasn't run.
+    finished = {}
+
+    def run(i):
+        try:
+            triggers[i].configure(config)
+        except Exception:
+            done.put((i, sys.exc_info()))
+        else:
+            done.put((i, None))
+
+    while pending or running:
+        for i in list(pending):
+            if any(j not in finished for j in deps[i]):
+                continue
+            pending.remove(i)
+            if any(finished[j] is not None for j in deps[i]):
+                # the failure it depends on is what gets raised.
+                finished[i] = _SKIPPED
+                continue
+
+            seconds = getattr(triggers[i], 'timeout', None)
+            if seconds is None:
+                seconds = timeout
+            running[i] = None if seconds is None else time.time() + seconds
+
+            thread = threading.Thread(
+                target=run, args=(i,),
+                name="configure %s" % type(triggers[i]).__name__)
+            thread.daemon = True
+            thread.start()
+
+        if not running:
+            continue
+
+        deadlines = [d for d in running.itervalues() if d is not None]
+        try:
+            if deadlines:
+                i, exc_info = done.get(
+                    timeout=max(0, min(deadlines) - time.time()))
+            else:
+                # Queue.get without a timeout can't be interrupted.
+                i, exc_info = done.get(timeout=sys.maxint)
+        except Queue.Empty:
+            now = time.time()
+            for i, deadline in running.items():
+                if deadline is not None and deadline <= now:
+                    del running[i]
+                    finished[i] = _timed_out(triggers[i])
+            continue
+
+        if i in running:
+            del running[i]
+            finished[i] = exc_info
+
+    for i in sorted(finished):
+        if finished[i] not in (None, _SKIPPED):
+            exc_type, exc_value, tb = finished[i]
+            raise exc_type, exc_value, tb
+
+
+def _timed_out(trigger):
+    try:
+        raise TriggerTimeout(
+            "%s.configure didn't finish in time" % type(trigger).__name__)
+    except TriggerTimeout:
+        return sys.exc_info()
@@ -0,0 +1,261 @@
+"""
+An index of the key paths in a configuration tree, for prefix and glob
+queries that don't walk the whole tree:
+
+    >>> config.find('features.*.enabled')
+    OrderedDict([(('features', 'search', 'enabled'), True), ...])
+    >>> list(config.iter_paths('features.search'))
+    [('features', 'search', 'enabled'), ('features', 'search', 'limit')]
+
+Every key of every ConfigDict in the tree is indexed by its path (a tuple
+of keys); values in lists aren't. The index is built on the first query.
+Changes to the tree are noted as they happen and applied to the index at
+the next query, by re-indexing only the subtrees that changed.
+
+"""
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+import fnmatch
+import re
+
+from dripconfig.configdict import ConfigDict
+
+
+__all__ = (
+    'PathIndex',
+)
+
+
+_MAGIC = re.compile(r'[*?[]')
+
+_MISSING = object()
+
+
+class _End(object):
+    """
+    Sorts after anything, so `prefix + (END,)` bounds the paths under
+    `prefix`.
+
+    """
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return other is self
+
+    def __gt__(self, other):
+        return other is not self
+
+    def __ge__(self, other):
+        return True
+
+    def __eq__(self, other):
+        return other is self
+
+    def __ne__(self, other):
+        return other is not self
+
+
+_END = _End()
+
+
+class PathIndex(object):
+    """
+    The sorted paths of a configuration tree, plus the paths by their last
+    key.
+
+    """
+    def __init__(self, config, observe=True):
+        """
+        Args:
+            config (ConfigDict): the root of the tree.
+            observe (bool): keep up with changes to the tree. Without it
+                the index is only good until the tree changes.
+
+        """
+        self.config = config
+        self._paths = None
+        self._by_name = None
+        # changed paths not yet applied to the index.
+        self._changes = set()
+        if observe:
+            config._add_observer(self._changes.add)
+
+    def iter_paths(self, prefix=(), under=()):
+        """
+        Args:
+            prefix (tuple|str): a path, as a tuple of keys or dotted.
+            under (tuple): the path of the ConfigDict asking; `prefix` and
+                the results are relative to it.
+
+        Returns:
+            iterator. the paths under `prefix` (not including `prefix`
+            itself), in sorted order.
+
+        """
+        prefix = tuple(under) + _as_path(prefix)
+        paths = self._index()
+        lo, hi = self._range(prefix)
+        if lo < hi and paths[lo] == prefix:
+            lo += 1
+        return (path[len(under):] for path in paths[lo:hi])
+
+    def find(self, pattern, under=()):
+        """
+        Args:
+            pattern (str): a dotted path whose segments may be shell style
+                wildcards (`*`, `?`, `[abc]`). A wildcard only matches
+                within one segment, so `a.*` matches `a.b` but not `a.b.c`.
+            under (tuple): the path of the ConfigDict asking; `pattern` and
+                the results are relative to it.
+
+        Returns:
+            OrderedDict. {path: value} for the paths matching `pattern`, in
+            sorted order.
+
+        """
+        segments = list(under) + pattern.split('.')
+        prefix = list(under)
+        for segment in segments[len(under):]:
+            if _MAGIC.search(segment):
+                break
+            prefix.append(segment)
+        prefix = tuple(prefix)
+
+        self._index()
+        matchers = [_literal(key) for key in under] + [
+            _matcher(segment) for segment in segments[len(under):]]
+
+        if len(prefix) == len(segments):
+            # nothing to match, just a lookup.
+            candidates = [prefix]
+        else:
+            lo, hi = self._range(prefix)
+            candidates = self._paths[lo:hi]
+            last = segments[-1]
+            if not _MAGIC.search(last):
+                named = self._by_name.get(last, ())
+                if len(named) < len(candidates):
+                    candidates = sorted(named)
+
+        found = OrderedDict()
+        for path in candidates:
+            if len(path) == len(segments) and all(
+                    match(key) for match, key in zip(matchers, path)):
+                value = _lookup(self.config, path)
+                if value is not _MISSING:
+                    found[path[len(under):]] = value
+        return found
+
+    def _range(self, prefix):
+        return (bisect_left(self._paths, prefix),
+                bisect_left(self._paths, prefix + (_END,)))
+
+    def _index(self):
+        if self._paths is None:
+            self._paths = []
+            self._by_name = defaultdict(set)
+            self._changes.clear()
+            self._insert(())
+        elif len(self._changes) > len(self._paths) // 4:
+            # cheaper to start over.
+            self._paths = None
+            return self._index()
+        elif self._changes:
+            changes = [self._indexed_part(path) for path in self._changes]
+            self._changes.clear()
+            for path in _outermost(changes):
+                self._remove(path)
+                self._insert(path)
+        return self._paths
+
+    def _indexed_part(self, path):
+        """
+        The part of a changed path that is in the index, i.e. up to the
+        first list.
+
+        """
+        node = self.config
+        for length, key in enumerate(path):
+            if not isinstance(node, ConfigDict):
+                return path[:length]
+            node = dict.get(node, key, _MISSING)
+        return path
+
+    def _remove(self, prefix):
+        lo, hi = self._range(prefix)
+        for path in self._paths[lo:hi]:
+            named = self._by_name[path[-1]]
+            named.discard(path)
+            if not named:
+                del self._by_name[path[-1]]
+        del self._paths[lo:hi]
+
+    def _insert(self, prefix):
+        value = _lookup(self.config, prefix)
+        if value is _MISSING:
+            return
+
+        found = []
+        if prefix:
+            found.append(prefix)
+        if isinstance(value, ConfigDict):
+            _collect(value, prefix, found)
+        found.sort()
+
+        at = bisect_left(self._paths, prefix)
+        self._paths[at:at] = found
+        for path in found:
+            self._by_name[path[-1]].add(path)
+
+
+def _collect(node, prefix, found):
+    for key, value in node.iteritems():
+        path = prefix + (key,)
+        found.append(path)
+        if isinstance(value, ConfigDict):
+            _collect(value, path, found)
+
+
+def _as_path(path):
+    if isinstance(path, basestring):
+        return tuple(path.split('.')) if path else ()
+    return tuple(path)
+
+
+def _literal(segment):
+    return lambda key: key == segment
+
+
+def _matcher(segment):
+    if not _MAGIC.search(segment):
+        return _literal(segment)
+    match = re.compile(fnmatch.translate(segment)).match
+    return lambda key: isinstance(key, basestring) and \
+        match(key) is not None
+
+
+def _lookup(config, path):
+    node = config
+    for key in path:
+        try:
+            if isinstance(node, ConfigDict):
+                node = dict.__getitem__(node, key)
+            else:
+                node = node[key]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return node
+
+
+def _outermost(paths):
+    """
+    Drop paths that are under another of the paths.
+
+    """
+    result = []
+    # sorted, a path comes right before the paths under it.
+    for path in sorted(set(paths)):
+        if not result or path[:len(result[-1])] != result[-1]:
+            result.append(path)
+    return result
@@ -0,0 +1,240 @@
+"""
+Opt-in access tracking for ConfigDict reads.
+
+Tracking works by temporarily installing a hook on `ConfigDict` reads, so
+there is no cost at all while no tracker is running. While one is, reads
+can be sampled to keep the overhead low:
+
+    >>> tracker = config.track_access(sample_rate=0.1)
+    >>> run_the_thing()
+    >>> tracker.stop()
+    >>> print tracker.report()
+
+"""
+from collections import OrderedDict, defaultdict
+import random
+import sys
+import threading
+
+from dripconfig.configdict import (
+    ConfigDict, _install_read_hook, _uninstall_read_hook)
+
+
+__all__ = (
+    'AccessTracker',
+)
+
+
+# the tracker currently installed on ConfigDict, if any.
+_active = None
+_install_lock = threading.Lock()
+
+
+# the read machinery: the hooked ConfigDict reads, attribute access and
+# `get`, and other read hooks.
+_READ_MODULES = frozenset([
+    'dripconfig.configdict', 'dripconfig.overrides', __name__])
+
+# modules whose reads walk the tree (serializing, copying, indexing) rather
+# than use its values. C code (json's encoder) reads on behalf of its python
+# caller. Reads by the rest of dripconfig, e.g. triggers, are real reads.
+_WALKER_MODULES = frozenset([
+    'copy', 'copy_reg', 'json', 'json.encoder', 'pickle', 'pprint',
+    'dripconfig.compiled', 'dripconfig.daemon', 'dripconfig.dump',
+    'dripconfig.interpolation', 'dripconfig.memory', 'dripconfig.pathindex',
+])
+
+
+def _tracked_read(node, key, read):
+    value = read(node, key)
+    tracker = _active
+    if tracker is not None and tracker._sampled() and not _is_walk():
+        tracker._record(node, key)
+    return value
+
+
+def _is_walk():
+    """
+    Whether the read being tracked was made by a walk over the tree, by
+    dripconfig itself or by a serializer, rather than by the application.
+
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__') or ''
+        if module not in _READ_MODULES:
+            return module in _WALKER_MODULES
+        frame = frame.f_back
+    return False
+
+
+class AccessTracker(object):
+    """
+    Counts reads of the keys of a configuration tree.
+
+    Reads are counted per (node, key) while running and resolved to dotted
+    paths only when a report is asked for, so recording a read is a couple
+    of dict operations.
+
+    Only reads by the application (triggers included) count: walks over
+    the tree by dripconfig itself, `json`, `pickle` or `copy` (dumping,
+    fingerprints, copies) don't, and neither do `items()` and `values()`.
+
+    Only one tracker can run at a time.
+
+    """
+    def __init__(self, config, sample_rate=1.0):
+        """
+        Args:
+            config (ConfigDict): the root of the tree to report on.
+            sample_rate (float): fraction of reads to record, between 0 and
+                1. Counts are scaled back up when reported.
+
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+
+        self.config = config
+        self.sample_rate = sample_rate
+        self._reads = defaultdict(int)
+        # keep tracked nodes alive so their ids stay unique while we run.
+        self._nodes = {}
+        self._random = random.random
+
+    @property
+    def is_running(self):
+        return _active is self
+
+    def start(self):
+        """
+        Install this tracker. Returns the tracker for convenience.
+
+        """
+        global _active
+
+        with _install_lock:
+            if _active is not None:
+                raise RuntimeError("another AccessTracker is already running")
+            _active = self
+            _install_read_hook(_tracked_read)
+
+        return self
+
+    def stop(self):
+        """
+        Uninstall this tracker, restoring plain reads.
+
+        """
+        global _active
+
+        with _install_lock:
+            if _active is self:
+                _uninstall_read_hook(_tracked_read)
+                _active = None
+
+    def __enter__(self):
+        if not self.is_running:
+            self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or self._random() < self.sample_rate
+
+    def _record(self, node, key):
+        node_id = id(node)
+        self._nodes[node_id] = node
+        self._reads[node_id, key] += 1
+
+    def counts(self):
+        """
+        Returns:
+            OrderedDict. estimated read counts by dotted path, most read
+            first. Only paths that were read are included.
+
+        """
+        paths = _node_paths(self.config)
+        scale = 1.0 / self.sample_rate
+        counts = {}
+
+        for (node_id, key), count in self._reads.iteritems():
+            prefix = paths.get(node_id)
+            if prefix is None:
+                # read from a node that is not (or no longer) in the tree.
+                continue
+            counts[_join(prefix, key)] = int(round(count * scale))
+
+        return OrderedDict(
+            sorted(counts.iteritems(), key=lambda item: (-item[1], item[0])))
+
+    def unread(self):
+        """
+        Returns:
+            list. dotted paths of the leaf values that were never read, in
+            tree order.
+
+        """
+        read = set(self._reads)
+        unread = []
+
+        for node, prefix in _iter_nodes(self.config):
+            for key, value in node.iteritems():
+                if isinstance(value, ConfigDict) or _has_dicts(value):
+                    continue
+                if (id(node), key) not in read:
+                    unread.append(_join(prefix, key))
+
+        return unread
+
+    def report(self, limit=20):
+        """
+        Returns:
+            str. a human readable summary of the hottest and unread paths.
+
+        """
+        lines = ["hottest config paths:"]
+        for path, count in self.counts().items()[:limit]:
+            lines.append("  %8d  %s" % (count, path))
+
+        unread = self.unread()
+        lines.append("unread config paths (%d):" % len(unread))
+        lines.extend("  %s" % path for path in unread)
+
+        return "\n".join(lines)
+
+
+def _join(prefix, key):
+    return ".".join(str(part) for part in prefix + (key,))
+
+
+def _has_dicts(value):
+    return isinstance(value, list) and any(
+        isinstance(item, ConfigDict) or _has_dicts(item) for item in value)
+
+
+def _iter_nodes(node, prefix=()):
+    """
+    Yield (ConfigDict, path tuple) for every ConfigDict in the tree,
+    including those nested in lists.
+
+    """
+    yield node, prefix
+    for key, value in node.iteritems():
+        for pair in _iter_children(value, prefix + (key,)):
+            yield pair
+
+
+def _iter_children(value, prefix):
+    if isinstance(value, ConfigDict):
+        for pair in _iter_nodes(value, prefix):
+            yield pair
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            for pair in _iter_children(item, prefix + (index,)):
+                yield pair
+
+
+def _node_paths(config):
+    return dict((id(node), prefix) for node, prefix in _iter_nodes(config))
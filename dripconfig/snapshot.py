@@ -0,0 +1,297 @@
+"""
+Configuration that is replaced atomically instead of being mutated.
+
+Merging into a plain ConfigDict changes it in place, so a thread reading
+during a reload can see a half merged section. An `AtomicConfig` instead
+builds every new version off to the side and publishes it with a single
+reference assignment. Readers never lock and always see a complete
+version:
+
+    >>> config = AtomicConfig(history=5)
+    >>> config.merge('base.json', 'overrides.ini')
+    >>> conf = config.snapshot()   # consistent for as long as you hold it
+    >>> conf.redis.host
+
+New versions share every subtree the merge didn't touch with the previous
+version, so keeping a few old versions around for `rollback` is cheap.
+Snapshots are shared between threads and versions; treat them as read only.
+
+"""
+from collections import deque
+from contextlib import contextmanager
+import threading
+
+from dripconfig.configdict import ConfigDict, configify, _is_dicty, _is_listy
+
+
+__all__ = (
+    'AtomicConfig',
+    'merged_copy',
+)
+
+
+def merged_copy(node, cfg, copy=True, list_strategies=None):
+    """
+    Merge `cfg` into a copy of `node` the way `ConfigDict.merge_dict` would,
+    copying only the ConfigDicts along changed paths.
+
+    Args:
+        node (ConfigDict): left untouched.
+        cfg (dict): configuration to merge.
+        copy (bool): if False, values of `cfg` are taken over as they are
+            rather than copied with `configify`.
+        list_strategies (dict): {dotted path: merging.ListStrategy} for
+            lists to merge rather than replace.
+
+    Returns:
+        ConfigDict. `node` itself if nothing changed, otherwise a new
+        ConfigDict sharing all unchanged subtrees with `node`.
+
+    """
+    lists = ()
+    if list_strategies:
+        from dripconfig import merging
+        lists = merging.strategies(list_strategies)
+    return _merged_copy(node, cfg, copy, lists, ())
+
+
+def _merged_copy(node, cfg, copy, lists, path):
+    result = node
+
+    for k, v in cfg.items():
+        existing = dict.get(result, k)
+
+        if _is_dicty(v) and isinstance(existing, ConfigDict):
+            value = _merged_copy(existing, v, copy, lists, path + (k,))
+            if value is existing:
+                continue
+        else:
+            strategy = None
+            if lists and _is_listy(v) and _is_listy(existing):
+                strategy = lists.get(path + (k,))
+
+            if strategy is not None:
+                value = strategy.merge(
+                    existing, configify(v) if copy else v,
+                    _item_merger(lists, path + (k,)))
+                if type(existing) is type(value) and existing == value:
+                    continue
+            elif k in result and type(existing) is type(v) and existing == v:
+                continue
+            else:
+                value = configify(v) if copy else v
+
+        if result is node:
+            result = ConfigDict(node)
+        result[k] = value
+
+    return result
+
+
+def _item_merger(lists, path):
+    def merge_item(index, old, new):
+        if not isinstance(old, ConfigDict):
+            old = configify(old)
+        return _merged_copy(old, new, False, lists, path + (index,))
+    return merge_item
+
+
+class AtomicConfig(object):
+    """
+    Holds the current version of a configuration and swaps in new versions
+    atomically.
+
+    Reads (attribute, item, `get`, `in`) are passed on to the current
+    version. Consecutive reads may see different versions if a reload
+    happens in between; take a `snapshot()` when that matters.
+
+    """
+    def __init__(self, history=5):
+        """
+        Args:
+            history (int): how many previous versions to keep for
+                `rollback`.
+
+        """
+        self._current = ConfigDict()
+        self._version = 0
+        self._last_version = 0
+        self._history = deque(maxlen=history)
+        self._triggers = []
+        self._list_strategy_paths = {}
+        self._write_lock = threading.RLock()
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """
+        Returns:
+            ConfigDict. the current version. It is never modified.
+
+        """
+        return self._current
+
+    def versions(self):
+        """
+        Returns:
+            list. the version numbers available to `rollback` to, oldest
+            first.
+
+        """
+        return [version for version, _ in self._history]
+
+    def register_trigger(self, trigger):
+        """
+        Args:
+            trigger (interfaces.ConfigurationTrigger): something that
+                configures something!
+        """
+        self._triggers.append(trigger)
+
+    def register_list_strategy(self, path, strategy):
+        """
+        Merge lists at `path` with `strategy` rather than replacing them;
+        see `ConfigDict.register_list_strategy`.
+
+        """
+        self._list_strategy_paths[path] = strategy
+
+    def merge(self, *things):
+        """
+        Merge each of `things` (anything `ConfigDict.merge` accepts) and
+        publish the result as a single new version.
+
+        """
+        with self.update() as staged:
+            for thing in things:
+                staged.merge(thing)
+
+    def merge_dict(self, cfg, list_strategies=None):
+        """
+        Merge a dictionary and publish the result as a new version.
+
+        """
+        with self.update(list_strategies) as staged:
+            staged.merge_dict(cfg)
+
+    @contextmanager
+    def update(self, list_strategies=None):
+        """
+        Stage several merges and publish them together on exit. Nothing is
+        published if the block raises.
+
+            >>> with config.update() as staged:
+                    staged.merge_from(sources.Argv(1), sources.EnvVar('CONF'))
+                    staged.merge_dict({'debug': True})
+
+        Args:
+            list_strategies (dict): {dotted path: merging.ListStrategy} for
+                lists to merge rather than replace, on top of those
+                registered.
+
+        Yields:
+            ConfigDict. an empty ConfigDict to merge changes into.
+
+        """
+        paths = {}
+        for trigger in self._triggers:
+            paths.update(getattr(trigger, 'list_strategies', None) or {})
+        paths.update(self._list_strategy_paths)
+        paths.update(list_strategies or {})
+
+        with self._write_lock:
+            staged = ConfigDict()
+            # merges into staged combine lists the same way.
+            staged._list_strategy_paths = paths
+            yield staged
+            self._publish(merged_copy(
+                self._current, staged, copy=False, list_strategies=paths))
+
+    def configure(self):
+        """
+        Clean the current version with every registered trigger, publish
+        the cleaned version, then have the triggers configure themselves
+        from it.
+
+        Unlike `ConfigDict.configure`, every trigger cleans before any
+        trigger configures, so configure never sees an unpublished version.
+
+        """
+        with self._write_lock:
+            tree = self._current
+            for trigger in self._triggers:
+                tree = merged_copy(tree, trigger.clean(tree))
+            self._publish(tree)
+
+        for trigger in self._triggers:
+            trigger.configure(tree)
+
+    def rollback(self, version=None):
+        """
+        Republish a previous version.
+
+        Args:
+            version (int): the version to go back to; defaults to the one
+                before the current one. Versions after it are discarded.
+
+        Returns:
+            int. the version now current.
+
+        """
+        with self._write_lock:
+            if not self._history:
+                raise ValueError("No previous versions to roll back to")
+
+            if version is None:
+                version = self._history[-1][0]
+            if version not in self.versions():
+                raise ValueError("Version %s is not available" % version)
+
+            while True:
+                old_version, tree = self._history.pop()
+                if old_version == version:
+                    break
+
+            self._current = tree
+            self._version = version
+            return version
+
+    def _publish(self, tree):
+        if tree is self._current:
+            return
+        self._history.append((self._version, self._current))
+        # a single reference assignment; readers see the old or new tree.
+        self._current = tree
+        self._last_version += 1
+        self._version = self._last_version
+
+    ## read access ##
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError("object has no attribute '%s'" % key)
+
+        try:
+            return self._current[key]
+        except KeyError:
+            raise AttributeError("object has no attribute '%s'" % key)
+
+    def __getitem__(self, key):
+        return self._current[key]
+
+    def __contains__(self, key):
+        return key in self._current
+
+    def __iter__(self):
+        return iter(self._current)
+
+    def __len__(self):
+        return len(self._current)
+
+    def get(self, key, default=None):
+        return self._current.get(key, default)
+
+    def __repr__(self):
+        return "AtomicConfig(version=%s, %r)" % (self._version, self._current)
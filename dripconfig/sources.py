@@ -5,17 +5,36 @@ of configuration data.
 """
 
 import abc
+import errno
+import fnmatch
+import hashlib
+import httplib
+import json
+import logging
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import os
+import socket
+import stat
 import sys
+import tempfile
+import threading
+import urlparse
 
 
 __all__ = (
+    'Directory',
     'Filename',
     'Argv',
     'EnvVar',
+    'LocalDaemon',
+    'URL',
 )
 
 
+log = logging.getLogger(__name__)
+
+
 class ConfigSource(object):
     """
     Indicates the location of some configuration and whether it exists or not.
@@ -40,6 +59,16 @@ class ConfigSource(object):
 
         """
 
+    def merge_into(self, config):
+        """
+        Merge the configuration pointed to by this source into `config`.
+
+        Args:
+            config (ConfigDict): the configuration to merge into.
+
+        """
+        config.merge(self.filename)
+
 
 class Filename(ConfigSource):
     """
@@ -90,3 +119,434 @@ class Argv(Filename):
         except IndexError:
             self._filename = None
 
+
+class LocalDaemon(ConfigSource):
+    """
+    Configuration served by a local `dripconfig.daemon.ConfigDaemon`.
+
+    The daemon sends the already parsed and cleaned tree when we connect,
+    and afterwards only the paths that change, which are applied to the
+    configuration in place by a background thread.
+
+    """
+    def __init__(self, socket_path, subscribe=True, on_update=None,
+                 timeout=10):
+        """
+        Args:
+            socket_path (str): the daemon's unix socket.
+            subscribe (bool): keep listening for updates after the initial
+                merge.
+            on_update (callable): called with the configuration after each
+                update has been applied.
+            timeout (float): how long to wait for the daemon's snapshot, in
+                seconds.
+
+        """
+        self.socket_path = socket_path
+        self.subscribe = subscribe
+        self.on_update = on_update
+        self.timeout = timeout
+        self.version = None
+        self._sock = None
+
+    @property
+    def is_usable(self):
+        if self._sock is not None:
+            return True
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except (socket.error, TypeError):
+            sock.close()
+            return False
+
+        self._sock = sock
+        return True
+
+    @property
+    def filename(self):
+        return self.socket_path
+
+    def merge_into(self, config):
+        from dripconfig.daemon import recv_message
+
+        if not self.is_usable:
+            raise RuntimeError(
+                "Can't connect to config daemon at %s" % self.socket_path)
+
+        self._sock.settimeout(self.timeout)
+        try:
+            message = recv_message(self._sock)
+        except (socket.error, ValueError):
+            self.close()
+            raise RuntimeError(
+                "Config daemon at %s sent no snapshot" % self.socket_path)
+        self._sock.settimeout(None)
+
+        if message is None or message['type'] != 'snapshot':
+            raise RuntimeError(
+                "Config daemon at %s sent no snapshot" % self.socket_path)
+
+        config.merge_dict(message['data'])
+        self.version = message['version']
+
+        if self.subscribe:
+            thread = threading.Thread(
+                target=self._listen, args=(config, self._sock))
+            thread.daemon = True
+            thread.start()
+        else:
+            self.close()
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _listen(self, config, sock):
+        from dripconfig.daemon import apply_delta, recv_message
+
+        while True:
+            try:
+                message = recv_message(sock)
+            except (socket.error, ValueError):
+                log.exception("lost config daemon at %s", self.socket_path)
+                return
+
+            if message is None:
+                log.warning("config daemon at %s went away", self.socket_path)
+                return
+
+            if message['type'] != 'delta':
+                continue
+
+            apply_delta(config, message['ops'])
+            self.version = message['version']
+
+            if self.on_update is not None:
+                self.on_update(config)
+
+
+def _parse_file(filename):
+    from dripconfig.configdict import ConfigDict
+
+    parsed = ConfigDict()
+    parsed.merge(filename)
+    return parsed
+
+
+class Directory(ConfigSource):
+    """
+    A conf.d style directory of configuration files, merged in filename
+    order.
+
+    Files are parsed in parallel, and files whose mtime and size haven't
+    changed since the last merge from this source aren't parsed again.
+
+    """
+    PATTERNS = ('*.json', '*.ini', '*.yaml', '*.yml')
+
+    def __init__(self, dirname, patterns=PATTERNS, workers=4,
+                 processes=False):
+        """
+        Args:
+            dirname (str): the directory.
+            patterns ([str, ...]): glob patterns of the files to merge.
+            workers (int): how many files to parse at once.
+            processes (bool): parse on a process pool rather than a thread
+                pool; worth it when there are many large files.
+
+        """
+        self.dirname = dirname
+        self.patterns = patterns
+        self.workers = workers
+        self.processes = processes
+        # filename -> (mtime, size, parsed ConfigDict)
+        self._parsed = {}
+
+    @property
+    def is_usable(self):
+        try:
+            return os.path.isdir(self.dirname)
+        except TypeError:
+            return False
+
+    @property
+    def filename(self):
+        return self.dirname
+
+    def filenames(self):
+        """
+        Returns:
+            list. the files to merge, in order.
+
+        """
+        return [
+            os.path.join(self.dirname, name)
+            for name in sorted(os.listdir(self.dirname))
+            if not name.startswith('.') and
+            any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+        ]
+
+    def load(self):
+        """
+        Parse the files that changed since the last load.
+
+        Returns:
+            list. (filename, ConfigDict) for every file, in merge order.
+            Don't modify the ConfigDicts; they are kept for the next load.
+
+        """
+        stats = {}
+        for filename in self.filenames():
+            st = os.stat(filename)
+            stats[filename] = (st.st_mtime, st.st_size)
+
+        changed = [
+            filename for filename in sorted(stats)
+            if self._parsed.get(filename, (None, None))[:2] != stats[filename]
+        ]
+
+        for filename, parsed in zip(changed, self._parse(changed)):
+            self._parsed[filename] = stats[filename] + (parsed,)
+
+        for filename in list(self._parsed):
+            if filename not in stats:
+                del self._parsed[filename]
+
+        return [
+            (filename, self._parsed[filename][2])
+            for filename in sorted(stats)
+        ]
+
+    def merge_into(self, config):
+        for _, parsed in self.load():
+            config.merge_dict(parsed)
+
+    def _parse(self, filenames):
+        if len(filenames) < 2 or self.workers < 2:
+            return map(_parse_file, filenames)
+
+        size = min(self.workers, len(filenames))
+        pool = Pool(size) if self.processes else ThreadPool(size)
+        try:
+            return pool.map(_parse_file, filenames)
+        finally:
+            pool.close()
+            pool.join()
+
+
+# idle keep-alive connections shared by URL sources, by (scheme, host, port).
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def close_connections():
+    """
+    Close the keep-alive connections held for `URL` sources.
+
+    """
+    with _connections_lock:
+        for idle in _connections.values():
+            for connection in idle:
+                connection.close()
+        _connections.clear()
+
+
+class URL(ConfigSource):
+    """
+    Configuration fetched over HTTP(S) into a local cache file.
+
+    Fetches are conditional (If-None-Match / If-Modified-Since), so
+    refreshing configuration that hasn't changed costs a 304 and no parsing,
+    and go over a keep-alive connection shared by all sources for the same
+    host. If the server can't be reached the last cached copy is used.
+
+        >>> source = sources.URL('http://config.local/app.json')
+        >>> config.merge_from(source, sources.Filename('app.json'))
+        ...
+        >>> if source.refresh():
+                config.merge(source.filename)
+
+    """
+    def __init__(self, url, cache_filename=None, timeout=10):
+        """
+        Args:
+            url (str): http or https url of the configuration.
+            cache_filename (str): where to keep the last fetched copy. By
+                default a file named after the url in a directory of the
+                temp directory that only the current user can access. The
+                extension decides how it is parsed, so it defaults to the
+                url's extension (or .json).
+            timeout (float): socket timeout in seconds.
+
+        """
+        self.url = url
+        self.timeout = timeout
+        self._parsed = urlparse.urlsplit(url)
+        if self._parsed.scheme not in ('http', 'https'):
+            raise ValueError("Unsupported url %s" % url)
+
+        if cache_filename is None:
+            ext = os.path.splitext(self._parsed.path)[1] or '.json'
+            cache_filename = os.path.join(
+                _private_cache_dir(),
+                '%s%s' % (hashlib.sha1(url).hexdigest()[:16], ext))
+
+        self._filename = cache_filename
+        self._meta_filename = cache_filename + '.meta'
+        self._fetched = False
+
+    @property
+    def is_usable(self):
+        if not self._fetched:
+            try:
+                self.refresh()
+            except (IOError, socket.error, httplib.HTTPException):
+                log.warning("couldn't fetch %s", self.url, exc_info=True)
+
+        return os.path.exists(self.filename)
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def refresh(self):
+        """
+        Fetch the configuration if it changed since the last fetch.
+
+        Returns:
+            bool. True if a new copy was written to `filename`.
+
+        Raises:
+            IOError: if there is neither a response nor a cached copy.
+
+        """
+        meta = self._read_meta()
+        headers = {}
+        if os.path.exists(self.filename):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            status, response_headers, body = self._get(headers)
+        except (IOError, socket.error, httplib.HTTPException):
+            if os.path.exists(self.filename):
+                log.warning("couldn't fetch %s, using cached copy",
+                            self.url, exc_info=True)
+                self._fetched = True
+                return False
+            raise
+
+        self._fetched = True
+
+        if status == httplib.NOT_MODIFIED:
+            return False
+        if status != httplib.OK:
+            raise IOError(
+                "Fetching %s failed with HTTP %s" % (self.url, status))
+
+        self._write(self.filename, body)
+        self._write(self._meta_filename, json.dumps({
+            'etag': response_headers.get('etag'),
+            'last_modified': response_headers.get('last-modified'),
+        }))
+        return True
+
+    def _get(self, headers):
+        path = self._parsed.path or '/'
+        if self._parsed.query:
+            path += '?' + self._parsed.query
+
+        # a pooled connection may have been closed by the server since we
+        # last used it, so retry once on a fresh one.
+        for attempt in (1, 2):
+            connection = self._checkout()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (socket.error, httplib.HTTPException):
+                connection.close()
+                if attempt == 2:
+                    raise
+                continue
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(connection)
+
+            return (response.status,
+                    dict((k.lower(), v) for k, v in response.getheaders()),
+                    body)
+
+    def _key(self):
+        return (self._parsed.scheme, self._parsed.hostname, self._parsed.port)
+
+    def _checkout(self):
+        with _connections_lock:
+            idle = _connections.get(self._key())
+            if idle:
+                return idle.pop()
+
+        if self._parsed.scheme == 'https':
+            cls = httplib.HTTPSConnection
+        else:
+            cls = httplib.HTTPConnection
+        return cls(
+            self._parsed.hostname, self._parsed.port, timeout=self.timeout)
+
+    def _checkin(self, connection):
+        with _connections_lock:
+            _connections.setdefault(self._key(), []).append(connection)
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_filename) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write(self, filename, data):
+        tmp_filename = '%s.%s.tmp' % (filename, os.getpid())
+        try:
+            os.unlink(tmp_filename)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+        # only readable by us, and never through a planted symlink.
+        fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.rename(tmp_filename, filename)
+
+
+def _private_cache_dir():
+    """
+    Returns:
+        str. a directory of the temp directory for the current user's cached
+        configuration, created if needed, that no one else can write to or
+        read from.
+
+    Raises:
+        IOError: if the directory exists but isn't private to the user.
+
+    """
+    path = os.path.join(tempfile.gettempdir(), 'dripconfig-%d' % os.getuid())
+    try:
+        os.mkdir(path, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    st = os.lstat(path)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or
+            st.st_mode & 0o077):
+        raise IOError(
+            "%s isn't a directory private to the current user, pass a "
+            "cache_filename" % path)
+    return path
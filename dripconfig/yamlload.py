@@ -0,0 +1,189 @@
+"""
+Safe, bounded YAML loading straight into ConfigDicts.
+
+* only the YAML safe subset is constructed (no python objects), using
+  libyaml's `CSafeLoader` when PyYAML was built with it and the pure python
+  `SafeLoader` otherwise.
+
+* mappings are built as ConfigDicts, in document order, so merging the
+  result doesn't need another `configify` pass over the tree.
+
+* documents larger than `MAX_DOCUMENT_SIZE` bytes, that would expand to
+  more than `MAX_NODES` values once aliases are expanded ("billion
+  laughs"), or that nest collections more than `MAX_DEPTH` deep are
+  refused before anything is constructed. Recursive aliases are refused
+  too.
+
+Aliased values are copied wherever they are used, as they would be by
+`configify`, so changing one use doesn't change the others.
+
+"""
+import yaml
+from yaml.constructor import ConstructorError
+from yaml.nodes import MappingNode, SequenceNode
+
+from dripconfig.configdict import ConfigDict, configify
+
+
+__all__ = (
+    'YAMLLimitError',
+    'load',
+)
+
+
+MAX_DOCUMENT_SIZE = 16 * 1024 * 1024
+
+MAX_NODES = 1000000
+
+# constructing is recursive, so this keeps well away from python's
+# recursion limit.
+MAX_DEPTH = 100
+
+_BaseLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+class YAMLLimitError(ValueError):
+    """
+    A YAML document is too large, expands to too many values, is nested
+    too deep or is recursive.
+
+    """
+
+
+class _Loader(_BaseLoader):
+
+    def construct_object(self, node, deep=False):
+        if node in self.constructed_objects:
+            # an alias.
+            return configify(self.constructed_objects[node])
+        return super(_Loader, self).construct_object(node, deep=True)
+
+
+def _construct_mapping(loader, node):
+    if not isinstance(node, MappingNode):
+        raise ConstructorError(
+            None, None, "expected a mapping node, but found %s" % node.id,
+            node.start_mark)
+
+    loader.flatten_mapping(node)
+    data = ConfigDict()
+    for key_node, value_node in node.value:
+        key = loader.construct_object(key_node)
+        try:
+            hash(key)
+        except TypeError:
+            raise ConstructorError(
+                "while constructing a mapping", node.start_mark,
+                "found unhashable key", key_node.start_mark)
+        data[key] = loader.construct_object(value_node)
+    return data
+
+
+def _construct_sequence(loader, node):
+    if not isinstance(node, SequenceNode):
+        raise ConstructorError(
+            None, None, "expected a sequence node, but found %s" % node.id,
+            node.start_mark)
+
+    return [loader.construct_object(child) for child in node.value]
+
+
+_Loader.add_constructor(u'tag:yaml.org,2002:map', _construct_mapping)
+_Loader.add_constructor(u'tag:yaml.org,2002:seq', _construct_sequence)
+
+
+def load(stream, max_size=None, max_nodes=None, max_depth=None):
+    """
+    Load a single YAML document.
+
+    Args:
+        stream (str|file): YAML text, or a file to read it from.
+        max_size (int): defaults to `MAX_DOCUMENT_SIZE`.
+        max_nodes (int): defaults to `MAX_NODES`.
+        max_depth (int): defaults to `MAX_DEPTH`.
+
+    Returns:
+        the document, with mappings as ConfigDicts. None for an empty
+        document.
+
+    Raises:
+        YAMLLimitError: if the document exceeds a limit.
+        yaml.YAMLError: if it isn't valid (safe) YAML.
+
+    """
+    max_size = MAX_DOCUMENT_SIZE if max_size is None else max_size
+    max_nodes = MAX_NODES if max_nodes is None else max_nodes
+    max_depth = MAX_DEPTH if max_depth is None else max_depth
+
+    if hasattr(stream, 'read'):
+        stream = stream.read(max_size + 1)
+    if len(stream) > max_size:
+        raise YAMLLimitError(
+            "YAML document is larger than %d bytes" % max_size)
+
+    loader = _Loader(stream)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None
+        _check_expansion(node, max_nodes, max_depth)
+        return loader.construct_document(node)
+    finally:
+        loader.dispose()
+
+
+def _check_expansion(root, max_nodes, max_depth):
+    """
+    Count the values `root` expands to, counting each alias as a full copy
+    of what it refers to, and check how deep collections nest. Each node is
+    only visited once.
+
+    """
+    sizes = {}
+    # [collection node, its children left to count, its size so far], from
+    # the root down to the collection being counted.
+    stack = []
+    visiting = set()
+
+    def enter(node):
+        if id(node) in visiting:
+            raise YAMLLimitError(
+                "Recursive YAML alias at %s" % node.start_mark)
+        if len(stack) >= max_depth:
+            raise YAMLLimitError(
+                "YAML collections nest more than %d deep at %s" % (
+                    max_depth, node.start_mark))
+        visiting.add(id(node))
+        stack.append([node, iter(_children(node)), 1])
+
+    enter(root)
+    while stack:
+        frame = stack[-1]
+        for child in frame[1]:
+            if id(child) in sizes:
+                frame[2] += sizes[id(child)]
+            elif isinstance(child, (MappingNode, SequenceNode)):
+                enter(child)
+                break
+            else:
+                frame[2] += 1
+        else:
+            node, _, total = stack.pop()
+            visiting.discard(id(node))
+            if total > max_nodes:
+                raise YAMLLimitError(
+                    "YAML document expands to more than %d values" %
+                    max_nodes)
+            sizes[id(node)] = total
+            if stack:
+                stack[-1][2] += total
+
+
+def _children(node):
+    if isinstance(node, MappingNode):
+        for key_node, value_node in node.value:
+            yield key_node
+            yield value_node
+    elif isinstance(node, SequenceNode):
+        for child in node.value:
+            yield child
@@ -25,6 +25,9 @@ setup(
             "python-statsd>=1.6.0",
             "raven==1.9.1"
         ],
+        'toml': [
+            "toml",
+        ],
     },
     tests_require=[
         'mock',
@@ -33,4 +36,9 @@ setup(
     packages=find_packages(exclude=['ez_setup']),
     include_package_data=True,
     test_suite='nose.collector',
+    entry_points={
+        'console_scripts': [
+            'dripconfig = dripconfig.cli:main',
+        ],
+    },
 )
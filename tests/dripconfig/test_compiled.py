@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import textwrap
+from unittest import TestCase
+
+from dripconfig import cli, compiled
+from dripconfig.configdict import ConfigDict
+
+
+class CompiledTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'conf.dripc')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        """key order and types survive compilation"""
+        cd = ConfigDict.from_dict({'x': 1})
+        cd['z'] = u'unicode'
+        cd['a'] = ConfigDict([('b', 2L), ('c', 1.5), ('d', None)])
+        cd['e'] = [True, (1, 'two'), {'f': False}]
+
+        cd.dump_compiled(self.filename)
+        loaded = ConfigDict.load_compiled(self.filename)
+
+        self.assertEquals(loaded, cd)
+        self.assertEquals(loaded.keys(), ['x', 'z', 'a', 'e'])
+        self.assertIsInstance(loaded.z, unicode)
+        self.assertIsInstance(loaded.a.b, long)
+        self.assertEquals(loaded.e[1], (1, 'two'))
+        self.assertEquals(loaded.e[2].f, False)
+
+    def test_merge_by_extension(self):
+        ConfigDict.from_dict({'a': {'b': 2}}).dump_compiled(self.filename)
+
+        cd = ConfigDict.from_dict({'a': {'c': 3}})
+        cd.merge(self.filename)
+        self.assertEquals(cd.a.b, 2)
+        self.assertEquals(cd.a.c, 3)
+
+    def test_rejects_foreign_data(self):
+        with self.assertRaises(ValueError):
+            compiled.loads('{"not": "compiled"}')
+
+        with self.assertRaises(ValueError):
+            compiled.loads(compiled.MAGIC + '\x63\x02')
+
+        # too short for the header, and truncated body.
+        for data in (compiled.MAGIC, compiled.MAGIC + '\x01',
+                     compiled.dumps(ConfigDict(a='b'))[:-2]):
+            with self.assertRaises(ValueError):
+                compiled.loads(data)
+
+        with self.assertRaises(TypeError):
+            compiled.dumps(ConfigDict(x=object()))
+
+    def test_compile_command(self):
+        ini_filename = os.path.join(self.tmpdir, 'conf.ini')
+        json_filename = os.path.join(self.tmpdir, 'conf.json')
+        with open(ini_filename, 'w') as f:
+            f.write(textwrap.dedent(
+                """
+                [whoa]
+                foo = bar
+                baz = quux
+                """
+            ))
+        with open(json_filename, 'w') as f:
+            f.write('{"whoa": {"foo": "BAR!"}}')
+
+        cli.main(['compile', '-o', self.filename, ini_filename, json_filename])
+
+        cd = ConfigDict.load_compiled(self.filename)
+        self.assertEquals(cd.whoa.foo, 'BAR!')
+        self.assertEquals(cd.whoa.baz, 'quux')
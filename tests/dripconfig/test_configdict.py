@@ -1,4 +1,8 @@
+import copy
+import datetime
+import multiprocessing
 import os
+import pickle
 import textwrap
 import mock
 from tempfile import NamedTemporaryFile
@@ -228,6 +232,221 @@ class ConfigDictTestCase(TestCase):
             cd.configure()
 
 
+class FingerprintTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({
+            'a': 1,
+            'b': {'c': 'two', 'd': [1, {'e': 3}]},
+            'f': {'g': None},
+        })
+
+    def test_content_only(self):
+        """fingerprints ignore key order and str/unicode"""
+        other = ConfigDict.from_dict({
+            'f': {'g': None},
+            'b': {'d': [1, {'e': 3}], 'c': u'two'},
+            'a': 1,
+        })
+        self.assertEquals(self.cd.fingerprint(), other.fingerprint())
+
+        other.a = 1.0
+        self.assertNotEquals(self.cd.fingerprint(), other.fingerprint())
+
+    def test_sections(self):
+        fps = self.cd.fingerprints()
+        self.assertEquals(fps.keys(), ['a', 'b', 'f'])
+        self.assertEquals(fps['b'], self.cd.b.fingerprint())
+
+    def test_changes_propagate(self):
+        """changes are noticed at any depth, siblings stay cached"""
+        seen = set([self.cd.fingerprint()])
+
+        self.cd.b.c = 'three'
+        self.assertIsNotNone(self.cd.f._fingerprint)
+        self.assertIsNone(self.cd._fingerprint)
+        seen.add(self.cd.fingerprint())
+
+        self.cd.b.d[1].e = 4
+        seen.add(self.cd.fingerprint())
+
+        self.cd.merge_dict({'f': {'h': 1}})
+        seen.add(self.cd.fingerprint())
+
+        del self.cd.f['h']
+        del self.cd.f['g']
+        seen.add(self.cd.fingerprint())
+
+        self.cd.f.clear()
+        self.cd.f.g = None
+        self.assertEquals(len(seen), 5)
+        self.assertIn(self.cd.fingerprint(), seen)
+
+    def test_copies_are_not_linked(self):
+        """pickled and copied trees don't propagate to the original"""
+        for copied in (pickle.loads(pickle.dumps(self.cd, 2)),
+                       copy.deepcopy(self.cd)):
+            self.assertEquals(copied, self.cd)
+            fingerprint = self.cd.fingerprint()
+            copied.b.c = 'three'
+            self.assertEquals(self.cd._fingerprint, fingerprint)
+            self.assertNotEquals(copied.fingerprint(), fingerprint)
+
+    def test_shared_sections(self):
+        """sections stored in several trees invalidate all of them"""
+        shallow = copy.copy(self.cd)
+        other = ConfigDict()
+        other['x'] = self.cd.b
+        fingerprints = [
+            tree.fingerprint() for tree in (self.cd, shallow, other)]
+
+        self.cd.b.c = 'three'
+        for tree, fingerprint in zip((self.cd, shallow, other), fingerprints):
+            self.assertNotEquals(tree.fingerprint(), fingerprint)
+
+        # once replaced, the section isn't linked to the tree any more.
+        seen = []
+        other._add_observer(seen.append)
+        other['x'] = ConfigDict()
+        del seen[:]
+        self.cd.b.c = 'four'
+        self.assertEquals(seen, [])
+        self.assertEquals(len(self.cd.b._links), 2)
+
+    def test_stale_links_are_dropped(self):
+        """sections moved between many parents don't pile up links"""
+        for _ in range(3):
+            self.cd.b = self.cd.b
+        self.assertEquals(len(self.cd.b._links), 1)
+
+        section = self.cd.b
+        for _ in range(100):
+            ConfigDict().x = section
+        self.assertLessEqual(len(section._links), 9)
+
+        fingerprint = self.cd.fingerprint()
+        section.c = 'three'
+        self.assertNotEquals(self.cd.fingerprint(), fingerprint)
+        self.assertEquals(len(section._links), 1)
+
+
+class PickleTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({
+            'a': 1,
+            'b': {'c': [1, {'d': u'two'}]},
+        })
+        self.cd.b.e = (3, 4)
+        self.cd.register_trigger(SchemaTrigger(Schema({})))
+
+    def tearDown(self):
+        self.cd.unshare()
+
+    def test_data_only(self):
+        data = pickle.dumps(self.cd, 2)
+        self.assertNotIn('SchemaTrigger', data)
+        self.assertNotIn('OrderedDict', data)
+
+        loaded = pickle.loads(data)
+        self.assertEquals(loaded, self.cd)
+        self.assertEquals(loaded.b.c[1].d, u'two')
+        self.assertEquals(loaded.b.e, (3, 4))
+        self.assertEquals(loaded._triggers, [])
+
+    def test_foreign_objects(self):
+        self.cd.b.when = datetime.date(2016, 1, 1)
+        loaded = pickle.loads(pickle.dumps(self.cd, 2))
+        self.assertEquals(loaded, self.cd)
+        self.assertIsInstance(loaded.b, ConfigDict)
+
+    def test_shared(self):
+        fingerprint = self.cd.share()
+        data = pickle.dumps(self.cd, 2)
+        self.assertIn(fingerprint, data)
+        self.assertLess(len(data), 100)
+        self.assertIs(pickle.loads(data), self.cd)
+
+        self.cd.unshare()
+        with self.assertRaises(ValueError):
+            pickle.loads(data)
+
+    def test_shallow_copy(self):
+        copied = copy.copy(self.cd)
+        self.assertIs(copied.b, self.cd.b)
+        self.assertIs(copied._triggers, self.cd._triggers)
+
+    def test_deep_copy(self):
+        """deep copies copy the data, even when shared, and the triggers"""
+        self.cd.share()
+        copied = copy.deepcopy(self.cd)
+        self.assertIsNot(copied, self.cd)
+        self.assertEquals(copied, self.cd)
+        self.assertEquals(copied.b.e, (3, 4))
+        self.assertEquals(len(copied._triggers), 1)
+
+        copied.b.c[1].d = u'three'
+        self.assertEquals(self.cd.b.c[1].d, u'two')
+        self.assertNotEquals(copied.fingerprint(), self.cd.fingerprint())
+
+
+class _PidTrigger(ConfigurationTrigger):
+
+    def __init__(self, queue, fork_sensitive):
+        self.queue = queue
+        self.fork_sensitive = fork_sensitive
+
+    def clean(self, conf):
+        return conf
+
+    def configure(self, conf):
+        self.queue.put((self.fork_sensitive, os.getpid()))
+
+
+class AfterForkTestCase(TestCase):
+
+    def setUp(self):
+        self.queue = multiprocessing.Queue()
+        self.cd = ConfigDict()
+        self.cd.register_trigger(_PidTrigger(self.queue, False))
+        self.cd.register_trigger(_PidTrigger(self.queue, True))
+
+    def _drain(self):
+        return [self.queue.get(timeout=5) for _ in range(self.queue.qsize())]
+
+    def test_after_fork(self):
+        """only fork sensitive triggers are configured again"""
+        self.cd.after_fork()
+        self.assertEquals(self._drain(), [])
+
+        self.cd.configure()
+        self.cd.after_fork()
+        pid = os.getpid()
+        self.assertEquals(
+            self._drain(), [(False, pid), (True, pid), (True, pid)])
+
+    def test_forked_children(self):
+        """children forked by multiprocessing are hooked up automatically"""
+        self.cd.configure()
+        self._drain()
+
+        child = multiprocessing.Process(target=lambda: None)
+        child.start()
+        child.join()
+
+        self.assertEquals(self.queue.get(timeout=5), (True, child.pid))
+
+    @mock.patch('dripconfig.configdict._fork_hook_registered', False)
+    @mock.patch('dripconfig.configdict._fork_watched', {})
+    @mock.patch('os.register_at_fork', create=True)
+    def test_fork_hook_registered_once(self, register_at_fork):
+        from dripconfig import configdict
+        configdict._watch_forks(self.cd)
+        configdict._fork_watched.clear()
+        configdict._watch_forks(ConfigDict())
+        self.assertEquals(register_at_fork.call_count, 1)
+
+
 class TestMergeFrom(TestCase):
 
     def setUp(self):
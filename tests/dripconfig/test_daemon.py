@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+from unittest import TestCase
+
+from dripconfig import sources
+from dripconfig.configdict import ConfigDict
+from dripconfig.daemon import ConfigDaemon, apply_delta, diff
+
+
+class DiffTestCase(TestCase):
+
+    def test_diff_and_apply(self):
+        """only changed paths are sent and applying them round trips"""
+        old = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': [1, 2]}
+        new = {'a': 1, 'b': {'c': 22}, 'e': [1, 2, 3], 'f': {'g': 4}}
+
+        ops = diff(old, new)
+        self.assertEquals(sorted(ops), sorted([
+            ['set', ['b', 'c'], 22],
+            ['del', ['b', 'd']],
+            ['set', ['e'], [1, 2, 3]],
+            ['set', ['f'], {'g': 4}],
+        ]))
+
+        cd = ConfigDict.from_dict(old)
+        apply_delta(cd, ops)
+        self.assertEquals(cd, new)
+        self.assertEquals(cd.f.g, 4)
+
+
+class LocalDaemonTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, 'dripconfig.sock')
+        self.conf_filename = os.path.join(self.tmpdir, 'conf.json')
+        self._write({'whoa': {'foo': 'bar', 'n': 1}})
+
+        self.daemon = ConfigDaemon(
+            self.socket_path, self.conf_filename).start()
+
+    def tearDown(self):
+        self.daemon.close()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, data):
+        with open(self.conf_filename, 'w') as f:
+            json.dump(data, f)
+
+    def test_unusable_without_daemon(self):
+        source = sources.LocalDaemon(os.path.join(self.tmpdir, 'nope.sock'))
+        self.assertFalse(source.is_usable)
+
+    def test_snapshot_and_updates(self):
+        """subscribers get the tree and later only the deltas"""
+        updated = threading.Event()
+        source = sources.LocalDaemon(
+            self.socket_path, on_update=lambda _: updated.set())
+
+        cd = ConfigDict()
+        cd.merge_from(source)
+        self.assertEquals(cd.whoa.foo, 'bar')
+        self.assertEquals(source.version, 1)
+
+        self._write({'whoa': {'foo': 'baz', 'n': 1}})
+        self.assertEquals(
+            self.daemon.reload(), [['set', ['whoa', 'foo'], 'baz']])
+
+        self.assertTrue(updated.wait(5))
+        self.assertEquals(cd.whoa.foo, 'baz')
+        self.assertEquals(cd.whoa.n, 1)
+        self.assertEquals(source.version, 2)
+        source.close()
+
+    def test_unchanged_reload_sends_nothing(self):
+        self.assertEquals(self.daemon.reload(), [])
+        self.assertEquals(self.daemon.version, 1)
+
+    def test_unserializable_config(self):
+        """values JSON can't hold fail loading, and keep the old version"""
+        yaml_filename = os.path.join(self.tmpdir, 'conf.yaml')
+        with open(yaml_filename, 'w') as f:
+            f.write('when: 2020-01-02\n')
+
+        with self.assertRaises(ValueError):
+            ConfigDaemon(self.socket_path + '2', yaml_filename).start()
+
+        self.daemon.things = (yaml_filename,)
+        with self.assertRaises(ValueError):
+            self.daemon.reload()
+        self.assertEquals(self.daemon.version, 1)
+
+        cd = ConfigDict()
+        cd.merge_from(sources.LocalDaemon(self.socket_path, subscribe=False))
+        self.assertEquals(cd.whoa.foo, 'bar')
+
+    def test_snapshot_timeout(self):
+        socket_path = os.path.join(self.tmpdir, 'silent.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        try:
+            source = sources.LocalDaemon(socket_path, timeout=0.1)
+            with self.assertRaises(RuntimeError):
+                ConfigDict().merge_from(source)
+        finally:
+            server.close()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import textwrap
+from unittest import TestCase
+
+import mock
+
+from dripconfig import sources
+from dripconfig.configdict import ConfigDict
+
+
+class DirectoryTestCase(TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self._write('10-base.json', '{"whoa": {"foo": "bar", "n": 1}}')
+        self._write('20-override.ini', textwrap.dedent(
+            """
+            [whoa]
+            foo = BAZ!
+            """
+        ))
+        self._write('30-more.json', '{"other": true}')
+        self._write('README', 'not config')
+        self._write('.hidden.json', '{"hidden": true}')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.dirname, name), 'w') as f:
+            f.write(data)
+
+    def _merge(self, source):
+        cd = ConfigDict()
+        cd.merge_from(source)
+        return cd
+
+    def test_merge_in_order(self):
+        for processes in (False, True):
+            cd = self._merge(sources.Directory(
+                self.dirname, processes=processes))
+            self.assertEquals(cd.whoa.foo, 'BAZ!')
+            self.assertEquals(cd.whoa.n, 1)
+            self.assertEquals(cd.other, True)
+            self.assertNotIn('hidden', cd)
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        source = sources.Directory(self.dirname)
+        self._merge(source)
+
+        self._write('30-more.json', '{"other": false, "more": 1}')
+        os.unlink(os.path.join(self.dirname, '20-override.ini'))
+
+        parse = mock.Mock(side_effect=sources._parse_file)
+        with mock.patch('dripconfig.sources._parse_file', parse):
+            cd = self._merge(source)
+
+        self.assertEquals(
+            parse.call_args_list,
+            [mock.call(os.path.join(self.dirname, '30-more.json'))])
+        self.assertEquals(cd.whoa.foo, 'bar')
+        self.assertEquals(cd.more, 1)
+
+    def test_not_usable(self):
+        self.assertFalse(
+            sources.Directory(os.path.join(self.dirname, 'nope')).is_usable)
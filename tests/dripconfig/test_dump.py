@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+from unittest import TestCase
+
+import mock
+import yaml
+
+from dripconfig.configdict import ConfigDict
+from dripconfig import dump
+
+
+CONFIG = {
+    'name': 'app',
+    'port': 8080,
+    'ratio': 0.25,
+    'big': 1e16,
+    'debug': False,
+    'nothing': None,
+    'empty': {},
+    'none': [],
+    'db': {
+        'host': 'db1.local',
+        'password': 's3cret',
+        'options': {'ssl': True, 'modes': ['a', 'b']},
+    },
+    'servers': [
+        {'host': 'a', 'password': 'x', 'tags': ['one', 'two']},
+        {'host': 'b', 'password': 'y', 'tags': []},
+        [1, [2, 3]],
+    ],
+    'strings': ['yes', 'null', '12', '', 'with: colon', u'caf\xe9', 'a\nb',
+                '- dash', '#hash'],
+    1: 'int key',
+}
+
+
+class IterDumpTestCase(TestCase):
+
+    def setUp(self):
+        self.config = ConfigDict.from_dict(CONFIG)
+
+    def test_json_matches_json_dumps(self):
+        self.assertEqual(
+            json.dumps(self.config), ''.join(self.config.iter_dump()))
+
+    def test_json_indent(self):
+        text = ''.join(self.config.iter_dump(indent=2))
+        self.assertEqual(json.loads(json.dumps(self.config)), json.loads(text))
+        self.assertIn('\n  "name": "app",\n', text)
+
+    def test_yaml(self):
+        text = ''.join(self.config.iter_dump('yaml'))
+        self.assertEqual(json.loads(json.dumps(CONFIG)),
+                         json.loads(json.dumps(yaml.safe_load(text))))
+        self.assertIn('\nname: app\n', text)
+
+    def test_yaml_scalars(self):
+        config = ConfigDict.from_dict({
+            'when': datetime.date(2020, 1, 2), 'inf': float('inf')})
+        loaded = yaml.safe_load(''.join(config.iter_dump('yaml')))
+        self.assertEqual(datetime.date(2020, 1, 2), loaded['when'])
+        self.assertEqual(float('inf'), loaded['inf'])
+        self.assertEqual({}, yaml.safe_load(
+            ''.join(ConfigDict().iter_dump('yaml'))))
+
+    def test_redact(self):
+        redact = ['db.password', 'servers.*.password', 'db.options']
+        for format, load in (('json', json.loads), ('yaml', yaml.safe_load)):
+            loaded = load(''.join(self.config.iter_dump(format, redact)))
+            self.assertEqual(dump.REDACTED, loaded['db']['password'])
+            self.assertEqual(dump.REDACTED, loaded['db']['options'])
+            self.assertEqual('db1.local', loaded['db']['host'])
+            self.assertEqual(
+                [dump.REDACTED, dump.REDACTED],
+                [server['password'] for server in loaded['servers'][:2]])
+
+    def test_chunks(self):
+        config = ConfigDict.from_dict(
+            dict(('key%d' % i, 'value' * 10) for i in range(1000)))
+        with mock.patch.object(dump, 'CHUNK_SIZE', 1000):
+            chunks = list(config.iter_dump())
+        self.assertGreater(len(chunks), 50)
+        self.assertTrue(all(len(chunk) < 1100 for chunk in chunks))
+        self.assertEqual(json.dumps(config), ''.join(chunks))
+
+    def test_unserializable(self):
+        config = ConfigDict.from_dict({'x': object()})
+        with self.assertRaises(TypeError):
+            list(config.iter_dump())
+        with self.assertRaises(ValueError):
+            list(config.iter_dump('xml'))
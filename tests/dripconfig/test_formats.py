@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+
+import mock
+
+from dripconfig import compiled, formats
+from dripconfig.configdict import ConfigDict
+
+try:
+    import toml
+except ImportError:
+    toml = None
+
+
+class SniffTestCase(TestCase):
+
+    def test_sniff(self):
+        self.assertEquals(formats.sniff('  {"a": 1}').name, 'json')
+        self.assertEquals(formats.sniff('// comment\n{}').name, 'json')
+        self.assertEquals(formats.sniff('a: 1\nb: 2').name, 'yaml')
+        self.assertEquals(
+            formats.sniff(compiled.dumps(ConfigDict(a=1))).name, 'compiled')
+        self.assertEquals(formats.sniff('- a\n- b').name, 'yaml')
+
+    def test_sniff_toml(self):
+        for text in ('[b]\nc = "two"\n', '# comment\n\n[[b.c]]\n',
+                     'a = 1\n', 'a.b = "c"', '"a" = 1'):
+            self.assertEquals(formats.sniff(text).name, 'toml', text)
+
+        for text in ('[1, 2]', '[true]', '[\n  {"a": 1}\n]', '["a"]\n',
+                     '[]'):
+            self.assertEquals(formats.sniff(text).name, 'json', text)
+
+    def test_sniff_no_default(self):
+        self.assertEquals(formats.sniff('hello').name, 'yaml')
+        self.assertIsNone(formats.sniff('hello', default=False))
+        self.assertIsNone(formats.sniff('/etc/app.conf', default=False))
+
+    def test_for_filename(self):
+        self.assertEquals(formats.for_filename('/etc/x.JSON').name, 'json')
+        self.assertEquals(formats.for_filename('x.yml').name, 'yaml')
+        self.assertEquals(formats.for_filename('x.ini').name, 'ini')
+        self.assertIsNone(formats.for_filename('x.txt'))
+        self.assertIsNone(formats.for_filename('json'))
+
+
+class MergeTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_parsed_once(self):
+        """a sniffed string goes to a single parser"""
+        cd = ConfigDict()
+        with mock.patch.object(ConfigDict, 'merge_yaml') as merge_yaml:
+            cd.merge('{"a": 1}')
+        self.assertEquals(cd.a, 1)
+        self.assertFalse(merge_yaml.called)
+
+    def test_errors_are_not_swallowed(self):
+        with self.assertRaises(ValueError):
+            ConfigDict().merge('{"a": ')
+
+    def test_unknown_strings(self):
+        for thing in ('/etc/app.conf', 'hello'):
+            with self.assertRaises(ValueError) as raised:
+                ConfigDict().merge(thing)
+            self.assertIn("Couldn't merge", str(raised.exception))
+
+        cd = ConfigDict()
+        cd.merge('a: 1')
+        self.assertEquals(cd.a, 1)
+
+    def test_merge_compiled_string(self):
+        cd = ConfigDict()
+        cd.merge(compiled.dumps(ConfigDict.from_dict({'a': {'b': 1}})))
+        self.assertEquals(cd.a.b, 1)
+
+    def test_register_format(self):
+        filename = os.path.join(self.tmpdir, 'conf.kv')
+        with open(filename, 'w') as f:
+            f.write('a=1\nb=2\n')
+
+        def merge_kv(config, text):
+            config.merge_dict(
+                dict(line.split('=') for line in text.splitlines()))
+
+        def merge_kv_file(config, filename):
+            with open(filename) as f:
+                merge_kv(config, f.read())
+
+        formats.register_format(
+            'kv', extensions=['.kv'], merge_file=merge_kv_file,
+            merge_string=merge_kv, sniff=lambda head: head.startswith('a='))
+        try:
+            cd = ConfigDict()
+            cd.merge(filename)
+            self.assertEquals(cd, {'a': '1', 'b': '2'})
+
+            cd = ConfigDict()
+            cd.merge('a=3\nb=4')
+            self.assertEquals(cd, {'a': '3', 'b': '4'})
+        finally:
+            del formats._formats['kv']
+            del formats._by_extension['.kv']
+
+    @skipIf(toml is None, "toml is not installed")
+    def test_toml(self):
+        filename = os.path.join(self.tmpdir, 'conf.toml')
+        with open(filename, 'w') as f:
+            f.write('a = 1\n[b]\nc = "two"\n')
+
+        cd = ConfigDict.from_dict({'b': {'d': 3}})
+        cd.merge(filename)
+        self.assertEquals(cd.a, 1)
+        self.assertEquals(cd.b.c, 'two')
+        self.assertEquals(cd.b.d, 3)
+
+        cd.merge('[b]\nc = "three"\n')
+        self.assertEquals(cd.b.c, 'three')
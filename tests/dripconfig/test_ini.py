@@ -0,0 +1,91 @@
+import tempfile
+import textwrap
+from unittest import TestCase
+
+from voluptuous import (
+    All, Coerce, Optional, Range, Required, Schema)
+
+from dripconfig import ini
+from dripconfig.builtins import StatsdConfig
+from dripconfig.configdict import ConfigDict
+from dripconfig.helpers import SchemaTrigger
+
+
+INI = textwrap.dedent(
+    """
+    # a comment
+    [main]
+    port = 8080
+    name: service
+
+    [DEFAULT]
+    env = prod
+
+    [statsd]
+    port = 8126
+    disabled = yes
+    sample_rate = 0.5
+
+    [db.primary]
+    Host = db1
+    pool_size = not a number
+    query = SELECT *
+        FROM things
+    ; another comment
+    """
+)
+
+
+class TypedIniTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({'db': {'replica': {'host': 'db2'}}})
+        self.cd.register_trigger(StatsdConfig())
+        self.cd.register_trigger(SchemaTrigger(Schema({
+            Required('port'): Coerce(int),
+            'db': {
+                'primary': {
+                    Optional('pool_size'): All(Coerce(int), Range(min=1)),
+                },
+            },
+        }, extra=True)))
+
+    def test_typed_and_nested(self):
+        self.cd.merge_typed_ini(INI)
+
+        self.assertEquals(self.cd.port, 8080)
+        self.assertEquals(self.cd.name, 'service')
+        self.assertEquals(self.cd.statsd.port, 8126)
+        self.assertIs(self.cd.statsd.disabled, True)
+        self.assertEquals(self.cd.statsd.sample_rate, 0.5)
+        self.assertEquals(self.cd.db.primary.host, 'db1')
+        self.assertEquals(self.cd.db.replica.host, 'db2')
+        self.assertEquals(self.cd.db.primary.pool_size, 'not a number')
+        self.assertEquals(
+            self.cd.db.primary.query, 'SELECT *\nFROM things')
+        self.assertEquals(self.cd.statsd.env, 'prod')
+        self.assertEquals(self.cd.db.primary.env, 'prod')
+        self.assertEquals(self.cd.env, 'prod')
+        self.assertNotIn('env', self.cd.db)
+
+    def test_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.ini') as f:
+            f.write(INI)
+            f.flush()
+            self.cd.merge_typed_ini_file(f.name)
+
+        self.assertEquals(self.cd.statsd.port, 8126)
+
+    def test_errors(self):
+        with self.assertRaises(ini.ParsingError):
+            ini.parse(['x = 1'])
+        with self.assertRaises(ini.ParsingError):
+            ini.parse(['[main]', 'no delimiter'])
+
+    def test_schema_converters(self):
+        converters = ini.schema_converters(StatsdConfig.partial_schema)
+        self.assertEquals(
+            sorted(converters),
+            [('statsd', 'disabled'), ('statsd', 'port'),
+             ('statsd', 'sample_rate')])
+        self.assertEquals(converters[('statsd', 'port')]('1'), 1)
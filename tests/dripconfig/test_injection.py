@@ -3,6 +3,9 @@ Test utilities around dependency injection.
 
 """
 
+import threading
+import time
+import types
 import unittest
 
 import dripconfig
@@ -33,3 +36,51 @@ class TestToBeInjected(unittest.TestCase):
         dripconfig.config.configure()
 
         self.assertEquals(self.dependency, 123)
+
+
+class TestLazyInjected(unittest.TestCase):
+
+    def setUp(self):
+        self.module = types.ModuleType('some_module')
+        self.module.client = dripconfig.ToBeInjected(dict)
+        self.built = []
+
+        def factory():
+            time.sleep(0.01)
+            client = {'connected': True}
+            self.built.append(client)
+            return client
+
+        self.factory = factory
+
+    def test_built_on_first_use_and_rebound(self):
+        proxy = dripconfig.LazyInjected(self.factory).install(
+            self.module, 'client')
+
+        self.assertIs(self.module.client, proxy)
+        self.assertEquals(self.built, [])
+        self.assertIn('LazyInjected', repr(proxy))
+
+        self.assertTrue(self.module.client['connected'])
+        self.assertIs(self.module.client, self.built[0])
+
+        # references taken earlier keep working through the proxy
+        self.assertEquals(proxy.keys(), ['connected'])
+        self.assertEquals(proxy, {'connected': True})
+        self.assertEquals(len(self.built), 1)
+
+    def test_built_once_across_threads(self):
+        proxy = dripconfig.LazyInjected(self.factory).install(
+            'tests.dripconfig.test_injection', 'shared_client')
+
+        threads = [
+            threading.Thread(target=lambda: proxy.get('connected'))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEquals(len(self.built), 1)
+        self.assertIs(globals()['shared_client'], self.built[0])
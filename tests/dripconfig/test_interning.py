@@ -0,0 +1,118 @@
+import copy
+import gc
+import pickle
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.interning import Interner
+
+
+BASE = {
+    'logging': {'level': 'INFO', 'handlers': ['console', 'syslog']},
+    'redis': {'host': 'redis.local', 'port': 6379, 'options': {'db': 0}},
+    'name': 'service',
+}
+
+
+class InternerTestCase(TestCase):
+
+    def setUp(self):
+        self.interner = Interner()
+
+    def test_sections_are_shared(self):
+        a = self.interner.configify(BASE)
+        b = self.interner.configify(BASE)
+
+        self.assertEqual(BASE['redis'], a.redis)
+        self.assertIsNot(a, b)
+        self.assertIs(a.redis, b.redis)
+        self.assertIs(a.logging, b.logging)
+        self.assertEqual(['console', 'syslog'], a.logging.handlers)
+        self.assertIs(a.logging.handlers, b.logging.handlers)
+        self.assertIs(a.name, b.name)
+
+    def test_strings_are_shared(self):
+        a = self.interner.configify({'x': 'some' + ' value'})
+        b = self.interner.configify({'y': {'z': 'some value'}})
+        self.assertIs(a.x, b.y.z)
+
+    def test_key_order_matters(self):
+        a = self.interner.intern(ConfigDict([('x', 1), ('y', 2)]))
+        b = self.interner.intern(ConfigDict([('y', 2), ('x', 1)]))
+        self.assertIsNot(a, b)
+        self.assertEqual(['y', 'x'], b.keys())
+
+    def test_shared_sections_are_frozen(self):
+        config = self.interner.configify(BASE)
+        with self.assertRaises(TypeError):
+            config.redis.host = 'other'
+        with self.assertRaises(TypeError):
+            del config.redis['port']
+        with self.assertRaises(TypeError):
+            config.redis.clear()
+        with self.assertRaises(TypeError):
+            config.logging.handlers.append('file')
+        with self.assertRaises(TypeError):
+            config.logging.handlers[0] = 'file'
+
+    def test_merge_copies_on_write(self):
+        a = self.interner.configify(BASE)
+        b = self.interner.configify(BASE)
+
+        a.merge_dict({'redis': {'host': 'tenant-a.local'}, 'extra': 1})
+
+        self.assertEqual('tenant-a.local', a.redis.host)
+        self.assertEqual('redis.local', b.redis.host)
+        self.assertIsNot(a.redis, b.redis)
+        # unchanged subsections are still shared.
+        self.assertIs(a.redis.options, b.redis.options)
+        self.assertIs(a.logging, b.logging)
+        a.redis.port = 1
+
+    def test_fingerprints_still_follow_changes(self):
+        a = self.interner.configify(BASE)
+        before = a.fingerprint()
+        a.merge_dict({'redis': {'options': {'db': 1}}})
+        self.assertNotEqual(before, a.fingerprint())
+        changed = copy.deepcopy(BASE)
+        changed['redis']['options']['db'] = 1
+        self.assertEqual(
+            Interner().configify(changed).fingerprint(), a.fingerprint())
+
+    def test_unused_sections_are_dropped(self):
+        config = self.interner.configify({'section': {'x': 1}})
+        self.assertEqual(1, len(self.interner._canonical))
+        del config
+        gc.collect()
+        self.assertEqual(0, len(self.interner._canonical))
+
+    def test_copies_are_not_frozen(self):
+        config = self.interner.configify(BASE)
+        for copied in (copy.deepcopy(config),
+                       pickle.loads(pickle.dumps(config))):
+            copied.redis.host = 'x'
+            copied.logging.handlers.append('file')
+            self.assertEqual('redis.local', config.redis.host)
+            self.assertEqual(['console', 'syslog'], config.logging.handlers)
+
+    def test_same_as_plain_configurations(self):
+        config = self.interner.configify(BASE)
+        plain = ConfigDict.from_dict(BASE)
+        self.assertEqual(plain, config)
+        self.assertEqual(plain.fingerprint(), config.fingerprint())
+
+        tupled = self.interner.configify({'t': (1, 2)})
+        self.assertEqual((1, 2), tupled.t)
+
+    def test_interpolate(self):
+        base = dict(BASE, url='redis://${redis.host}/',
+                    logging={'handlers': ['${name}']})
+        a = self.interner.configify(base)
+        b = self.interner.configify(base)
+        a.merge_dict({'redis': {'host': 'tenant-a.local'}})
+
+        a.interpolate()
+        self.assertEqual('redis://tenant-a.local/', a.url)
+        self.assertEqual(['service'], a.logging.handlers)
+        self.assertEqual(['${name}'], b.logging.handlers)
+        self.assertIs(a.redis.options, b.redis.options)
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.interpolation import InterpolationError
+
+
+class InterpolationTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({
+            'db': {'host': 'db1.local', 'port': 5432},
+            'reporting': {
+                'dsn': 'postgres://${db.host}:${db.port}/reports',
+                'port': '${db.port}',
+                'db': '${db}',
+                'replica': '${replicas.0}',
+                'escaped': '$${db.host}',
+            },
+            'replicas': ['${db.host}', 'db2.local'],
+        })
+
+    def test_resolve(self):
+        self.cd.interpolate()
+
+        self.assertEquals(
+            self.cd.reporting.dsn, 'postgres://db1.local:5432/reports')
+        self.assertEquals(self.cd.reporting.port, 5432)
+        self.assertEquals(self.cd.reporting.db.host, 'db1.local')
+        self.assertIsNot(self.cd.reporting.db, self.cd.db)
+        self.assertEquals(self.cd.reporting.replica, 'db1.local')
+        self.assertEquals(self.cd.reporting.escaped, '${db.host}')
+
+    def test_only_affected_references_are_resolved_again(self):
+        self.cd.interpolate()
+        self.assertEquals(self.cd.interpolate(), set())
+
+        self.cd.merge_dict({'db': {'port': 6543}})
+        self.assertEquals(self.cd.interpolate(), set([
+            ('reporting', 'dsn'),
+            ('reporting', 'port'),
+            ('reporting', 'db'),
+        ]))
+        self.assertEquals(self.cd.reporting.port, 6543)
+        self.assertEquals(
+            self.cd.reporting.dsn, 'postgres://db1.local:6543/reports')
+
+        # resolved values merged back unchanged (e.g. by a trigger's clean)
+        # don't lose their templates.
+        self.cd.merge_dict({'reporting': {'port': 6543}})
+        self.cd.merge_dict({'db': {'port': 1}})
+        self.cd.interpolate()
+        self.assertEquals(self.cd.reporting.port, 1)
+
+    def test_new_templates(self):
+        self.cd.interpolate()
+        self.cd.merge_dict({'reporting': {'port': 'port ${db.port}'}})
+        self.cd.interpolate()
+        self.assertEquals(self.cd.reporting.port, 'port 5432')
+
+        self.cd.merge_dict({'reporting': {'port': 7}})
+        self.cd.merge_dict({'db': {'port': 8}})
+        self.cd.interpolate()
+        self.assertEquals(self.cd.reporting.port, 7)
+
+    def test_errors(self):
+        cd = ConfigDict.from_dict({'a': '${b}', 'b': {'c': '${a}'}})
+        with self.assertRaises(InterpolationError):
+            cd.interpolate()
+
+        cd = ConfigDict.from_dict({'a': '${nope.nada}'})
+        with self.assertRaises(InterpolationError):
+            cd.interpolate()
+
+        cd.nope = {'nada': 1}
+        cd.interpolate()
+        self.assertEquals(cd.a, 1)
+
+    def test_chains(self):
+        cd = ConfigDict.from_dict({
+            'a': '${b}', 'b': '${c.d}', 'c': {'d': '${e}'}, 'e': 1})
+        cd.interpolate()
+        self.assertEquals(cd.a, 1)
+
+        cd.e = 2
+        self.assertEquals(cd.interpolate(), set([('a',), ('b',), ('c', 'd')]))
+        self.assertEquals(cd.a, 2)
+
+        # replacing a template drops its edges.
+        cd.c = {'d': 3}
+        self.assertEquals(cd.interpolate(), set([('a',), ('b',)]))
+        cd.e = 4
+        self.assertEquals(cd.interpolate(), set())
+        self.assertEquals(cd.a, 3)
+
+        # templates it depends on aren't resolved again.
+        seen = []
+        cd._add_observer(seen.append)
+        cd.a = '${b}!'
+        self.assertEquals(cd.interpolate(), set([('a',)]))
+        self.assertEquals(cd.a, '3!')
+        self.assertEquals(seen, [('a',), ('a',)])
+
+    def test_sections(self):
+        cd = ConfigDict.from_dict(
+            {'svc': {'host': 'a', 'url': 'http://${host}/'}})
+        cd.svc.interpolate()
+        self.assertEquals(cd.svc.url, 'http://a/')
+
+        cd.svc.host = 'b'
+        self.assertEquals(cd.svc.interpolate(), set([('url',)]))
+        self.assertEquals(cd.svc.url, 'http://b/')
+
+        # roots stored in other trees keep up too.
+        other = ConfigDict()
+        other.cd = cd
+        cd.svc.merge_dict({'host': 'c'})
+        cd.svc.interpolate()
+        self.assertEquals(other.cd.svc.url, 'http://c/')
@@ -0,0 +1,45 @@
+import datetime
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.memory import _Walker
+
+
+class MemoryReportTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({
+            'small': {'a': 1},
+            'big': {
+                'hosts': ['host-%d' % i for i in range(100)],
+                'names': [u''.join(['same', 'name']) for _ in range(10)],
+            },
+            'when': datetime.datetime(2016, 1, 1),
+        })
+
+    def test_sections(self):
+        report = self.cd.memory_report()
+
+        self.assertEquals(report.sections.keys(), ['small', 'big', 'when'])
+        self.assertGreater(report.sections['big'], report.sections['small'])
+        self.assertGreater(report.total, sum(report.sections.values()))
+
+    def test_types(self):
+        report = self.cd.memory_report()
+        types = report.types
+
+        # the root itself is not counted as a type
+        self.assertEquals(types['ConfigDict']['count'], 2)
+        self.assertEquals(types['list']['count'], 2)
+        self.assertEquals(types['scalar']['count'], 1)
+        self.assertEquals(types['foreign']['count'], 1)
+        self.assertEquals(
+            sum(counts['bytes'] for counts in types.values()),
+            report.total - _Walker().node_overhead(self.cd))
+
+    def test_duplicate_strings(self):
+        report = self.cd.memory_report()
+
+        self.assertEquals(report.duplicate_strings, {u'samename': 9})
+        self.assertGreater(report.duplicate_bytes, 0)
+        self.assertIn('samename', str(report))
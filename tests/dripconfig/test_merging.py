@@ -0,0 +1,179 @@
+from unittest import TestCase
+
+from voluptuous import Schema
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.helpers import SchemaTrigger
+from dripconfig.interning import Interner
+from dripconfig.merging import Append, ListStrategy, MergeByKey, Replace
+from dripconfig.snapshot import AtomicConfig, merged_copy
+
+
+BASE = {
+    'servers': [
+        {'name': 'web-1', 'weight': 1, 'tags': ['a']},
+        {'name': 'web-2', 'weight': 1, 'tags': ['b']},
+        'not a dict',
+    ],
+    'plugins': ['auth'],
+    'clusters': [
+        {'name': 'east', 'nodes': [{'id': 1, 'up': True}, {'id': 2}]},
+    ],
+}
+
+OVERLAY = {
+    'servers': [
+        {'name': 'web-2', 'weight': 0, 'tags': ['c']},
+        {'name': 'web-3', 'weight': 2},
+        {'weight': 5},
+        {'name': 'web-3', 'tags': ['d']},
+    ],
+    'plugins': ['metrics'],
+    'clusters': [{'name': 'east', 'nodes': [{'id': 2, 'up': False}]}],
+}
+
+SERVERS = [
+    {'name': 'web-1', 'weight': 1, 'tags': ['a']},
+    {'name': 'web-2', 'weight': 0, 'tags': ['c']},
+    'not a dict',
+    {'name': 'web-3', 'weight': 2, 'tags': ['d']},
+    {'weight': 5},
+]
+
+
+class MergeDictTestCase(TestCase):
+
+    def setUp(self):
+        self.config = ConfigDict.from_dict(BASE)
+
+    def test_lists_replaced_by_default(self):
+        self.config.merge_dict(OVERLAY)
+        self.assertEqual(OVERLAY['servers'], self.config.servers)
+
+    def test_strategies(self):
+        self.config.merge_dict(OVERLAY, list_strategies={
+            'servers': MergeByKey('name'),
+            'plugins': Append(),
+        })
+        self.assertEqual(SERVERS, self.config.servers)
+        self.assertEqual(['auth', 'metrics'], self.config.plugins)
+        self.assertEqual(OVERLAY['clusters'], self.config.clusters)
+        self.assertIsInstance(self.config.servers[3], ConfigDict)
+
+    def test_nested_paths(self):
+        self.config.merge_dict(OVERLAY, list_strategies={
+            'clusters': MergeByKey('name'),
+            'clusters.*.nodes': MergeByKey('id'),
+        })
+        self.assertEqual(
+            [{'name': 'east',
+              'nodes': [{'id': 1, 'up': True}, {'id': 2, 'up': False}]}],
+            self.config.clusters)
+
+        config = ConfigDict.from_dict(BASE)
+        config.register_list_strategy('clusters', MergeByKey('name'))
+        config.register_list_strategy('clusters.*.nodes', MergeByKey('id'))
+        config.register_list_strategy('clusters.1.nodes', Replace())
+        config.merge_dict(
+            {'clusters': [{'name': 'west', 'nodes': [{'id': 3}]}]})
+        config.merge_dict({'clusters': [
+            {'name': 'west', 'nodes': [{'id': 4}]},
+            {'name': 'east', 'nodes': [{'id': 5}]}]})
+        self.assertEqual([[1, 2, 5], [4]], [
+            [node['id'] for node in cluster['nodes']]
+            for cluster in config.clusters])
+
+        # without a strategy for the list they are in, nested lists are
+        # replaced along with it.
+        config.merge_dict({'clusters': [{'name': 'east', 'nodes': []}]},
+                          list_strategies={'clusters': Replace()})
+        self.assertEqual([{'name': 'east', 'nodes': []}], config.clusters)
+
+    def test_registered(self):
+        seen = []
+        self.config.register_list_strategy('servers', MergeByKey('name'))
+        self.config._add_observer(seen.append)
+        self.config.merge_json(
+            '{"servers": [{"name": "web-1", "weight": 3}]}')
+        self.assertEqual(3, self.config.servers[0]['weight'])
+        self.assertEqual(['a'], self.config.servers[0]['tags'])
+        self.assertEqual(3, len(self.config.servers))
+        self.assertIn(('servers',), seen)
+
+    def test_trigger_strategies(self):
+        class Trigger(SchemaTrigger):
+            list_strategies = {'plugins': Append()}
+
+        self.config.register_trigger(Trigger(Schema({}, extra=True)))
+        self.config.merge_dict({'plugins': ['metrics']})
+        self.assertEqual(['auth', 'metrics'], self.config.plugins)
+
+        # what clean returns isn't merged with strategies.
+        self.config.configure()
+        self.assertEqual(['auth', 'metrics'], self.config.plugins)
+
+    def test_interned(self):
+        config = Interner().configify(BASE)
+        shared = config.servers
+        config.merge_dict(OVERLAY, list_strategies={
+            'servers': MergeByKey('name')})
+        self.assertEqual(['a'], config.servers[0]['tags'])
+        self.assertEqual(SERVERS[1:], config.servers[1:])
+        self.assertEqual(1, shared[1]['weight'])
+
+    def test_unhashable_keys(self):
+        config = ConfigDict.from_dict(
+            {'servers': [{'name': ['web', 1]}, {'name': 'web-1'}]})
+        config.merge_dict(
+            {'servers': [{'name': {'x': 1}}, {'name': 'web-1', 'up': 1}]},
+            list_strategies={'servers': MergeByKey('name')})
+        self.assertEqual(
+            [{'name': ['web', 1]}, {'name': 'web-1', 'up': 1},
+             {'name': {'x': 1}}],
+            config.servers)
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ListStrategy()
+
+    def test_not_a_strategy(self):
+        with self.assertRaises(TypeError):
+            self.config.merge_dict(
+                OVERLAY, list_strategies={'servers': 'append'})
+
+
+class MergedCopyTestCase(TestCase):
+
+    def test_strategies(self):
+        node = ConfigDict.from_dict(BASE)
+        new = merged_copy(node, OVERLAY, list_strategies={
+            'servers': MergeByKey('name'),
+            'clusters': MergeByKey('name'),
+            'clusters.*.nodes': MergeByKey('id'),
+        })
+        self.assertEqual(SERVERS, new.servers)
+        self.assertEqual(BASE['servers'], node.servers)
+        self.assertEqual(
+            [{'id': 1, 'up': True}, {'id': 2, 'up': False}],
+            new.clusters[0]['nodes'])
+        self.assertEqual(BASE['clusters'], node.clusters)
+
+        self.assertIs(node, merged_copy(
+            node, {'servers': [{'name': 'web-1', 'weight': 1}]},
+            list_strategies={'servers': MergeByKey('name')}))
+
+    def test_atomic_config(self):
+        config = AtomicConfig()
+        config.register_list_strategy('plugins', Append())
+        config.merge_dict(BASE)
+        config.merge_dict({'plugins': ['metrics']})
+        with config.update() as staged:
+            staged.merge_dict({'plugins': ['x']})
+            staged.merge_dict({'plugins': ['y']})
+        self.assertEqual(['auth', 'metrics', 'x', 'y'], config.plugins)
+
+        config.merge_dict(OVERLAY, list_strategies={
+            'servers': MergeByKey('name')})
+        self.assertEqual(SERVERS, config.servers)
+        self.assertEqual(['auth', 'metrics', 'x', 'y', 'metrics'],
+                         config.plugins)
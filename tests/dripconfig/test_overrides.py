@@ -0,0 +1,119 @@
+from collections import OrderedDict
+import threading
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+
+
+class OverrideTestCase(TestCase):
+
+    def setUp(self):
+        self.config = ConfigDict.from_dict({
+            'billing': {'timeout': 10, 'currency': 'USD'},
+            'debug': False,
+        })
+
+    def test_override(self):
+        with self.config.override({'billing': {'timeout': 1}, 'debug': True}):
+            self.assertEqual(1, self.config.billing.timeout)
+            self.assertEqual(1, self.config['billing']['timeout'])
+            self.assertEqual(1, self.config.billing.get('timeout'))
+            self.assertEqual('USD', self.config.billing.currency)
+            self.assertIs(True, self.config.debug)
+
+        self.assertEqual(10, self.config.billing.timeout)
+        self.assertIs(False, self.config.debug)
+
+    def test_tree_is_not_changed(self):
+        fingerprint = self.config.fingerprint()
+        with self.config.override({'billing': {'timeout': 1}}):
+            self.assertEqual(
+                10, dict.__getitem__(self.config.billing, 'timeout'))
+            self.assertEqual(fingerprint, self.config.fingerprint())
+
+    def test_library_sees_the_tree(self):
+        """fingerprints, merges and lookups inside overrides use the tree"""
+        fingerprint = self.config.fingerprint()
+        # drop the cached fingerprint, to compute it under the override.
+        self.config.billing.timeout = 10
+        with self.config.override({'billing': {'timeout': 1}}):
+            self.assertEqual(fingerprint, self.config.fingerprint())
+            self.assertEqual(
+                {('billing', 'timeout'): 10}, self.config.find('*.timeout'))
+        self.assertEqual(fingerprint, self.config.fingerprint())
+
+        with self.config.override({'redis': {'host': 'test'}}):
+            self.config.merge_dict({'redis': {'port': 1}})
+            self.assertEqual('test', self.config.redis.host)
+        self.assertEqual({'port': 1}, self.config.redis)
+
+        self.config.merge_dict({'url': 'http://${billing.timeout}/'})
+        with self.config.override({'billing': {'timeout': 1}}):
+            self.config.interpolate()
+        self.assertEqual('http://10/', self.config.url)
+
+    def test_new_keys_and_sections(self):
+        with self.config.override(
+                {'redis': {'host': 'test'}, 'debug': {'x': 1}}):
+            self.assertEqual('test', self.config.redis.host)
+            self.assertEqual(1, self.config.debug.x)
+            self.assertIsInstance(self.config.redis, ConfigDict)
+
+        self.assertNotIn('redis', self.config)
+        self.assertEqual(None, self.config.get('redis'))
+
+    def test_nesting(self):
+        with self.config.override({'billing': {'timeout': 1}}):
+            with self.config.override({'billing': {'timeout': 2,
+                                                   'currency': 'EUR'}}):
+                self.assertEqual(2, self.config.billing.timeout)
+                self.assertEqual('EUR', self.config.billing.currency)
+            self.assertEqual(1, self.config.billing.timeout)
+            self.assertEqual('USD', self.config.billing.currency)
+
+    def test_nesting_under_new_section(self):
+        with self.config.override({'redis': {'host': 'a', 'port': 1}}):
+            with self.config.override({'redis': {'host': 'b'}}):
+                self.assertEqual('b', self.config.redis.host)
+                self.assertEqual(1, self.config.redis.port)
+            self.assertEqual('a', self.config.redis.host)
+
+    def test_exception_pops(self):
+        with self.assertRaises(ValueError):
+            with self.config.override({'debug': True}):
+                raise ValueError
+        self.assertIs(False, self.config.debug)
+        self.assertNotIn('__getitem__', ConfigDict.__dict__)
+        self.assertNotIn('get', ConfigDict.__dict__)
+
+    def test_other_threads(self):
+        entered, checked = threading.Event(), threading.Event()
+        seen = []
+
+        def other():
+            entered.wait()
+            seen.append(self.config.billing.timeout)
+            with self.config.override({'billing': {'timeout': 3}}):
+                seen.append(self.config.billing.timeout)
+            checked.set()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        with self.config.override({'billing': {'timeout': 1}}):
+            entered.set()
+            checked.wait()
+            self.assertEqual(1, self.config.billing.timeout)
+        thread.join()
+
+        self.assertEqual([10, 3], seen)
+
+    def test_with_access_tracking(self):
+        with self.config.track_access() as tracker:
+            with self.config.override({'billing': {'timeout': 1}}):
+                self.assertEqual(1, self.config.billing.timeout)
+            self.assertEqual(10, self.config.billing.timeout)
+
+        self.assertEqual(
+            OrderedDict([('billing', 2), ('billing.timeout', 2)]),
+            tracker.counts())
+        self.assertNotIn('__getitem__', ConfigDict.__dict__)
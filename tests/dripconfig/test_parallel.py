@@ -0,0 +1,134 @@
+import threading
+import time
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.interfaces import ConfigurationTrigger
+from dripconfig.parallel import TriggerTimeout
+
+
+class _Trigger(ConfigurationTrigger):
+
+    def __init__(self, log, delay=0, error=None):
+        self.log = log
+        self.delay = delay
+        self.error = error
+
+    def clean(self, configuration):
+        self.log.append(('clean', type(self).__name__))
+        return {}
+
+    def configure(self, configuration):
+        self.log.append(('start', type(self).__name__))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.log.append(('end', type(self).__name__))
+
+
+class Redis(_Trigger):
+    pass
+
+
+class Statsd(_Trigger):
+    pass
+
+
+class Cache(_Trigger):
+    depends_on = (Redis,)
+
+
+class ConfigureConcurrentlyTestCase(TestCase):
+
+    def setUp(self):
+        self.log = []
+        self.config = ConfigDict()
+
+    def test_runs_in_parallel(self):
+        for cls in (Redis, Statsd):
+            self.config.register_trigger(cls(self.log, delay=0.2))
+
+        started = time.time()
+        self.config.configure_concurrently()
+
+        self.assertLess(time.time() - started, 0.35)
+        self.assertEqual(
+            [('clean', 'Redis'), ('clean', 'Statsd')], self.log[:2])
+        self.assertEqual(set([
+            ('start', 'Redis'), ('start', 'Statsd'),
+            ('end', 'Redis'), ('end', 'Statsd'),
+        ]), set(self.log[2:]))
+        self.assertTrue(self.config._configured)
+
+    def test_dependencies(self):
+        self.config.register_trigger(Cache(self.log))
+        self.config.register_trigger(Redis(self.log, delay=0.1))
+
+        self.config.configure_concurrently()
+
+        events = self.log[2:]
+        self.assertLess(
+            events.index(('end', 'Redis')), events.index(('start', 'Cache')))
+
+    def test_circular_dependencies(self):
+        class A(_Trigger):
+            pass
+
+        class B(_Trigger):
+            depends_on = (A,)
+
+        A.depends_on = (B,)
+        self.config.register_trigger(A(self.log))
+        self.config.register_trigger(B(self.log))
+
+        with self.assertRaises(ValueError):
+            self.config.configure_concurrently()
+        self.assertEqual([], self.log)
+
+    def test_timeout(self):
+        slow = Redis(self.log, delay=1)
+        self.config.register_trigger(slow)
+        self.config.register_trigger(Cache(self.log))
+        self.config.register_trigger(Statsd(self.log))
+
+        started = time.time()
+        with self.assertRaises(TriggerTimeout):
+            self.config.configure_concurrently(timeout=0.1)
+
+        self.assertLess(time.time() - started, 0.5)
+        self.assertIn(('end', 'Statsd'), self.log)
+        self.assertNotIn(('start', 'Cache'), self.log)
+
+    def test_trigger_timeout_overrides_default(self):
+        slow = Redis(self.log, delay=0.2)
+        slow.timeout = 1
+        self.config.register_trigger(slow)
+
+        self.config.configure_concurrently(timeout=0.05)
+
+        self.assertIn(('end', 'Redis'), self.log)
+
+    def test_first_error_is_raised(self):
+        self.config.register_trigger(Statsd(self.log, delay=0.1,
+                                            error=KeyError('statsd')))
+        self.config.register_trigger(
+            Redis(self.log, error=ValueError('redis')))
+        self.config.register_trigger(Cache(self.log))
+
+        with self.assertRaises(KeyError):
+            self.config.configure_concurrently()
+
+        self.assertNotIn(('start', 'Cache'), self.log)
+        self.assertFalse(self.config.__dict__.get('_configured'))
+
+    def test_runs_in_other_threads(self):
+        threads = []
+
+        class Record(_Trigger):
+            def configure(self, configuration):
+                threads.append(threading.current_thread())
+
+        self.config.register_trigger(Record(self.log))
+        self.config.configure_concurrently()
+
+        self.assertNotEqual([threading.current_thread()], threads)
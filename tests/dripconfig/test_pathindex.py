@@ -0,0 +1,143 @@
+import random
+from unittest import TestCase
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.pathindex import PathIndex
+
+
+def _all_paths(node, prefix=()):
+    for key, value in node.iteritems():
+        yield prefix + (key,)
+        if isinstance(value, ConfigDict):
+            for path in _all_paths(value, prefix + (key,)):
+                yield path
+
+
+class PathIndexTestCase(TestCase):
+
+    def setUp(self):
+        self.config = ConfigDict.from_dict({
+            'features': {
+                'search': {'enabled': True, 'limit': 10},
+                'export': {'enabled': False},
+                'beta': {'nested': {'enabled': True}},
+            },
+            'enabled': 'top',
+            'servers': [{'host': 'a'}, {'host': 'b'}],
+        })
+
+    def test_find(self):
+        self.assertEqual({
+            ('features', 'export', 'enabled'): False,
+            ('features', 'search', 'enabled'): True,
+        }, self.config.find('features.*.enabled'))
+        self.assertEqual(
+            [('features', 'export', 'enabled'),
+             ('features', 'search', 'enabled')],
+            self.config.find('features.*.enabled').keys())
+
+    def test_find_wildcards(self):
+        self.assertEqual(
+            [('features', 'search', 'enabled'),
+             ('features', 'search', 'limit')],
+            self.config.find('*.s??rch.*').keys())
+        self.assertEqual(
+            [('features', 'beta'), ('features', 'export')],
+            self.config.find('features.[be]*').keys())
+
+    def test_find_literal(self):
+        self.assertEqual({('enabled',): 'top'}, self.config.find('enabled'))
+        self.assertEqual({}, self.config.find('missing.key'))
+
+    def test_lists_are_leaves(self):
+        self.assertEqual(
+            {('servers',): self.config.servers}, self.config.find('serv*'))
+        self.assertEqual({}, self.config.find('servers.*'))
+
+    def test_iter_paths(self):
+        self.assertEqual([
+            ('features', 'search', 'enabled'),
+            ('features', 'search', 'limit'),
+        ], list(self.config.iter_paths('features.search')))
+        self.assertEqual(
+            sorted(_all_paths(self.config)), list(self.config.iter_paths()))
+        self.assertEqual([], list(self.config.iter_paths('enabled')))
+
+    def test_subtree(self):
+        features = self.config.features
+        self.assertEqual(
+            [('search', 'enabled'), ('search', 'limit')],
+            list(features.iter_paths('search')))
+        self.assertEqual(
+            {('export', 'enabled'): False, ('search', 'enabled'): True},
+            features.find('*.enabled'))
+
+    def test_detached_subtree(self):
+        search = self.config.features.search
+        self.config.features.search = ConfigDict(other=1)
+
+        self.assertEqual(
+            [('enabled',), ('limit',)], list(search.iter_paths()))
+        self.assertEqual(
+            [('features', 'search', 'other')],
+            self.config.find('features.search.*').keys())
+
+    def test_follows_changes(self):
+        self.config.find('*')
+
+        self.config.merge_dict({'features': {'new': {'enabled': 1}}})
+        del self.config.features['export']
+        self.config.features.search.limit = ConfigDict(max=5)
+        self.config.servers[0].host = 'c'
+
+        self.assertEqual({
+            ('features', 'new', 'enabled'): 1,
+            ('features', 'search', 'enabled'): True,
+        }, self.config.find('features.*.enabled'))
+        self.assertEqual(
+            [('features', 'search', 'limit', 'max')],
+            self.config.find('features.search.limit.*').keys())
+        self.assertEqual(
+            sorted(_all_paths(self.config)), list(self.config.iter_paths()))
+
+        self.config.clear()
+        self.assertEqual([], list(self.config.iter_paths()))
+
+    def test_random_changes(self):
+        rand = random.Random(42)
+        config = ConfigDict()
+        config.iter_paths()
+        keys = 'abcde'
+
+        for _ in range(500):
+            node = config
+            for _ in range(rand.randint(0, 3)):
+                child = node.get(rand.choice(keys))
+                if not isinstance(child, ConfigDict):
+                    break
+                node = child
+
+            key = rand.choice(keys)
+            action = rand.random()
+            if action < 0.2 and key in node:
+                del node[key]
+            elif action < 0.6:
+                node[key] = ConfigDict.from_dict(
+                    {rand.choice(keys): {rand.choice(keys): 1}})
+            else:
+                node[key] = rand.randint(0, 5)
+
+            if rand.random() < 0.3:
+                self.assertEqual(
+                    sorted(_all_paths(config)), list(config.iter_paths()))
+                self.assertEqual(
+                    sorted(p for p in _all_paths(config)
+                           if len(p) == 2 and p[1] == 'a'),
+                    config.find('*.a').keys())
+
+    def test_unobserved(self):
+        index = PathIndex(self.config, observe=False)
+        self.assertEqual(
+            [('enabled',), ('features',), ('servers',)],
+            index.find('*').keys())
+        self.assertNotIn('_observers', self.config.__dict__)
@@ -0,0 +1,89 @@
+import copy
+import json
+import pickle
+from unittest import TestCase
+
+from dripconfig.builtins import LoggingConfig
+from dripconfig.configdict import ConfigDict
+
+
+class AccessTrackerTestCase(TestCase):
+
+    def setUp(self):
+        self.cd = ConfigDict.from_dict({
+            'a': 1,
+            'b': {'c': 2, 'd': 3},
+            'e': [{'f': 4}, {'g': 5}],
+        })
+
+    def test_counts_and_unread(self):
+        """reads are counted by path and unread leaves are reported"""
+        with self.cd.track_access() as tracker:
+            for _ in range(3):
+                self.cd.b.c
+            self.cd['a']
+            self.cd.e[1].g
+
+        counts = tracker.counts()
+        self.assertEquals(counts['b.c'], 3)
+        self.assertEquals(counts['b'], 3)
+        self.assertEquals(counts['a'], 1)
+        self.assertEquals(counts['e.1.g'], 1)
+        self.assertEquals(counts.keys()[0], 'b')
+        self.assertEquals(tracker.unread(), ['b.d', 'e.0.f'])
+        self.assertIn('b.d', tracker.report())
+
+    def test_walks_are_not_reads(self):
+        """serializing, copying and hashing the tree aren't counted"""
+        with self.cd.track_access() as tracker:
+            pickle.dumps(self.cd)
+            json.dumps(self.cd)
+            list(self.cd.iter_dump('yaml'))
+            self.cd.fingerprint()
+            copy.copy(self.cd)
+            self.cd.items()
+
+        self.assertEquals(tracker.counts(), {})
+        self.assertEquals(
+            tracker.unread(), ['a', 'b.c', 'b.d', 'e.0.f', 'e.1.g'])
+
+    def test_get_and_triggers_are_reads(self):
+        """`get` and reads by triggers are counted"""
+        self.cd.logging = {'version': 1, 'disable_existing_loggers': False}
+        self.cd.register_trigger(LoggingConfig())
+        with self.cd.track_access() as tracker:
+            self.assertEquals(self.cd.get('a'), 1)
+            self.assertIsNone(self.cd.b.get('nope'))
+            self.cd.configure()
+
+        self.assertEquals(tracker.counts()['a'], 1)
+        self.assertEquals(tracker.counts()['logging.version'], 1)
+        self.assertEquals(tracker.unread(), ['b.c', 'b.d', 'e.0.f', 'e.1.g'])
+
+    def test_stop_restores_plain_reads(self):
+        """nothing is recorded once the tracker is stopped"""
+        tracker = self.cd.track_access()
+        tracker.stop()
+
+        self.cd.a
+        self.cd.get('a')
+        self.assertEquals(tracker.counts(), {})
+        self.assertNotIn('__getitem__', ConfigDict.__dict__)
+        self.assertNotIn('get', ConfigDict.__dict__)
+
+    def test_single_tracker(self):
+        """only one tracker can run at a time"""
+        with self.cd.track_access():
+            with self.assertRaises(RuntimeError):
+                self.cd.track_access()
+
+    def test_sampling(self):
+        """sampled counts are scaled back up"""
+        with self.cd.track_access(sample_rate=0.5) as tracker:
+            for _ in range(2000):
+                self.cd.a
+
+        self.assertTrue(1600 < tracker.counts()['a'] < 2400)
+
+        with self.assertRaises(ValueError):
+            self.cd.track_access(sample_rate=0)
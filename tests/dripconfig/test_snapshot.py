@@ -0,0 +1,103 @@
+import threading
+from unittest import TestCase
+
+from voluptuous import Coerce, Schema
+
+from dripconfig.configdict import ConfigDict
+from dripconfig.helpers import SchemaTrigger
+from dripconfig.snapshot import AtomicConfig, merged_copy
+
+
+class MergedCopyTestCase(TestCase):
+
+    def test_untouched_subtrees_are_shared(self):
+        node = ConfigDict.from_dict({'a': {'b': 1}, 'c': {'d': 2}})
+
+        new = merged_copy(node, {'a': {'b': 11}})
+        self.assertEquals(new.a.b, 11)
+        self.assertEquals(node.a.b, 1)
+        self.assertIs(new.c, node.c)
+
+        self.assertIs(merged_copy(node, {'a': {'b': 1}}), node)
+
+
+class AtomicConfigTestCase(TestCase):
+
+    def test_merge_publishes_new_versions(self):
+        config = AtomicConfig()
+        config.merge_dict({'a': {'b': 1}, 'c': 2})
+        first = config.snapshot()
+
+        config.merge('{"a": {"b": 2}}', {'d': 3})
+
+        self.assertEquals(config.version, 2)
+        self.assertEquals(config.a.b, 2)
+        self.assertEquals(config['d'], 3)
+        self.assertEquals(first.a.b, 1)
+        self.assertNotIn('d', first)
+
+    def test_failed_update_publishes_nothing(self):
+        config = AtomicConfig()
+        with self.assertRaises(ValueError):
+            with config.update() as staged:
+                staged.merge_dict({'a': 1})
+                raise ValueError()
+
+        self.assertEquals(config.version, 0)
+        self.assertNotIn('a', config)
+
+    def test_rollback(self):
+        config = AtomicConfig(history=2)
+        for value in range(4):
+            config.merge_dict({'a': value})
+
+        self.assertEquals(config.versions(), [2, 3])
+        self.assertEquals(config.rollback(), 3)
+        self.assertEquals(config.a, 2)
+
+        config.merge_dict({'a': 'new'})
+        self.assertEquals(config.version, 5)
+        self.assertEquals(config.rollback(2), 2)
+        self.assertEquals(config.a, 1)
+
+        with self.assertRaises(ValueError):
+            config.rollback()
+
+    def test_configure(self):
+        configured = []
+
+        class Trigger(SchemaTrigger):
+            def configure(self, conf):
+                configured.append(conf)
+
+        config = AtomicConfig()
+        config.register_trigger(
+            Trigger(Schema({'port': Coerce(int)}, extra=True)))
+        config.merge_dict({'port': '123', 'other': {'x': 1}})
+        before = config.snapshot()
+
+        config.configure()
+
+        self.assertEquals(config.port, 123)
+        self.assertIs(configured[0], config.snapshot())
+        self.assertIs(config.other, before.other)
+        self.assertEquals(before.port, '123')
+
+    def test_readers_see_whole_versions(self):
+        config = AtomicConfig()
+        config.merge_dict({'section': {'a': 0, 'b': 0}})
+        torn = []
+
+        def read():
+            for _ in range(2000):
+                section = config.section
+                if section.a != section.b:
+                    torn.append(section)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for value in range(1, 500):
+            config.merge_dict({'section': {'a': value, 'b': value}})
+        reader.join()
+
+        self.assertEquals(torn, [])
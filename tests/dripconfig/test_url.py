@@ -0,0 +1,124 @@
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+import os
+import shutil
+import stat
+from SocketServer import ThreadingMixIn
+import tempfile
+import threading
+from unittest import TestCase
+
+import mock
+
+from dripconfig import sources
+from dripconfig.configdict import ConfigDict
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        etag = '"%s"' % self.server.version
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class URLTestCase(TestCase):
+
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.connections = 0
+        self.server.requests = []
+        self.server.version = 1
+        self.server.body = '{"whoa": {"foo": "bar"}}'
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.url = 'http://127.0.0.1:%s/conf.json' % self.server.server_port
+        self.source = sources.URL(
+            self.url, os.path.join(self.tmpdir, 'conf.json'))
+
+    def tearDown(self):
+        sources.close_connections()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_fetch_and_revalidate(self):
+        cd = ConfigDict()
+        cd.merge_from(self.source)
+        self.assertEquals(cd.whoa.foo, 'bar')
+
+        # unchanged: a 304 over the same connection
+        self.assertFalse(self.source.refresh())
+        self.assertEquals(
+            self.server.requests[-1].get('if-none-match'), '"1"')
+
+        self.server.version = 2
+        self.server.body = '{"whoa": {"foo": "baz"}}'
+        self.assertTrue(self.source.refresh())
+        cd.merge(self.source.filename)
+        self.assertEquals(cd.whoa.foo, 'baz')
+
+        self.assertEquals(len(self.server.requests), 3)
+        self.assertEquals(self.server.connections, 1)
+
+    def test_fallback_to_cache(self):
+        self.assertTrue(self.source.refresh())
+        sources.close_connections()
+        self.server.shutdown()
+        self.server.server_close()
+
+        source = sources.URL(self.url, self.source.filename, timeout=1)
+        self.assertTrue(source.is_usable)
+        self.assertFalse(source.refresh())
+
+        cd = ConfigDict()
+        cd.merge_from(source)
+        self.assertEquals(cd.whoa.foo, 'bar')
+
+        os.unlink(source.filename)
+        with self.assertRaises(IOError):
+            source.refresh()
+        self.assertFalse(sources.URL(self.url, source.filename).is_usable)
+
+    def test_private_cache(self):
+        with mock.patch('tempfile.gettempdir', return_value=self.tmpdir):
+            source = sources.URL(self.url)
+            self.assertTrue(source.refresh())
+
+            cache_dir = os.path.dirname(source.filename)
+            self.assertEquals(os.path.dirname(cache_dir), self.tmpdir)
+            self.assertEquals(stat.S_IMODE(os.stat(cache_dir).st_mode), 0o700)
+            for filename in (source.filename, source.filename + '.meta'):
+                self.assertEquals(
+                    stat.S_IMODE(os.stat(filename).st_mode), 0o600)
+
+            # a directory others can write to isn't trusted.
+            os.chmod(cache_dir, 0o777)
+            with self.assertRaises(IOError):
+                sources.URL(self.url)
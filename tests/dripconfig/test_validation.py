@@ -0,0 +1,143 @@
+from unittest import TestCase
+
+from voluptuous import (
+    ALLOW_EXTRA, PREVENT_EXTRA, REMOVE_EXTRA, All, Any, Boolean, Coerce,
+    Exclusive, Invalid, Length, Optional, Range, Required, Schema)
+
+from dripconfig.builtins import StatsdConfig
+from dripconfig.configdict import ConfigDict
+from dripconfig.interfaces import SchemaBasedTrigger
+from dripconfig.validation import compile_schema
+
+
+STATSD = {
+    'statsd': {
+        Required('host', default='localhost'): basestring,
+        Required('port', default=8125): Coerce(int),
+        Optional('prefix', default=None): Any(basestring, None),
+        Optional('sample_rate'): All(Coerce(float), Range(min=0, max=1)),
+        Optional('disabled'): Boolean(basestring),
+        Optional('mode', default='udp'): 'udp',
+        Optional('tags', default=list): All(list, Length(max=3)),
+    },
+    'name': All(basestring, Length(min=1)),
+}
+
+GOOD = [
+    {},
+    {'name': 'app'},
+    {'statsd': {}},
+    {'statsd': {'port': '9000', 'sample_rate': '0.5', 'disabled': 'yes'},
+     'name': 'app', 'other': {'x': 1}},
+    {'statsd': {'host': u'stats', 'mode': 'udp', 'tags': ['a', 'b']}},
+]
+
+BAD = [
+    {'name': ''},
+    {'name': 5},
+    {'statsd': None},
+    {'statsd': {'port': 'many'}},
+    {'statsd': {'sample_rate': 2}},
+    {'statsd': {'disabled': 'maybe'}},
+    {'statsd': {'mode': 'tcp'}},
+    {'statsd': {'tags': [1, 2, 3, 4]}},
+    {'statsd': {'port': 'many', 'unknown': 1}},
+]
+
+
+def _statsd_schema(**kwargs):
+    # Any isn't compiled; swap it for something that is.
+    statsd = dict(STATSD['statsd'])
+    del statsd[Optional('prefix', default=None)]
+    statsd[Optional('prefix', default='')] = basestring
+    return Schema(dict(STATSD, statsd=statsd), **kwargs)
+
+
+class CompileSchemaTestCase(TestCase):
+
+    def assertSameAsSchema(self, schema, data):
+        validate = compile_schema(schema)
+        self.assertIsNot(schema, validate)
+        try:
+            expected = schema(data)
+        except Invalid as e:
+            with self.assertRaises(type(e)) as raised:
+                validate(data)
+            self.assertEqual(str(e), str(raised.exception))
+            self.assertEqual([error.path for error in e.errors],
+                             [error.path for error in raised.exception.errors])
+        else:
+            result = validate(data)
+            self.assertEqual(expected, result)
+            self.assertEqual(type(expected), type(result))
+            self.assertEqual(expected.keys(), result.keys())
+            if 'statsd' in expected:
+                self.assertEqual(expected['statsd'].keys(),
+                                 result['statsd'].keys())
+
+    def test_same_results(self):
+        for extra in (ALLOW_EXTRA, PREVENT_EXTRA, REMOVE_EXTRA):
+            schema = _statsd_schema(extra=extra)
+            for data in GOOD + BAD:
+                self.assertSameAsSchema(schema, data)
+                self.assertSameAsSchema(schema, ConfigDict.from_dict(data))
+
+    def test_required(self):
+        schema = Schema({Required('a'): int, 'b': {Required('c'): int}})
+        for data in ({'a': 1}, {}, {'a': 1, 'b': {}}, {'a': 1, 'b': {'c': 2}},
+                     {'b': {'c': 'x'}}):
+            self.assertSameAsSchema(schema, data)
+
+    def test_uses_compiled(self):
+        schema = _statsd_schema(extra=ALLOW_EXTRA)
+        validate = compile_schema(schema)
+        calls = []
+        original = schema._compiled
+        schema._compiled = lambda path, data: calls.append(path) or \
+            original(path, data)
+
+        validate({'statsd': {'port': '1'}})
+        self.assertEqual([], calls)
+        with self.assertRaises(Invalid):
+            validate({'statsd': {'port': 'x'}})
+        self.assertEqual([[]], calls)
+
+    def test_unsupported(self):
+        for schema in (
+                Schema({'a': Any(int, None)}),
+                Schema({'a': [int]}),
+                Schema({basestring: int}),
+                Schema({'a': int}, required=True),
+                Schema({'a': All(int, required=True)}),
+                Schema({Exclusive('a', 'group'): int}),
+                {'a': int}):
+            self.assertIs(schema, compile_schema(schema))
+
+
+class SchemaBasedTriggerTestCase(TestCase):
+
+    def test_compiled(self):
+        trigger = StatsdConfig()
+        self.assertTrue(trigger.compile_schema)
+        config = ConfigDict.from_dict({'statsd': {'port': '9000'}, 'x': 1})
+
+        cleaned = trigger.clean(config)
+        self.assertEqual(9000, cleaned['statsd']['port'])
+        self.assertEqual(1, cleaned['x'])
+        schema, validate = trigger._compiled_schema
+        self.assertIs(StatsdConfig.partial_schema, schema)
+        self.assertIsNot(schema, validate)
+
+        trigger.clean(config)
+        self.assertIs(validate, trigger._compiled_schema[1])
+
+    def test_not_compiled(self):
+        class Trigger(SchemaBasedTrigger):
+            partial_schema = Schema({'a': Coerce(int)})
+
+            def configure(self, configuration):
+                pass
+
+        trigger = Trigger()
+        self.assertEqual({'a': 1, 'b': 2}, trigger.clean({'a': '1', 'b': 2}))
+        self.assertNotIn('_compiled_schema', trigger.__dict__)
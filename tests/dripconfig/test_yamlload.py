@@ -0,0 +1,135 @@
+from StringIO import StringIO
+from tempfile import NamedTemporaryFile
+import textwrap
+from unittest import TestCase
+
+import mock
+import yaml
+
+from dripconfig.configdict import ConfigDict
+from dripconfig import yamlload
+from dripconfig.yamlload import YAMLLimitError
+
+
+def _laughs(levels):
+    lines = ['a: &a [lol, lol, lol, lol, lol, lol, lol, lol, lol]']
+    for i in range(1, levels):
+        name, previous = chr(ord('a') + i), chr(ord('a') + i - 1)
+        lines.append('%s: &%s [%s]' % (
+            name, name, ', '.join(['*' + previous] * 9)))
+    return '\n'.join(lines)
+
+
+class LoadTestCase(TestCase):
+
+    def test_builds_config_dicts_in_order(self):
+        data = yamlload.load(textwrap.dedent("""
+            z: 1
+            a:
+              c: [1, {d: 2}]
+              b: yes
+        """))
+
+        self.assertIsInstance(data, ConfigDict)
+        self.assertEqual(['z', 'a'], data.keys())
+        self.assertEqual(['c', 'b'], data.a.keys())
+        self.assertIsInstance(data.a.c[1], ConfigDict)
+        self.assertIs(True, data.a.b)
+
+    def test_empty(self):
+        self.assertIsNone(yamlload.load(''))
+
+    def test_file(self):
+        self.assertEqual({'x': 1}, yamlload.load(StringIO('x: 1')))
+
+    def test_aliases_are_copied(self):
+        data = yamlload.load(textwrap.dedent("""
+            base: &base {host: localhost, ports: [1, 2]}
+            other: *base
+            merged:
+              <<: *base
+              host: remote
+        """))
+
+        self.assertEqual(data.base, data.other)
+        self.assertIsNot(data.base, data.other)
+        self.assertIsNot(data.base.ports, data.other.ports)
+        self.assertEqual('remote', data.merged.host)
+        self.assertEqual([1, 2], data.merged.ports)
+
+    def test_unsafe_tags(self):
+        with self.assertRaises(yaml.YAMLError):
+            yamlload.load('!!python/object/apply:os.getpid []')
+
+    def test_billion_laughs(self):
+        # fine at 9 ** 4 values ...
+        yamlload.load(_laughs(4))
+
+        # ... but not at 9 ** 9
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load(_laughs(9))
+
+    def test_max_nodes(self):
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load('[1, 2, 3, 4]', max_nodes=4)
+        self.assertEqual([1, 2, 3], yamlload.load('[1, 2, 3]', max_nodes=4))
+
+    def test_max_size(self):
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load('x: 12345', max_size=7)
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load(StringIO('x: 12345'), max_size=7)
+
+    def test_recursive_alias(self):
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load('a: &a [1, *a]')
+
+    def test_max_depth(self):
+        self.assertEqual([[[]]], yamlload.load('[[[]]]', max_depth=3))
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load('[[[[]]]]', max_depth=3)
+        with self.assertRaises(YAMLLimitError):
+            yamlload.load('[' * 3000 + ']' * 3000)
+
+
+class MergeYAMLTestCase(TestCase):
+
+    def test_merge_yaml(self):
+        config = ConfigDict.from_dict({'a': {'b': 1, 'c': 2}})
+        config.merge_yaml('a: {c: 3}\nd: [4]')
+
+        self.assertEqual({'a': {'b': 1, 'c': 3}, 'd': [4]}, config)
+        self.assertIs(config, config.a._links[0][0]())
+
+    def test_merge_sniffed_yaml(self):
+        config = ConfigDict()
+        config.merge('x: 1\ny: two\n')
+        self.assertEqual({'x': 1, 'y': 'two'}, config)
+
+    def test_merge_empty_yaml(self):
+        config = ConfigDict({'x': 1})
+        config.merge_yaml('')
+        self.assertEqual({'x': 1}, config)
+
+    def test_merge_large_file(self):
+        with NamedTemporaryFile(suffix='.yaml') as f:
+            f.write('x: %s\n' % ('a' * 100))
+            f.flush()
+
+            config = ConfigDict()
+            with mock.patch('dripconfig.yamlload.MAX_DOCUMENT_SIZE', 10):
+                with mock.patch('dripconfig.yamlload.load',
+                                wraps=yamlload.load) as load:
+                    with self.assertRaises(YAMLLimitError):
+                        config.merge_yaml_file(f.name)
+            # the file itself, which load only reads up to the limit of.
+            self.assertTrue(hasattr(load.call_args[0][0], 'read'))
+
+    def test_merge_not_a_mapping(self):
+        config = ConfigDict({'x': 1})
+        for document in ('- a\n- b\n', 'just a string', '3'):
+            with self.assertRaises(ValueError):
+                config.merge_yaml(document)
+        with self.assertRaises(ValueError):
+            config.merge('- a\n- b\n')
+        self.assertEqual({'x': 1}, config)